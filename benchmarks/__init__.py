@@ -0,0 +1,3 @@
+"""
+Бенчмарки API (python -m benchmarks.run)
+"""
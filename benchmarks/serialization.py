@@ -0,0 +1,138 @@
+"""
+Бенчмарк сериализации ответов расписания
+
+Сравнивает время кодирования одного ответа из N записей расписания
+(по умолчанию 1000) тремя способами:
+  - json + response_model: прежний путь FastAPI (повторная валидация и stdlib json);
+  - orjson + response_model: ORJSONResponse по умолчанию, валидация остается;
+  - model_response: готовые модели без повторной валидации (scr/core/responses.py).
+Замеряются два вида ответа: клиентский (без участников) и тренерский (со списком участников).
+БД не нужна.
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --sessions 5000 --participants 12
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from datetime import date, time as time_of_day, timedelta
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Бенчмарк сериализации ответов расписания")
+    parser.add_argument("--sessions", type=int, default=1000, help="Записей в ответе")
+    parser.add_argument("--participants", type=int, default=8, help="Участников на запись в ответе тренера")
+    parser.add_argument("--repeat", type=int, default=20, help="Повторов замера (берется лучший)")
+    return parser.parse_args()
+
+
+def build_sessions(count: int, participants: int) -> List:
+    """Записи расписания в том виде, в каком их собирает scr/api/schedule.py"""
+    from scr.schemas.training_session import ClientShort, TrainerShort, TrainingSessionResponse, ZoneShort
+
+    zones = [ZoneShort(id=i + 1, name=f"Зал {i + 1}") for i in range(5)]
+    trainers = [
+        TrainerShort(id=uuid.uuid4(), first_name="Тренер", last_name=f"Фамилия{i}", middle_name="Отчество")
+        for i in range(20)
+    ]
+    start = date.today()
+    sessions = []
+    for i in range(count):
+        hour = 8 + i % 12
+        sessions.append(TrainingSessionResponse(
+            id=uuid.uuid4(),
+            session_date=start + timedelta(days=i % 7),
+            start_time=time_of_day(hour),
+            end_time=time_of_day(hour + 1),
+            gym_zone=zones[i % len(zones)],
+            trainer=trainers[i % len(trainers)],
+            participants_count=participants,
+            participants=[
+                ClientShort(id=uuid.uuid4(), first_name="Клиент", last_name=f"Фамилия{j}")
+                for j in range(participants)
+            ] if participants else None,
+            is_signed=None if participants else i % 3 == 0,
+        ))
+    return sessions
+
+
+def best_time(func: Callable[[], bytes], repeat: int) -> float:
+    func()  # прогрев
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run_case(name: str, sessions: List, repeat: int) -> None:
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+
+    from scr.core.responses import model_response
+    from scr.schemas.training_session import TrainingSessionResponse
+
+    field = create_response_field(
+        name="response", type_=List[TrainingSessionResponse], mode="serialization"
+    )
+
+    def with_response_model(response_class) -> Callable[[], bytes]:
+        def encode() -> bytes:
+            content = asyncio.run(serialize_response(field=field, response_content=sessions))
+            return response_class(content).body
+        return encode
+
+    variants = [
+        ("json + response_model", with_response_model(JSONResponse)),
+        ("orjson + response_model", with_response_model(ORJSONResponse)),
+        ("model_response", lambda: model_response(sessions).body),
+    ]
+
+    # Все способы должны давать один и тот же JSON
+    expected = json.loads(variants[0][1]())
+    for variant_name, encode in variants[1:]:
+        if json.loads(encode()) != expected:
+            raise RuntimeError(f"{name}: ответ '{variant_name}' отличается от ответа через response_model")
+
+    print(f"{name}: {len(sessions)} записей, {len(variants[-1][1]()) / 1024:.0f} КБ")
+    baseline = None
+    for variant_name, encode in variants:
+        elapsed = best_time(encode, repeat)
+        baseline = baseline or elapsed
+        print(f"  {variant_name:<26} {elapsed * 1000:>8.2f} мс  x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.path.insert(0, str(ROOT))
+
+    print("=" * 50)
+    print("Бенчмарк сериализации ответов")
+    print("=" * 50)
+    print()
+
+    try:
+        run_case("Клиент", build_sessions(args.sessions, 0), args.repeat)
+        print()
+        run_case("Тренер", build_sessions(args.sessions, args.participants), args.repeat)
+    except Exception as e:
+        print()
+        print("=" * 50)
+        print("❌ Ошибка при выполнении бенчмарка")
+        print("=" * 50)
+        print(f"Ошибка: {e}")
+        sys.exit(1)
+
+    print()
+    print("=" * 50)
+    print("✅ Бенчмарк завершен")
+    print("=" * 50)
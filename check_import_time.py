@@ -0,0 +1,102 @@
+"""
+Скрипт для проверки времени импорта приложения (холодный старт воркера)
+Запускает `python -X importtime -c "import scr.main"` несколько раз, берет лучший
+результат и сравнивает его с бюджетами. Также проверяет, что тяжелые зависимости,
+которые должны загружаться лениво, не импортируются при старте.
+
+Основной бюджет - число загруженных модулей: оно не зависит от загрузки машины
+и растет вместе с каждой новой зависимостью, импортируемой при старте.
+Бюджет времени - грубый потолок: на общих машинах лучшее из RUNS запусков
+одного и того же дерева меняется в полтора раза.
+
+    python check_import_time.py [бюджет_в_мс]
+"""
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Замеры на одноядерной машине: 607 модулей (632, пока старые маршруты scr.api
+# загружались при старте; 702 с jose), лучшее из RUNS запусков - от 1160 до 1400 мс
+MODULES_BUDGET = 625
+DEFAULT_BUDGET_MS = 2000
+RUNS = 5
+TOP_MODULES = 10
+
+# Модули, которые не должны загружаться при импорте приложения
+LAZY_MODULES = (
+    "yookassa", "requests", "uvicorn", "jose", "cryptography", "bcrypt",
+    # Старые маршруты /api/gym_operations и /api/locker (см. scr/api/__init__.py)
+    "scr.api.gym_operations", "scr.api.locker", "scr.db.struct",
+)
+
+
+def measure_import() -> Dict[str, Tuple[int, int]]:
+    """Время импорта по модулям: имя -> (собственное, накопленное) в микросекундах"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import scr.main"],
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def slowest_app_modules(modules: Dict[str, Tuple[int, int]]) -> List[Tuple[str, int]]:
+    """Модули приложения с наибольшим накопленным временем импорта"""
+    app_modules = [
+        (name, cumulative) for name, (_, cumulative) in modules.items()
+        if name.startswith("scr.") and name != "scr.main"
+    ]
+    return sorted(app_modules, key=lambda item: item[1], reverse=True)[:TOP_MODULES]
+
+
+if __name__ == "__main__":
+    budget_ms = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+
+    print("=" * 50)
+    print("Проверка времени импорта приложения")
+    print("=" * 50)
+
+    try:
+        runs = [measure_import() for _ in range(RUNS)]
+    except Exception as e:
+        print(f"❌ Не удалось импортировать приложение: {e}")
+        sys.exit(1)
+
+    best = min(runs, key=lambda modules: modules["scr.main"][1])
+    total_ms = best["scr.main"][1] / 1000
+
+    print(f"Загружено модулей: {len(best)} (бюджет {MODULES_BUDGET})")
+    print(f"Лучшее из {RUNS} запусков: {total_ms:.0f} мс (бюджет {budget_ms} мс)")
+    print()
+    print("Самые медленные модули приложения:")
+    for name, cumulative in slowest_app_modules(best):
+        print(f"  {cumulative / 1000:8.1f} мс  {name}")
+    print()
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in best]
+    if eager:
+        failed = True
+        print(f"❌ При старте импортируются модули, которые должны загружаться лениво: {', '.join(eager)}")
+    if len(best) > MODULES_BUDGET:
+        failed = True
+        print(f"❌ При старте загружается слишком много модулей: {len(best)} > {MODULES_BUDGET}")
+    if total_ms > budget_ms:
+        failed = True
+        print(f"❌ Импорт приложения превышает бюджет: {total_ms:.0f} мс > {budget_ms} мс")
+
+    print("=" * 50)
+    if failed:
+        sys.exit(1)
+    print("✅ Время импорта в пределах бюджета")
+    print("=" * 50)
@@ -0,0 +1,401 @@
+"""
+Скрипт для проверки планов выполнения запросов репозиториев
+Заполняет базу синтетическими данными, выполняет EXPLAIN для каждого горячего
+запроса и завершается с ошибкой, если в плане есть последовательное сканирование
+или не используется ожидаемый индекс.
+Все изменения выполняются в одной транзакции и откатываются в конце.
+
+Запросы строятся теми же функциями, что и в репозиториях, сервисах и API,
+поэтому проверяется именно то, что выполняет приложение. Схема должна быть
+создана миграциями (python migrate.py): скрипт не выполняет DDL и
+завершается с ошибкой, если версия схемы отстает.
+
+На PostgreSQL перед проверкой выключается enable_seqscan: планировщик выбирает
+Seq Scan только если подходящего индекса нет, поэтому результат не зависит
+от объема синтетических данных.
+"""
+import re
+import sys
+import uuid
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import insert, select
+
+from scr.api.attendance import visit_history_query
+from scr.api.schedule import (
+    session_visits_query, sessions_with_stats_query, trainer_sessions_query,
+    waitlist_head_query, waitlist_position_query,
+)
+from scr.core.config import settings
+from scr.db.database import engine
+from scr.db.migrations import LATEST_VERSION, check_schema_version
+from scr.db.models import (
+    Base, Booking, BookingStatus, Contract, ContractStatus, GymZone, Locker, Service,
+    Subscription, SubscriptionType, TrainerSchedule, TrainingSession,
+    TrainingSessionParticipant, TrainingSessionWaitlist, User, UserRole, Visit, ZonePass
+)
+from scr.db.repositories.booking_repository import conflicting_bookings_query, confirmed_intervals_query
+from scr.db.repositories.locker_repository import free_locker_query, occupied_by_user_query
+from scr.db.repositories.subscription_repository import active_subscriptions_query
+from scr.db.repositories.trainer_schedule_repository import working_schedules_query
+from scr.db.repositories.user_repository import user_by_email_query
+from scr.db.repositories.zone_pass_repository import decrement_remaining_visits_query
+from scr.services.gym_service import open_visit_query
+from scr.services.slot_service import booked_slots_query, slot_schedules_query
+
+# Размер страницы истории посещений по умолчанию (GET /api/attendance/me/history)
+HISTORY_LIMIT = 50
+
+CLIENTS = 300
+TRAINERS = 10
+ZONES = 3
+DAYS = 60
+LOCKERS = 200
+
+
+def seed(conn) -> Dict[str, object]:
+    """Синтетические данные для проверки; возвращает ключи для подстановки в запросы"""
+    today = date.today()
+    now = datetime.now()
+    marker = uuid.uuid4().hex[:8]
+
+    zone_ids = [
+        conn.execute(
+            insert(GymZone).values(name=f"explain-{marker}-{i}", capacity=20).returning(GymZone.id)
+        ).scalar_one()
+        for i in range(ZONES)
+    ]
+    service_id = conn.execute(
+        insert(Service).values(
+            name=f"explain-{marker}", category="explain", duration_minutes=60, base_price=0.0
+        ).returning(Service.id)
+    ).scalar_one()
+
+    def make_user(i: int, role: UserRole) -> dict:
+        return {
+            "id": uuid.uuid4(),
+            "email": f"explain-{marker}-{role.value}-{i}@example.com",
+            "phone": f"+7{marker[:4]}{role.value[0]}{i:06d}",
+            "password_hash": "-",
+            "first_name": "Explain",
+            "last_name": str(i),
+            "role": role,
+            "is_active": True,
+        }
+
+    clients = [make_user(i, UserRole.CLIENT) for i in range(CLIENTS)]
+    trainers = [make_user(i, UserRole.TRAINER) for i in range(TRAINERS)]
+    conn.execute(insert(User), clients + trainers)
+    client_ids = [u["id"] for u in clients]
+    trainer_ids = [u["id"] for u in trainers]
+
+    schedule_rows = [
+        {
+            "trainer_id": trainer_id,
+            "day_of_week": day,
+            "start_time": time(hour, 0),
+            "end_time": time(hour + 1, 0),
+            "is_working": True,
+            "is_cancelled": False,
+            "gym_zone_id": zone_ids[hour % ZONES],
+        }
+        for trainer_id in trainer_ids
+        for day in range(7)
+        for hour in range(9, 18)
+    ]
+    conn.execute(insert(TrainerSchedule), schedule_rows)
+    schedule_ids = list(conn.execute(
+        select(TrainerSchedule.id).where(TrainerSchedule.trainer_id.in_(trainer_ids))
+    ).scalars())
+
+    contract_rows = [
+        {
+            "id": uuid.uuid4(),
+            "client_id": client_id,
+            "contract_number": f"EX-{marker}-{i}",
+            "status": ContractStatus.ACTIVE,
+            "start_date": today,
+        }
+        for i, client_id in enumerate(client_ids)
+    ]
+    conn.execute(insert(Contract), contract_rows)
+    conn.execute(insert(Subscription), [
+        {
+            "id": uuid.uuid4(),
+            "contract_id": row["id"],
+            "service_id": service_id,
+            "subscription_type": SubscriptionType.VISIT_BASED,
+            "total_visits": 10,
+            "remaining_visits": 10,
+            "start_date": today,
+            "is_active": True,
+        }
+        for row in contract_rows
+    ])
+    conn.execute(insert(ZonePass), [
+        {"id": uuid.uuid4(), "client_id": client_id, "gym_zone_id": zone_id, "remaining_visits": 5}
+        for client_id in client_ids
+        for zone_id in zone_ids
+    ])
+
+    conn.execute(insert(Booking), [
+        {
+            "id": uuid.uuid4(),
+            "client_id": client_ids[i % CLIENTS],
+            "service_id": service_id,
+            "trainer_schedule_id": schedule_ids[i % len(schedule_ids)],
+            "booking_date": today + timedelta(days=i % DAYS),
+            "start_time": time(9 + i % 9, 0),
+            "end_time": time(10 + i % 9, 0),
+            "status": BookingStatus.CONFIRMED if i % 5 else BookingStatus.CANCELLED,
+        }
+        for i in range(CLIENTS * 10)
+    ])
+
+    session_rows = [
+        {
+            "id": uuid.uuid4(),
+            "trainer_id": trainer_ids[i % TRAINERS],
+            "gym_zone_id": zone_ids[i % ZONES],
+            "session_date": today + timedelta(days=i % DAYS - DAYS // 2),
+            "start_time": time(9 + i % 9, 0),
+            "end_time": time(10 + i % 9, 0),
+            "is_cancelled": False,
+            "is_completed": False,
+        }
+        for i in range(TRAINERS * DAYS)
+    ]
+    conn.execute(insert(TrainingSession), session_rows)
+    session_ids = [row["id"] for row in session_rows]
+    conn.execute(insert(TrainingSessionParticipant), [
+        {"session_id": session_id, "client_id": client_ids[(i * 7 + k) % CLIENTS]}
+        for i, session_id in enumerate(session_ids)
+        for k in range(5)
+    ])
+    conn.execute(insert(TrainingSessionWaitlist), [
+        {"session_id": session_id, "client_id": client_ids[(i * 7 + 5) % CLIENTS]}
+        for i, session_id in enumerate(session_ids)
+    ])
+
+    conn.execute(insert(Visit), [
+        {
+            "id": uuid.uuid4(),
+            "client_id": client_ids[i % CLIENTS],
+            "trainer_id": trainer_ids[i % TRAINERS] if i % 3 == 0 else None,
+            "training_session_id": session_ids[i % len(session_ids)] if i % 3 == 0 else None,
+            "visit_type": "training" if i % 3 == 0 else "gym",
+            "service_id": service_id,
+            "check_in_time": now - timedelta(hours=i),
+            "check_out_time": now - timedelta(hours=i) + timedelta(minutes=90),
+        }
+        for i in range(CLIENTS * 20)
+    ])
+
+    conn.execute(insert(Locker), [
+        {
+            "locker_number": f"EX-{marker}-{i}",
+            "gender": "men" if i % 2 else "women",
+            "status": "occupied" if i < CLIENTS // 3 else "free",
+            "is_available": True,
+            "occupied_by_user_id": client_ids[i] if i < CLIENTS // 3 else None,
+        }
+        for i in range(LOCKERS)
+    ])
+    locker_id = conn.execute(
+        select(Locker.id).where(Locker.occupied_by_user_id == client_ids[0])
+    ).scalar_one()
+
+    return {
+        "today": today,
+        "now": now,
+        "client_id": client_ids[0],
+        "client_ids": client_ids[:20],
+        "trainer_id": trainer_ids[0],
+        "zone_id": zone_ids[0],
+        "schedule_ids": schedule_ids[:50],
+        "session_id": session_ids[0],
+        "email": clients[0]["email"],
+        "locker_id": locker_id,
+    }
+
+
+def build_queries(keys: Dict[str, object]) -> Dict[str, Tuple[object, Tuple[str, ...]]]:
+    """
+    Горячие запросы приложения и ожидаемые индексы: название -> (запрос, индексы).
+    Если индексов несколько, план должен использовать хотя бы один из них
+    (какой из равноценных индексов выбрать, решает планировщик).
+    """
+    today = keys["today"]
+    week_end = today + timedelta(days=6)
+    bookings_indexes = ("ix_bookings_date_status_start", "ix_bookings_trainer_schedule_id")
+    return {
+        "AsyncUserRepository.get_by_email": (
+            user_by_email_query(keys["email"]), ("ix_users_email",)
+        ),
+        "AsyncSubscriptionRepository.get_active_subscriptions": (
+            active_subscriptions_query(keys["client_id"]), ("ix_contracts_client_id",)
+        ),
+        "AsyncBookingRepository.get_conflicting_bookings": (
+            conflicting_bookings_query(today, time(10, 0), time(11, 0), keys["schedule_ids"][0]),
+            bookings_indexes,
+        ),
+        "AsyncBookingRepository.get_confirmed_intervals": (
+            confirmed_intervals_query(today, week_end, keys["schedule_ids"]), bookings_indexes
+        ),
+        "AsyncTrainerScheduleRepository.get_working_by_days": (
+            working_schedules_query([0, 1, 2]), ("ix_trainer_schedules_day_working",)
+        ),
+        "SlotAvailabilityService: расписания": (
+            slot_schedules_query(range(7)), ("ix_trainer_schedules_day_working",)
+        ),
+        "SlotAvailabilityService: занятые слоты": (
+            booked_slots_query(today, week_end, keys["schedule_ids"]), bookings_indexes
+        ),
+        "attendance: история клиента (keyset)": (
+            visit_history_query(keys["client_id"], False, (keys["now"], uuid.uuid4())).limit(HISTORY_LIMIT + 1),
+            ("ix_visits_client_checkin",),
+        ),
+        "attendance: история тренера (keyset)": (
+            visit_history_query(keys["trainer_id"], True, (keys["now"], uuid.uuid4())).limit(HISTORY_LIMIT + 1),
+            ("ix_visits_trainer_checkin",),
+        ),
+        "GymService: открытое посещение клиента": (
+            open_visit_query(keys["client_id"]), ("ix_visits_client_checkin", "ix_visits_client_session")
+        ),
+        "complete_training_session: существующие посещения": (
+            session_visits_query(keys["session_id"], keys["client_ids"]), ("ix_visits_client_session",)
+        ),
+        "list_training_sessions: записи тренера за дату": (
+            trainer_sessions_query(today, keys["trainer_id"]), ("ix_training_sessions_date_trainer",)
+        ),
+        "list_training_sessions: записи за дату с участниками": (
+            sessions_with_stats_query(today, today, keys["client_id"]), ("ix_training_sessions_date_trainer",)
+        ),
+        "schedule/range: записи за период с участниками": (
+            sessions_with_stats_query(today, week_end, keys["client_id"]), ("ix_training_sessions_date_trainer",)
+        ),
+        "schedule: позиция в листе ожидания": (
+            waitlist_position_query(keys["session_id"], 1_000_000), ("ix_waitlist_session_id_id",)
+        ),
+        "schedule: голова листа ожидания": (
+            waitlist_head_query(keys["session_id"], keys["zone_id"]), ("ix_waitlist_session_id_id",)
+        ),
+        "AsyncZonePassRepository.decrement_remaining_visits": (
+            decrement_remaining_visits_query(keys["client_id"], keys["zone_id"]), ("uq_zone_passes_client_zone",)
+        ),
+        "AsyncLockerRepository.claim_free: кандидат": (
+            free_locker_query("men"), ("ix_lockers_free_lookup",)
+        ),
+        "AsyncLockerRepository.get_occupied_by_user": (
+            occupied_by_user_query(keys["client_id"]), ("ix_lockers_occupied_by_user_id",)
+        ),
+        "AsyncLockerRepository.get_occupied_by_user: по current_locker_id": (
+            occupied_by_user_query(keys["client_id"], keys["locker_id"]), ("lockers_pkey",)
+        ),
+    }
+
+
+# Индексы в строках плана PostgreSQL и SQLite
+_PG_INDEX_RE = re.compile(r"Index (?:Only )?Scan(?: Backward)? using (\w+)|Bitmap Index Scan on (\w+)")
+_SQLITE_INDEX_RE = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+
+
+def explain(conn, statement) -> List[str]:
+    """Строки плана выполнения запроса"""
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "postgresql":
+        return [row[0].strip() for row in conn.exec_driver_sql("EXPLAIN " + sql)]
+    return [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+
+
+def sequential_scans(plan: List[str], table_names: Set[str]) -> List[str]:
+    """Строки плана с последовательным сканированием таблиц"""
+    if engine.dialect.name == "postgresql":
+        return [line for line in plan if "Seq Scan" in line]
+
+    # SQLite: "SCAN <table>" без "USING ... INDEX" - полный проход по таблице
+    return [
+        line for line in plan
+        if line.startswith("SCAN ") and line.split()[1] in table_names and "USING" not in line
+    ]
+
+
+def used_indexes(plan: List[str]) -> Set[str]:
+    """Имена индексов из плана; первичный ключ SQLite назван как в PostgreSQL (<таблица>_pkey)"""
+    if engine.dialect.name == "postgresql":
+        return {
+            scan_name or bitmap_name
+            for line in plan
+            for scan_name, bitmap_name in _PG_INDEX_RE.findall(line)
+        }
+
+    indexes = set()
+    for line in plan:
+        indexes.update(_SQLITE_INDEX_RE.findall(line))
+        if "USING INTEGER PRIMARY KEY" in line:
+            indexes.add(f"{line.split()[1]}_pkey")
+    return indexes
+
+
+def check_query_plans() -> bool:
+    """Проверка планов; возвращает True, если все запросы используют ожидаемые индексы"""
+    version = check_schema_version(engine)
+    if version < LATEST_VERSION:
+        raise RuntimeError(
+            f"версия схемы {version}, требуется {LATEST_VERSION}. Запустите: python migrate.py"
+        )
+
+    table_names = set(Base.metadata.tables)
+    failed = 0
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            keys = seed(conn)
+            conn.exec_driver_sql("ANALYZE")
+            if conn.dialect.name == "postgresql":
+                conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+            for name, (statement, expected) in build_queries(keys).items():
+                plan = explain(conn, statement)
+                problems = sequential_scans(plan, table_names)
+                if not used_indexes(plan) & set(expected):
+                    problems.append(f"не используется индекс {' или '.join(expected)}")
+                if problems:
+                    failed += 1
+                    print(f"  ❌ {name}")
+                    for line in problems + ["план:"] + [f"  {line}" for line in plan]:
+                        print(f"       {line}")
+                else:
+                    print(f"  ✅ {name}")
+        finally:
+            transaction.rollback()
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Проверка планов выполнения запросов")
+    print("=" * 50)
+    print(f"Подключение к: {settings.DATABASE_URL}")
+    print()
+
+    try:
+        passed = check_query_plans()
+    except Exception as e:
+        print()
+        print("=" * 50)
+        print("❌ Ошибка при проверке планов запросов")
+        print("=" * 50)
+        print(f"Ошибка: {e}")
+        sys.exit(1)
+
+    print()
+    print("=" * 50)
+    if not passed:
+        print("❌ Запросы без ожидаемых индексов: проверьте индексы в scr/db/models.py и миграции")
+        print("=" * 50)
+        sys.exit(1)
+    print("✅ Все запросы используют индексы")
+    print("=" * 50)
@@ -0,0 +1,99 @@
+"""
+Скрипт для генерации синтетических данных большого клуба
+Заполняет БД из DATABASE_URL (нужна пустая БД): клиенты с абонементами и балансами
+по залам, тренеры, шкафчики, занятия с участниками и история посещений за прошлые годы.
+Для профилирования запросов и проверки индексов на объемах, близких к продакшену.
+
+    python generate_data.py
+    python generate_data.py --clients 10000 --history-days 365 --seed 7 --base-date 2024-06-01
+
+При одинаковых параметрах, --seed и --base-date строки совпадают между запусками.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+# Лог медленных запросов не нужен: COPY больших пакетов всегда дольше порога
+os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "0")
+
+from sqlalchemy import select, text
+
+from scr.core.config import settings
+from scr.db.data_generator import GeneratorConfig, generate
+from scr.db.database import engine
+from scr.db.migrations import migrate
+from scr.db.models import User
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Генерация синтетических данных большого клуба")
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--trainers", type=int, default=200)
+    parser.add_argument("--lockers", type=int, default=5_000)
+    parser.add_argument("--sessions", type=int, default=2_000, help="Предстоящие занятия")
+    parser.add_argument("--past-sessions", type=int, default=10_000, help="Проведенные занятия в истории")
+    parser.add_argument("--participants", type=int, default=8, help="Участников на занятие")
+    parser.add_argument("--history-days", type=int, default=730, help="Глубина истории в днях")
+    parser.add_argument("--visits-per-client", type=int, default=30, help="Посещений зала на клиента в истории")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--base-date", type=date.fromisoformat, default=date.today(),
+        help="Дата начала предстоящих занятий и конца истории, ГГГГ-ММ-ДД (по умолчанию сегодня)"
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    print("=" * 50)
+    print("Генерация синтетических данных")
+    print("=" * 50)
+    print(f"Подключение к: {settings.DATABASE_URL}")
+    print(f"Seed: {args.seed}, базовая дата: {args.base_date.isoformat()}")
+    print()
+
+    started = time.perf_counter()
+    try:
+        migrate(engine)
+        with engine.connect() as conn:
+            if conn.execute(select(User.id).where(User.email == "client0@bench.local")).first():
+                raise RuntimeError("данные генератора уже есть в БД, нужна пустая БД")
+
+        data = generate(engine, GeneratorConfig(
+            clients=args.clients,
+            trainers=args.trainers,
+            lockers=args.lockers,
+            sessions=args.sessions,
+            participants_per_session=args.participants,
+            history_days=args.history_days,
+            visits_per_client=args.visits_per_client,
+            past_sessions=args.past_sessions,
+            seed=args.seed,
+            base_date=args.base_date,
+            batch_size=args.batch_size,
+        ))
+
+        # Свежая статистика для планировщика после массовой загрузки
+        if engine.dialect.name == "postgresql":
+            with engine.begin() as conn:
+                conn.execute(text("ANALYZE"))
+    except Exception as e:
+        print()
+        print("=" * 50)
+        print("❌ Ошибка при генерации данных")
+        print("=" * 50)
+        print(f"Ошибка: {e}")
+        sys.exit(1)
+
+    print()
+    for table, count in data.row_counts.items():
+        print(f"  {table:<32} {count:>12,}")
+    print()
+    print("=" * 50)
+    print(f"✅ Данные сгенерированы за {time.perf_counter() - started:.1f} с")
+    print(f"   Пароль всех сгенерированных пользователей: {data.password}")
+    print("=" * 50)
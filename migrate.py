@@ -0,0 +1,34 @@
+"""
+Скрипт для применения миграций схемы базы данных
+Запускайте перед стартом (или обновлением) приложения:
+    python migrate.py
+"""
+import sys
+from scr.core.config import settings
+from scr.db.database import engine
+from scr.db.migrations import LATEST_VERSION, check_schema_version, migrate
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Миграции базы данных")
+    print("=" * 50)
+    print(f"Подключение к: {settings.DATABASE_URL}")
+    print()
+
+    try:
+        applied = migrate(engine)
+        for migration in applied:
+            print(f"  ✅ {migration.version}: {migration.description}")
+        if not applied:
+            print("  Новых миграций нет")
+        print()
+        print("=" * 50)
+        print(f"✅ Версия схемы: {check_schema_version(engine)} из {LATEST_VERSION}")
+        print("=" * 50)
+    except Exception as e:
+        print()
+        print("=" * 50)
+        print("❌ Ошибка при применении миграций")
+        print("=" * 50)
+        print(f"Ошибка: {e}")
+        sys.exit(1)
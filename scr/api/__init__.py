@@ -1,9 +1,43 @@
-from fastapi import APIRouter
+"""
+Старые маршруты /api/gym_operations и /api/locker (обработчики на заглушках БД)
 
-from scr.api.gym_operations import router as gym_router
-from scr.api.locker import router as locker_router
+Модули обработчиков загружаются при первом запросе к маршруту, а не при импорте
+приложения: цепочка scr.db.struct, clientDb и lockerDb нужна только этим маршрутам.
+Запрос передается обработчику FastAPI исходного маршрута как есть (проверка тела,
+ответы и ошибки не меняются), но в /docs у этих маршрутов нет схемы тела.
+"""
+from importlib import import_module
+from typing import Awaitable, Callable, Dict
+
+from fastapi import APIRouter, Request, Response
+
+# Путь маршрута -> модуль, в router которого объявлен обработчик
+LEGACY_ROUTES = {
+    "/locker/find": "scr.api.locker",
+    "/gym_operations/enter": "scr.api.gym_operations",
+    "/gym_operations/exit": "scr.api.gym_operations",
+}
 
 main_router = APIRouter(prefix="/api", tags=["main"])
-main_router.include_router(locker_router)
-main_router.include_router(gym_router)
 
+_handlers: Dict[str, Callable[[Request], Awaitable[Response]]] = {}
+
+
+def _legacy_handler(path: str) -> Callable[[Request], Awaitable[Response]]:
+    handler = _handlers.get(path)
+    if handler is None:
+        router = import_module(LEGACY_ROUTES[path]).router
+        route = next(route for route in router.routes if route.path == path)
+        handler = _handlers[path] = route.get_route_handler()
+    return handler
+
+
+def _add_legacy_route(path: str) -> None:
+    async def endpoint(request: Request) -> Response:
+        return await _legacy_handler(path)(request)
+
+    main_router.add_api_route(path, endpoint, methods=["POST"], name=path.strip("/").replace("/", "_"))
+
+
+for _path in LEGACY_ROUTES:
+    _add_legacy_route(_path)
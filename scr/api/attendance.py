@@ -1,102 +1,225 @@
 """
 API endpoints для посещений
 """
+import base64
+import json
 from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 
-from scr.db.database import get_db
+from scr.db.database import AsyncSessionLocal, get_async_db
 from scr.db.models import User, UserRole, Visit, TrainingSession, TrainingSessionParticipant
 from scr.core.dependencies import get_current_active_user
+from scr.core.principal_cache import CurrentPrincipal
 
 router = APIRouter(prefix="/api/attendance", tags=["attendance"])
 
+# Размер пачки строк при потоковой выгрузке истории
+HISTORY_STREAM_CHUNK = 500
+
+
+# Курсор истории тренера по проведенным занятиям (старые данные без Visit.trainer_id)
+_SESSION_CURSOR_KIND = "session"
+
+
+def _encode_cursor(check_in_time: datetime, item_id: UUID, kind: Optional[str] = None) -> str:
+    """Курсор следующей страницы: (check_in_time, id) последней записи"""
+    raw = f"{check_in_time.isoformat()}|{item_id}"
+    if kind:
+        raw = f"{kind}|{raw}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[str], datetime, UUID]:
+    """Тип курсора (None - посещения) и ключ (check_in_time, id)"""
+    try:
+        parts = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        kind = parts.pop(0) if len(parts) == 3 else None
+        check_in, item_id = parts
+        if kind not in (None, _SESSION_CURSOR_KIND):
+            raise ValueError(kind)
+        return kind, datetime.fromisoformat(check_in), UUID(item_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+
+def visit_history_query(
+    user_id: UUID,
+    is_trainer: bool,
+    after: Optional[Tuple[datetime, UUID]] = None
+) -> Select:
+    """Запрос истории посещений клиента или тренера после ключа (check_in_time, id), от новых к старым"""
+    if is_trainer:
+        # Visit с trainer_id — детально по каждому клиенту
+        query = (
+            select(Visit)
+            .options(joinedload(Visit.client))
+            .where(Visit.trainer_id == user_id)
+        )
+    else:
+        query = select(Visit).where(Visit.client_id == user_id)
+    query = query.order_by(Visit.check_in_time.desc(), Visit.id.desc())
+    if after:
+        query = query.where(tuple_(Visit.check_in_time, Visit.id) < tuple_(*after))
+    return query
+
+
+def _visit_to_item(visit: Visit, with_client: bool) -> dict:
+    item = {
+        "id": str(visit.id),
+        "check_in_time": visit.check_in_time.isoformat() if visit.check_in_time else None,
+        "check_out_time": visit.check_out_time.isoformat() if visit.check_out_time else None,
+        "visit_type": visit.visit_type,
+        "method": "training" if visit.visit_type == "training" else "manual"
+    }
+    # Для тренера полезно видеть, кто был на занятии
+    if with_client and visit.client:
+        item["client_name"] = f"{visit.client.first_name} {visit.client.last_name}".strip()
+    return item
+
+
+async def _trainer_sessions_history(
+    db: AsyncSession,
+    trainer_id: UUID,
+    limit: int,
+    after: Optional[Tuple[datetime, UUID]] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Страница истории тренера по проведенным занятиям (старые данные без Visit.trainer_id).
+    Постраничная выдача по ключу (session_date, start_time, id), от новых к старым.
+    """
+    query = (
+        select(TrainingSession)
+        .where(
+            TrainingSession.trainer_id == trainer_id,
+            TrainingSession.is_completed == True,
+        )
+        .order_by(TrainingSession.session_date.desc(), TrainingSession.start_time.desc(), TrainingSession.id.desc())
+    )
+    if after:
+        check_in, session_id = after
+        query = query.where(
+            tuple_(TrainingSession.session_date, TrainingSession.start_time, TrainingSession.id)
+            < tuple_(check_in.date(), check_in.time(), session_id)
+        )
+    rows = (await db.execute(query.limit(limit + 1))).scalars().all()
+    sessions = rows[:limit]
+
+    session_ids = [s.id for s in sessions]
+    parts = []
+    if session_ids:
+        parts = (await db.execute(
+            select(TrainingSessionParticipant)
+            .options(selectinload(TrainingSessionParticipant.client))
+            .where(TrainingSessionParticipant.session_id.in_(session_ids))
+        )).scalars().all()
+
+    parts_by_session = {}
+    for p in parts:
+        parts_by_session.setdefault(p.session_id, []).append(p)
+
+    history = []
+    for s in sessions:
+        check_in_dt = datetime.combine(s.session_date, s.start_time).replace(tzinfo=timezone.utc)
+        check_out_dt = datetime.combine(s.session_date, s.end_time).replace(tzinfo=timezone.utc)
+        plist = parts_by_session.get(s.id, [])
+
+        history.append({
+            "id": str(s.id),
+            "check_in_time": check_in_dt.isoformat(),
+            "check_out_time": check_out_dt.isoformat(),
+            "visit_type": "training",
+            "method": "training",
+            "participants_count": len(plist),
+            "clients": [
+                f"{p.client.first_name} {p.client.last_name}".strip()
+                for p in plist
+                if p.client
+            ],
+        })
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = sessions[-1]
+        next_cursor = _encode_cursor(
+            datetime.combine(last.session_date, last.start_time), last.id, kind=_SESSION_CURSOR_KIND
+        )
+    return history, next_cursor
+
+
+async def _stream_history(query, is_trainer: bool, trainer_id: Optional[UUID]) -> AsyncIterator[str]:
+    """
+    NDJSON-выгрузка истории: строки читаются пачками через серверный курсор,
+    в памяти не накапливаются. Своя сессия живет столько же, сколько поток.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=HISTORY_STREAM_CHUNK))
+        emitted = False
+        async for visit in result.scalars():
+            emitted = True
+            yield json.dumps(_visit_to_item(visit, is_trainer), ensure_ascii=False) + "\n"
+
+        if not emitted and trainer_id:
+            after = None
+            while True:
+                items, next_cursor = await _trainer_sessions_history(db, trainer_id, HISTORY_STREAM_CHUNK, after)
+                for item in items:
+                    yield json.dumps(item, ensure_ascii=False) + "\n"
+                if not next_cursor:
+                    break
+                after = _decode_cursor(next_cursor)[1:]
+
 
 @router.get("/me/history")
 async def get_my_visit_history(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    limit: int = Query(50, ge=1, le=500, description="Размер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (next_cursor)"),
+    stream: bool = Query(False, description="Потоковая выгрузка всей истории в формате NDJSON"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(get_current_active_user)
 ):
-    """Получение истории посещений текущего пользователя (клиент/тренер)"""
-    if current_user.role == UserRole.CLIENT:
-        visits = (
-            db.query(Visit)
-            .filter(Visit.client_id == current_user.id)
-            .order_by(Visit.check_in_time.desc())
-            .all()
-        )
-    elif current_user.role == UserRole.TRAINER:
-        # 1) Если есть Visit с trainer_id — используем их (детально по каждому клиенту)
-        visits = (
-            db.query(Visit)
-            .filter(Visit.trainer_id == current_user.id)
-            .order_by(Visit.check_in_time.desc())
-            .all()
+    """
+    Получение истории посещений текущего пользователя (клиент/тренер).
+    Постраничная выдача по ключу (check_in_time, id), от новых к старым.
+    """
+    if current_user.role not in (UserRole.CLIENT, UserRole.TRAINER):
+        raise HTTPException(status_code=403, detail="Недостаточно прав")
+
+    is_trainer = current_user.role == UserRole.TRAINER
+    after = None
+    if cursor:
+        kind, check_in, item_id = _decode_cursor(cursor)
+        if kind == _SESSION_CURSOR_KIND:
+            # Следующая страница истории по проведенным занятиям
+            if not is_trainer or stream:
+                raise HTTPException(status_code=400, detail="Некорректный курсор")
+            history, next_cursor = await _trainer_sessions_history(db, current_user.id, limit, (check_in, item_id))
+            return {"history": history, "next_cursor": next_cursor}
+        after = (check_in, item_id)
+    query = visit_history_query(current_user.id, is_trainer, after)
+
+    # Если Visit еще не проставлены (старые данные) — история тренера по проведенным занятиям
+    legacy_trainer_id = current_user.id if is_trainer and not cursor else None
+
+    if stream:
+        return StreamingResponse(
+            _stream_history(query, is_trainer, legacy_trainer_id),
+            media_type="application/x-ndjson"
         )
 
-        # 2) Если Visit еще не проставлены (старые данные) — показываем историю по проведенным занятиям
-        if not visits:
-            sessions = (
-                db.query(TrainingSession)
-                .filter(
-                    TrainingSession.trainer_id == current_user.id,
-                    TrainingSession.is_completed == True,
-                )
-                .order_by(TrainingSession.session_date.desc(), TrainingSession.start_time.desc())
-                .all()
-            )
-
-            session_ids = [s.id for s in sessions]
-            parts = []
-            if session_ids:
-                parts = (
-                    db.query(TrainingSessionParticipant)
-                    .filter(TrainingSessionParticipant.session_id.in_(session_ids))
-                    .all()
-                )
-
-            parts_by_session = {}
-            for p in parts:
-                parts_by_session.setdefault(p.session_id, []).append(p)
-
-            history = []
-            for s in sessions:
-                check_in_dt = datetime.combine(s.session_date, s.start_time).replace(tzinfo=timezone.utc)
-                check_out_dt = datetime.combine(s.session_date, s.end_time).replace(tzinfo=timezone.utc)
-                plist = parts_by_session.get(s.id, [])
-
-                history.append({
-                    "id": str(s.id),
-                    "check_in_time": check_in_dt.isoformat(),
-                    "check_out_time": check_out_dt.isoformat(),
-                    "visit_type": "training",
-                    "method": "training",
-                    "participants_count": len(plist),
-                    "clients": [
-                        f"{p.client.first_name} {p.client.last_name}".strip()
-                        for p in plist
-                        if p.client
-                    ],
-                })
-
-            return {"history": history}
-    else:
-        raise HTTPException(status_code=403, detail="Недостаточно прав")
-    
-    history = []
-    for visit in visits:
-        item = {
-            "id": str(visit.id),
-            "check_in_time": visit.check_in_time.isoformat() if visit.check_in_time else None,
-            "check_out_time": visit.check_out_time.isoformat() if visit.check_out_time else None,
-            "visit_type": visit.visit_type,
-            "method": "training" if visit.visit_type == "training" else "manual"
-        }
-        # Для тренера полезно видеть, кто был на занятии
-        if current_user.role == UserRole.TRAINER and visit.client:
-            item["client_name"] = f"{visit.client.first_name} {visit.client.last_name}".strip()
-        history.append(item)
-    
-    return {"history": history}
+    visits = (await db.execute(query.limit(limit + 1))).scalars().all()
+    if not visits and legacy_trainer_id:
+        history, next_cursor = await _trainer_sessions_history(db, legacy_trainer_id, limit)
+        return {"history": history, "next_cursor": next_cursor}
 
+    page = visits[:limit]
+    return {
+        "history": [_visit_to_item(visit, is_trainer) for visit in page],
+        "next_cursor": _encode_cursor(page[-1].check_in_time, page[-1].id) if len(visits) > limit else None
+    }
@@ -2,12 +2,14 @@
 API endpoints для аутентификации
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from scr.db.database import get_db
+from scr.db.database import get_async_db
 from scr.schemas.user import UserCreate, UserResponse, UserLogin, Token
 from scr.services.auth_service import AuthService
+from scr.services.user_service import UserService
 from scr.core.dependencies import get_current_active_user
+from scr.core.principal_cache import CurrentPrincipal
 from scr.db.models import User
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -16,22 +18,19 @@ router = APIRouter(prefix="/api/auth", tags=["auth"])
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Регистрация нового пользователя"""
     try:
         auth_service = AuthService(db)
-        user = auth_service.register(user_data)
+        user = await auth_service.register(user_data)
         # Коммит уже выполнен в репозитории
         return user
     except HTTPException:
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as e:
-        db.rollback()
-        import traceback
-        print(f"Ошибка при регистрации: {str(e)}")
-        print(traceback.format_exc())
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Ошибка при регистрации: {str(e)}"
@@ -41,18 +40,21 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     credentials: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Вход пользователя"""
     auth_service = AuthService(db)
-    token = auth_service.login(credentials.email, credentials.password)
+    token = await auth_service.login(credentials.email, credentials.password)
     return token
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(get_current_active_user)
 ):
     """Получение информации о текущем пользователе"""
-    return current_user
+    # В кэше хранится только снимок для проверки прав — профиль читаем из БД
+    user_service = UserService(db)
+    return await user_service.get_user(current_user.id)
 
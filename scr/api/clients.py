@@ -2,11 +2,12 @@
 API endpoints для клиентов
 """
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from scr.db.database import get_db
+from scr.db.database import get_async_db
 from scr.db.models import User, UserRole
 from scr.core.dependencies import get_current_active_user, require_role
+from scr.core.principal_cache import CurrentPrincipal
 from scr.services.gym_service import GymService
 from scr.services.contract_service import ContractService
 
@@ -15,18 +16,18 @@ router = APIRouter(prefix="/api/clients", tags=["clients"])
 
 @router.get("/me")
 async def get_client_info(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.CLIENT))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
 ):
     """Получение информации о текущем клиенте"""
     gym_service = GymService(db)
     contract_service = ContractService(db)
     
     # Получаем статус в зале
-    gym_status = gym_service.get_gym_status(current_user)
+    gym_status = await gym_service.get_gym_status(current_user)
     
     # Получаем активные абонементы
-    active_subscriptions = contract_service.get_client_active_subscriptions(current_user.id, current_user)
+    active_subscriptions = await contract_service.get_client_active_subscriptions(current_user.id, current_user)
     
     has_subscription = len(active_subscriptions) > 0
     visits_left = gym_status.get("visits_remaining", 0)
@@ -41,16 +42,16 @@ async def get_client_info(
 
 @router.post("/me/check-in")
 async def client_check_in(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.CLIENT))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
 ):
     """Отметка посещения клиентом"""
     gym_service = GymService(db)
-    result = gym_service.enter_gym(current_user)
+    result = await gym_service.enter_gym(current_user)
     
     # Обновляем информацию о посещениях
     contract_service = ContractService(db)
-    gym_status = gym_service.get_gym_status(current_user)
+    gym_status = await gym_service.get_gym_status(current_user)
     
     return {
         "message": result.get("message", "Посещение отмечено"),
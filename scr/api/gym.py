@@ -2,44 +2,50 @@
 API endpoints для входа/выхода из зала
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from scr.db.database import get_db
+from scr.db.database import get_async_db
+from scr.db.unit_of_work import unit_of_work
 from scr.db.models import User, UserRole
 from scr.core.dependencies import get_current_active_user, require_role
+from scr.core.principal_cache import CurrentPrincipal
 
 router = APIRouter(prefix="/api/gym", tags=["gym"])
 
 
 @router.post("/enter")
 async def enter_gym(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.CLIENT))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
 ):
     """Вход клиента в зал"""
     from scr.services.gym_service import GymService
     gym_service = GymService(db)
-    return gym_service.enter_gym(current_user)
+    # Одна транзакция на запрос: сервисы делают flush, коммит здесь
+    async with unit_of_work(db):
+        return await gym_service.enter_gym(current_user)
 
 
 @router.post("/exit")
 async def exit_gym(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.CLIENT))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
 ):
     """Выход клиента из зала"""
     from scr.services.gym_service import GymService
     gym_service = GymService(db)
-    return gym_service.exit_gym(current_user)
+    # Одна транзакция на запрос: сервисы делают flush, коммит здесь
+    async with unit_of_work(db):
+        return await gym_service.exit_gym(current_user)
 
 
 @router.get("/status")
 async def get_gym_status(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.CLIENT))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
 ):
     """Получение статуса клиента в зале"""
     from scr.services.gym_service import GymService
     gym_service = GymService(db)
-    return gym_service.get_gym_status(current_user)
+    return await gym_service.get_gym_status(current_user)
 
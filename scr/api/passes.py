@@ -5,11 +5,15 @@ from typing import List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from scr.db.database import get_db
+from scr.db.database import get_async_db
 from scr.db.models import User, UserRole, GymZone, ZonePass
 from scr.core.dependencies import require_role
+from scr.core.principal_cache import CurrentPrincipal
 from scr.payment import api
 from scr.core.config import settings
 
@@ -20,10 +24,10 @@ ZONE_PRICES = {
         3: float(settings.PRICE_POOL)}
 
 
-def _ensure_client_passes(db: Session, client_id: UUID) -> List[ZonePass]:
+async def _ensure_client_passes(db: AsyncSession, client_id: UUID) -> List[ZonePass]:
     """Гарантируем что у клиента есть абонемент на каждый активный зал."""
-    zones = db.query(GymZone).filter(GymZone.is_active == True).all()
-    existing = db.query(ZonePass).filter(ZonePass.client_id == client_id).all()
+    zones = (await db.execute(select(GymZone).where(GymZone.is_active == True))).scalars().all()
+    existing = (await db.execute(select(ZonePass).where(ZonePass.client_id == client_id))).scalars().all()
     existing_by_zone = {p.gym_zone_id: p for p in existing}
 
     created_any = False
@@ -34,17 +38,26 @@ def _ensure_client_passes(db: Session, client_id: UUID) -> List[ZonePass]:
             created_any = True
 
     if created_any:
-        db.commit()
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Параллельный запрос уже создал абонементы (уникальный индекс клиент + зал)
+            await db.rollback()
 
-    return db.query(ZonePass).filter(ZonePass.client_id == client_id).all()
+    result = await db.execute(
+        select(ZonePass)
+        .options(selectinload(ZonePass.gym_zone))
+        .where(ZonePass.client_id == client_id)
+    )
+    return result.scalars().all()
 
 
 @router.get("/me")
 async def get_my_passes(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.CLIENT))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
 ):
-    passes = _ensure_client_passes(db, current_user.id)
+    passes = await _ensure_client_passes(db, current_user.id)
     # Возвращаем ровно то, что нужно фронту
     result = []
     for p in passes:
@@ -69,10 +82,12 @@ async def get_my_passes(
 @router.post("/me/{gym_zone_id}/topup", status_code=status.HTTP_200_OK)
 async def topup_pass(
     gym_zone_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.CLIENT))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
 ):
-    zone = db.query(GymZone).filter(GymZone.id == gym_zone_id, GymZone.is_active == True).first()
+    zone = (await db.execute(
+        select(GymZone).where(GymZone.id == gym_zone_id, GymZone.is_active == True)
+    )).scalars().first()
     if not zone:
         raise HTTPException(status_code=404, detail="Зал не найден")
 
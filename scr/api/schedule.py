@@ -3,46 +3,60 @@ API для разовых записей расписания (по конкре
 """
 from typing import List, Optional
 from uuid import UUID
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-
-from scr.db.database import get_db
+from sqlalchemy import Select, and_, case, delete, func, insert, literal, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from scr.db.database import get_async_db
+from scr.db.repositories.zone_pass_repository import AsyncZonePassRepository
+from scr.db.unit_of_work import unit_of_work
 from scr.db.models import (
     User, UserRole,
     GymZone, ZonePass, Visit,
-    TrainingSession, TrainingSessionParticipant,
+    TrainingSession, TrainingSessionParticipant, TrainingSessionWaitlist,
 )
 from scr.core.dependencies import get_current_active_user, require_role
-from scr.schemas.training_session import TrainingSessionCreate, TrainingSessionResponse
+from scr.core.principal_cache import CurrentPrincipal
+from scr.core.responses import model_response
+from scr.schemas.training_session import TrainingSessionCreate, TrainingSessionResponse, TrainingSessionDay
 
 
 router = APIRouter(prefix="/api/schedule", tags=["schedule"])
 
+# Максимальная длина периода для календаря (месяц с запасом)
+SCHEDULE_RANGE_MAX_DAYS = 62
+
 
 @router.post("", response_model=TrainingSessionResponse, status_code=status.HTTP_201_CREATED)
 async def create_training_session(
     payload: TrainingSessionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.TRAINER))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.TRAINER))
 ):
     """Тренер создаёт запись расписания на конкретную дату"""
     if payload.start_time >= payload.end_time:
         raise HTTPException(status_code=400, detail="Время начала должно быть меньше времени окончания")
 
-    zone = db.query(GymZone).filter(GymZone.id == payload.gym_zone_id, GymZone.is_active == True).first()
+    zone = (await db.execute(
+        select(GymZone).where(GymZone.id == payload.gym_zone_id, GymZone.is_active == True)
+    )).scalars().first()
     if not zone:
         raise HTTPException(status_code=404, detail="Зал не найден")
 
     # Проверка пересечений у тренера на эту дату
-    overlap = db.query(TrainingSession).filter(
-        TrainingSession.trainer_id == current_user.id,
-        TrainingSession.session_date == payload.session_date,
-        TrainingSession.is_cancelled == False,
-        TrainingSession.start_time < payload.end_time,
-        TrainingSession.end_time > payload.start_time,
-    ).first()
+    overlap = (await db.execute(
+        select(TrainingSession).where(
+            TrainingSession.trainer_id == current_user.id,
+            TrainingSession.session_date == payload.session_date,
+            TrainingSession.is_cancelled == False,
+            TrainingSession.start_time < payload.end_time,
+            TrainingSession.end_time > payload.start_time,
+        ).limit(1)
+    )).scalars().first()
     if overlap:
         raise HTTPException(status_code=409, detail="У тренера уже есть запись в это время")
 
@@ -55,16 +69,18 @@ async def create_training_session(
         is_cancelled=False,
     )
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.commit()
+    await db.refresh(session)
+
+    trainer = await db.get(User, current_user.id)
 
     return TrainingSessionResponse(
         id=session.id,
         session_date=session.session_date,
         start_time=session.start_time,
         end_time=session.end_time,
-        gym_zone=session.gym_zone,
-        trainer=session.trainer,
+        gym_zone=zone,
+        trainer=trainer,
         participants_count=0,
         participants=[],
         is_cancelled=False,
@@ -76,126 +92,436 @@ async def create_training_session(
 async def list_training_sessions(
     session_date: date = Query(..., description="Дата (YYYY-MM-DD)"),
     gym_zone_id: Optional[int] = Query(None, description="ID зала (опционально)"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(get_current_active_user),
 ):
     """Список записей на дату. Клиент видит все, тренер — только свои."""
-    q = db.query(TrainingSession).filter(
-        TrainingSession.session_date == session_date,
-    )
-    if gym_zone_id:
-        q = q.filter(TrainingSession.gym_zone_id == gym_zone_id)
-
     if current_user.role == UserRole.TRAINER:
-        q = q.filter(TrainingSession.trainer_id == current_user.id)
-
-    sessions = q.order_by(TrainingSession.start_time.asc()).all()
-
-    # Предзагрузка участников
-    session_ids = [s.id for s in sessions]
-    parts = []
-    if session_ids:
-        parts = db.query(TrainingSessionParticipant).filter(TrainingSessionParticipant.session_id.in_(session_ids)).all()
-
-    parts_by_session = {}
-    for p in parts:
-        parts_by_session.setdefault(p.session_id, []).append(p)
-
-    resp: List[TrainingSessionResponse] = []
-    for s in sessions:
-        plist = parts_by_session.get(s.id, [])
-        participants_count = len(plist)
-
-        if current_user.role == UserRole.TRAINER:
-            participants = [p.client for p in plist]
-            resp.append(TrainingSessionResponse(
-                id=s.id,
-                session_date=s.session_date,
-                start_time=s.start_time,
-                end_time=s.end_time,
-                gym_zone=s.gym_zone,
-                trainer=s.trainer,
-                participants_count=participants_count,
-                participants=participants,
-                is_cancelled=s.is_cancelled,
-                is_completed=s.is_completed,
-            ))
-        elif current_user.role == UserRole.CLIENT:
-            is_signed = any(p.client_id == current_user.id for p in plist)
-            resp.append(TrainingSessionResponse(
-                id=s.id,
-                session_date=s.session_date,
-                start_time=s.start_time,
-                end_time=s.end_time,
-                gym_zone=s.gym_zone,
-                trainer=s.trainer,
-                participants_count=participants_count,
-                is_signed=is_signed,
-                is_cancelled=s.is_cancelled,
-                is_completed=s.is_completed,
-            ))
-        else:
-            resp.append(TrainingSessionResponse(
+        # Тренер видит только свои записи и получает полный список участников
+        q = trainer_sessions_query(session_date, current_user.id, gym_zone_id)
+        sessions = (await db.execute(q)).scalars().unique().all()
+        # Модели уже провалидированы при создании: без повторной проверки через response_model
+        return model_response([
+            TrainingSessionResponse(
                 id=s.id,
                 session_date=s.session_date,
                 start_time=s.start_time,
                 end_time=s.end_time,
                 gym_zone=s.gym_zone,
                 trainer=s.trainer,
-                participants_count=participants_count,
+                participants_count=len(s.participants),
+                participants=[p.client for p in s.participants],
                 is_cancelled=s.is_cancelled,
                 is_completed=s.is_completed,
-            ))
+            )
+            for s in sessions
+        ])
+
+    # Клиент и администратор: число участников и is_signed считаются в SQL,
+    # строки участников не загружаются
+    q = sessions_with_stats_query(session_date, session_date, current_user.id, gym_zone_id)
+    rows = (await db.execute(q)).all()
+    return model_response([
+        TrainingSessionResponse(
+            id=s.id,
+            session_date=s.session_date,
+            start_time=s.start_time,
+            end_time=s.end_time,
+            gym_zone=s.gym_zone,
+            trainer=s.trainer,
+            participants_count=participants_count,
+            is_signed=bool(is_signed) if current_user.role == UserRole.CLIENT else None,
+            is_cancelled=s.is_cancelled,
+            is_completed=s.is_completed,
+        )
+        for s, participants_count, is_signed in rows
+    ])
+
+
+def _participant_stats_subquery(date_from: date, date_to: date, client_id: UUID):
+    """
+    Агрегаты по участникам записей за период, считаются в SQL (COUNT ... GROUP BY):
+    число участников и признак, что client_id записан на занятие
+    """
+    return (
+        select(
+            TrainingSessionParticipant.session_id.label("session_id"),
+            func.count().label("participants_count"),
+            func.max(case((TrainingSessionParticipant.client_id == client_id, 1), else_=0)).label("is_signed"),
+        )
+        .join(TrainingSession, TrainingSession.id == TrainingSessionParticipant.session_id)
+        .where(
+            TrainingSession.session_date >= date_from,
+            TrainingSession.session_date <= date_to,
+        )
+        .group_by(TrainingSessionParticipant.session_id)
+        .subquery()
+    )
+
 
-    return resp
+def trainer_sessions_query(session_date: date, trainer_id: UUID, gym_zone_id: Optional[int] = None) -> Select:
+    """
+    Запрос записей тренера на дату с участниками:
+    тренер и зал - JOIN, участники и их клиенты - по одному IN-запросу
+    """
+    q = select(TrainingSession).options(
+        joinedload(TrainingSession.trainer),
+        joinedload(TrainingSession.gym_zone),
+        selectinload(TrainingSession.participants).selectinload(TrainingSessionParticipant.client),
+    ).where(
+        TrainingSession.session_date == session_date,
+        TrainingSession.trainer_id == trainer_id,
+    )
+    if gym_zone_id:
+        q = q.where(TrainingSession.gym_zone_id == gym_zone_id)
+    return q.order_by(TrainingSession.start_time.asc())
+
+
+def sessions_with_stats_query(
+    date_from: date,
+    date_to: date,
+    client_id: UUID,
+    gym_zone_id: Optional[int] = None,
+    trainer_id: Optional[UUID] = None,
+) -> Select:
+    """
+    Запрос записей за период с тренером и залом: строки (запись, число участников, is_signed),
+    участники не загружаются
+    """
+    stats = _participant_stats_subquery(date_from, date_to, client_id)
+    q = (
+        select(
+            TrainingSession,
+            func.coalesce(stats.c.participants_count, 0),
+            func.coalesce(stats.c.is_signed, 0),
+        )
+        .outerjoin(stats, stats.c.session_id == TrainingSession.id)
+        .options(
+            joinedload(TrainingSession.trainer),
+            joinedload(TrainingSession.gym_zone),
+        )
+        .where(
+            TrainingSession.session_date >= date_from,
+            TrainingSession.session_date <= date_to,
+        )
+    )
+    if gym_zone_id:
+        q = q.where(TrainingSession.gym_zone_id == gym_zone_id)
+    if trainer_id:
+        q = q.where(TrainingSession.trainer_id == trainer_id)
+    return q.order_by(TrainingSession.session_date.asc(), TrainingSession.start_time.asc())
+
+
+@router.get("/range", response_model=List[TrainingSessionDay])
+async def list_training_sessions_range(
+    date_from: date = Query(..., alias="from", description="Начало периода (YYYY-MM-DD)"),
+    date_to: date = Query(..., alias="to", description="Конец периода включительно (YYYY-MM-DD)"),
+    gym_zone_id: Optional[int] = Query(None, description="ID зала (опционально)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(get_current_active_user),
+):
+    """
+    Календарь записей за период (неделя, месяц), сгруппированный по датам.
+    Клиент видит все, тренер — только свои. Один запрос, участники не загружаются.
+    """
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="Дата окончания периода должна быть не раньше даты начала")
+    days_count = (date_to - date_from).days + 1
+    if days_count > SCHEDULE_RANGE_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Период не может превышать {SCHEDULE_RANGE_MAX_DAYS} дней")
+
+    trainer_id = current_user.id if current_user.role == UserRole.TRAINER else None
+    q = sessions_with_stats_query(date_from, date_to, current_user.id, gym_zone_id, trainer_id)
+    rows = (await db.execute(q)).all()
+
+    days = {date_from + timedelta(days=i): [] for i in range(days_count)}
+    for s, participants_count, is_signed in rows:
+        days[s.session_date].append(TrainingSessionResponse(
+            id=s.id,
+            session_date=s.session_date,
+            start_time=s.start_time,
+            end_time=s.end_time,
+            gym_zone=s.gym_zone,
+            trainer=s.trainer,
+            participants_count=participants_count,
+            is_signed=bool(is_signed) if current_user.role == UserRole.CLIENT else None,
+            is_cancelled=s.is_cancelled,
+            is_completed=s.is_completed,
+        ))
+
+    return model_response([TrainingSessionDay(session_date=day, sessions=sessions) for day, sessions in days.items()])
+
+
+async def _load_session_for_client(db: AsyncSession, session_id: UUID, client_id: UUID):
+    """
+    Одним запросом: запись с залом, остаток занятий клиента в зале,
+    записан ли клиент и стоит ли он в листе ожидания.
+    Строка записи блокируется (PostgreSQL) до коммита, поэтому параллельные
+    записи на одно занятие проверяют вместимость и очередь по очереди.
+    """
+    is_signed = (
+        select(TrainingSessionParticipant.session_id)
+        .where(
+            TrainingSessionParticipant.session_id == TrainingSession.id,
+            TrainingSessionParticipant.client_id == client_id,
+        )
+        .exists()
+    )
+    in_waitlist = (
+        select(TrainingSessionWaitlist.id)
+        .where(
+            TrainingSessionWaitlist.session_id == TrainingSession.id,
+            TrainingSessionWaitlist.client_id == client_id,
+        )
+        .exists()
+    )
+    return (await db.execute(
+        select(TrainingSession, ZonePass.remaining_visits, is_signed, in_waitlist)
+        .outerjoin(ZonePass, and_(
+            ZonePass.client_id == client_id,
+            ZonePass.gym_zone_id == TrainingSession.gym_zone_id,
+        ))
+        .options(joinedload(TrainingSession.gym_zone))
+        .where(
+            TrainingSession.id == session_id,
+            TrainingSession.is_cancelled == False
+        )
+        .with_for_update(of=TrainingSession)
+    )).first()
+
+
+def _check_client_can_join(session: TrainingSession, remaining_visits: Optional[int], is_signed: bool) -> None:
+    """Проверки перед записью или постановкой в лист ожидания"""
+    # Проверка дубля
+    if is_signed:
+        raise HTTPException(status_code=400, detail="Вы уже записаны на эту тренировку")
+
+    # Проверка наличия абонемента на зал
+    zone = session.gym_zone
+    if session.gym_zone_id and (remaining_visits is None or remaining_visits <= 0):
+        raise HTTPException(
+            status_code=402,
+            detail=f"Недостаточно занятий в абонементе для зала '{zone.name if zone else 'неизвестный'}'. Осталось: {remaining_visits or 0}"
+        )
+
+
+def _zone_capacity(session: TrainingSession) -> Optional[int]:
+    """Вместимость зала записи, если она ограничена"""
+    zone = session.gym_zone
+    if session.gym_zone_id and zone and zone.capacity and zone.capacity > 0:
+        return zone.capacity
+    return None
+
+
+def waitlist_head_query(session_id: UUID, gym_zone_id: Optional[int]) -> Select:
+    """Запрос первой записи листа ожидания, у клиента которой остались занятия в зале"""
+    q = select(TrainingSessionWaitlist).where(TrainingSessionWaitlist.session_id == session_id)
+    if gym_zone_id:
+        q = q.join(ZonePass, and_(
+            ZonePass.client_id == TrainingSessionWaitlist.client_id,
+            ZonePass.gym_zone_id == gym_zone_id,
+        )).where(ZonePass.remaining_visits > 0)
+    return q.order_by(TrainingSessionWaitlist.id).limit(1)
+
+
+def waitlist_position_query(session_id: UUID, entry_id: int) -> Select:
+    """Запрос позиции в листе ожидания: число записей не позже данной (по индексу session_id, id)"""
+    return select(func.count()).select_from(TrainingSessionWaitlist).where(
+        TrainingSessionWaitlist.session_id == session_id,
+        TrainingSessionWaitlist.id <= entry_id,
+    )
+
+
+def session_visits_query(session_id: UUID, client_ids: List[UUID]) -> Select:
+    """Запрос клиентов, у которых уже есть посещение по занятию"""
+    return select(Visit.client_id).where(
+        Visit.training_session_id == session_id,
+        Visit.client_id.in_(client_ids)
+    )
+
+
+async def _promote_from_waitlist(db: AsyncSession, session: TrainingSession) -> Optional[UUID]:
+    """
+    Перевод первого клиента из листа ожидания в участники (FIFO).
+    Выполняется в той же транзакции, что освободила место; клиенты,
+    у которых закончились занятия в абонементе, пропускаются.
+    """
+    entry = (await db.execute(waitlist_head_query(session.id, session.gym_zone_id))).scalars().first()
+    if not entry:
+        return None
+
+    db.add(TrainingSessionParticipant(session_id=session.id, client_id=entry.client_id))
+    await db.delete(entry)
+    return entry.client_id
+
+
+async def _waitlist_position(db: AsyncSession, session_id: UUID, entry_id: int) -> int:
+    """Позиция в листе ожидания"""
+    return (await db.execute(waitlist_position_query(session_id, entry_id))).scalar_one()
 
 
 @router.post("/{session_id}/signup", status_code=status.HTTP_201_CREATED)
 async def signup_for_session(
     session_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.CLIENT))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
 ):
     """Клиент записывается на запись расписания"""
-    session = db.query(TrainingSession).filter(
-        TrainingSession.id == session_id,
-        TrainingSession.is_cancelled == False
-    ).first()
-    if not session:
+    # 1-й запрос: запись, зал, остаток занятий и признаки записи/ожидания
+    row = await _load_session_for_client(db, session_id, current_user.id)
+    if not row:
         raise HTTPException(status_code=404, detail="Запись не найдена")
-
-    # Проверка дубля
-    exists = db.query(TrainingSessionParticipant).filter(
-        TrainingSessionParticipant.session_id == session_id,
-        TrainingSessionParticipant.client_id == current_user.id
-    ).first()
-    if exists:
+    session, remaining_visits, is_signed, in_waitlist = row
+    _check_client_can_join(session, remaining_visits, is_signed)
+
+    # 2-й запрос: INSERT ... SELECT с проверкой вместимости зала (если задана) в том же выражении
+    values = select(
+        literal(session_id, TrainingSessionParticipant.session_id.type),
+        literal(current_user.id, TrainingSessionParticipant.client_id.type),
+        literal(datetime.now(timezone.utc), TrainingSessionParticipant.created_at.type),
+    )
+    capacity = _zone_capacity(session)
+    if capacity:
+        participants_count = (
+            select(func.count())
+            .select_from(TrainingSessionParticipant)
+            .where(TrainingSessionParticipant.session_id == session_id)
+            .scalar_subquery()
+        )
+        values = values.where(participants_count < capacity)
+
+    try:
+        result = await db.execute(
+            insert(TrainingSessionParticipant).from_select(
+                ["session_id", "client_id", "created_at"], values
+            )
+        )
+    except IntegrityError:
+        # Параллельная повторная запись того же клиента: сработал составной первичный ключ
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Вы уже записаны на эту тренировку")
 
-    # Проверка наличия абонемента на зал
-    if session.gym_zone_id:
-        zone_pass = db.query(ZonePass).filter(
-            ZonePass.client_id == current_user.id,
-            ZonePass.gym_zone_id == session.gym_zone_id
-        ).first()
-        if not zone_pass or zone_pass.remaining_visits <= 0:
-            raise HTTPException(
-                status_code=402,
-                detail=f"Недостаточно занятий в абонементе для зала '{session.gym_zone.name if session.gym_zone else 'неизвестный'}'. Осталось: {zone_pass.remaining_visits if zone_pass else 0}"
-            )
+    if result.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="В этом зале больше нет мест. Можно встать в лист ожидания"
+        )
 
-        # Ограничение по вместимости зала (если задано)
-        zone = db.query(GymZone).filter(GymZone.id == session.gym_zone_id).first()
-        if zone and zone.capacity and zone.capacity > 0:
-            cnt = db.query(TrainingSessionParticipant).filter(
-                TrainingSessionParticipant.session_id == session_id
-            ).count()
-            if cnt >= zone.capacity:
-                raise HTTPException(status_code=409, detail="В этом зале больше нет мест")
+    # Клиент записался напрямую - убираем его из листа ожидания
+    if in_waitlist:
+        await db.execute(delete(TrainingSessionWaitlist).where(
+            TrainingSessionWaitlist.session_id == session_id,
+            TrainingSessionWaitlist.client_id == current_user.id,
+        ))
 
-    part = TrainingSessionParticipant(session_id=session_id, client_id=current_user.id)
-    db.add(part)
-    db.commit()
+    await db.commit()
+
+    return {"status": "ok"}
+
+
+@router.delete("/{session_id}/signup")
+async def leave_session(
+    session_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
+):
+    """Клиент отменяет свою запись; место получает первый из листа ожидания"""
+    async with unit_of_work(db):
+        session = (await db.execute(
+            select(TrainingSession).where(
+                TrainingSession.id == session_id,
+                TrainingSession.is_cancelled == False,
+                TrainingSession.is_completed == False
+            ).with_for_update()
+        )).scalars().first()
+        if not session:
+            raise HTTPException(status_code=404, detail="Занятие не найдено, уже отменено или проведено")
+
+        result = await db.execute(delete(TrainingSessionParticipant).where(
+            TrainingSessionParticipant.session_id == session_id,
+            TrainingSessionParticipant.client_id == current_user.id,
+        ))
+        if result.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Вы не записаны на это занятие")
+
+        await _promote_from_waitlist(db, session)
+
+    return {"status": "ok", "message": "Запись отменена"}
+
+
+@router.post("/{session_id}/waitlist", status_code=status.HTTP_201_CREATED)
+async def join_waitlist(
+    session_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
+):
+    """Клиент встает в лист ожидания на заполненное занятие"""
+    row = await _load_session_for_client(db, session_id, current_user.id)
+    if not row:
+        raise HTTPException(status_code=404, detail="Запись не найдена")
+    session, remaining_visits, is_signed, in_waitlist = row
+    if session.is_completed:
+        raise HTTPException(status_code=400, detail="Занятие уже проведено")
+    _check_client_can_join(session, remaining_visits, is_signed)
+    if in_waitlist:
+        raise HTTPException(status_code=400, detail="Вы уже в листе ожидания")
+
+    capacity = _zone_capacity(session)
+    participants_count = (await db.execute(
+        select(func.count()).select_from(TrainingSessionParticipant).where(
+            TrainingSessionParticipant.session_id == session_id
+        )
+    )).scalar_one()
+    if not capacity or participants_count < capacity:
+        raise HTTPException(status_code=400, detail="Есть свободные места, запишитесь на занятие")
+
+    entry = TrainingSessionWaitlist(session_id=session_id, client_id=current_user.id)
+    db.add(entry)
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Вы уже в листе ожидания")
+    position = await _waitlist_position(db, session_id, entry.id)
+    await db.commit()
+
+    return {"status": "ok", "position": position}
+
+
+@router.get("/{session_id}/waitlist/me")
+async def get_my_waitlist_position(
+    session_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
+):
+    """Позиция клиента в листе ожидания (без загрузки списка участников)"""
+    entry_id = (await db.execute(
+        select(TrainingSessionWaitlist.id).where(
+            TrainingSessionWaitlist.session_id == session_id,
+            TrainingSessionWaitlist.client_id == current_user.id,
+        )
+    )).scalar()
+    if entry_id is None:
+        return {"in_waitlist": False, "position": None}
+
+    return {"in_waitlist": True, "position": await _waitlist_position(db, session_id, entry_id)}
+
+
+@router.delete("/{session_id}/waitlist")
+async def leave_waitlist(
+    session_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.CLIENT))
+):
+    """Клиент выходит из листа ожидания"""
+    result = await db.execute(delete(TrainingSessionWaitlist).where(
+        TrainingSessionWaitlist.session_id == session_id,
+        TrainingSessionWaitlist.client_id == current_user.id,
+    ))
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Вы не в листе ожидания")
+    await db.commit()
 
     return {"status": "ok"}
 
@@ -203,21 +529,25 @@ async def signup_for_session(
 @router.delete("/{session_id}")
 async def cancel_training_session(
     session_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.TRAINER))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.TRAINER))
 ):
     """Тренер отменяет своё занятие"""
-    session = db.query(TrainingSession).filter(
-        TrainingSession.id == session_id,
-        TrainingSession.trainer_id == current_user.id,
-        TrainingSession.is_cancelled == False,
-        TrainingSession.is_completed == False
-    ).first()
+    session = (await db.execute(
+        select(TrainingSession).where(
+            TrainingSession.id == session_id,
+            TrainingSession.trainer_id == current_user.id,
+            TrainingSession.is_cancelled == False,
+            TrainingSession.is_completed == False
+        )
+    )).scalars().first()
     if not session:
         raise HTTPException(status_code=404, detail="Занятие не найдено, уже отменено или проведено")
 
     session.is_cancelled = True
-    db.commit()
+    # Лист ожидания отмененного занятия больше не нужен
+    await db.execute(delete(TrainingSessionWaitlist).where(TrainingSessionWaitlist.session_id == session_id))
+    await db.commit()
 
     return {"status": "ok", "message": "Занятие отменено"}
 
@@ -225,76 +555,78 @@ async def cancel_training_session(
 @router.post("/{session_id}/complete", status_code=status.HTTP_200_OK)
 async def complete_training_session(
     session_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.TRAINER))
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentPrincipal = Depends(require_role(UserRole.TRAINER))
 ):
     """Тренер отмечает занятие как проведенное - списывает занятия у всех участников"""
-    # Берем блокировку строки, чтобы исключить двойное проведение при параллельных запросах
-    session = db.query(TrainingSession).filter(
-        TrainingSession.id == session_id,
-        TrainingSession.trainer_id == current_user.id,
-        TrainingSession.is_cancelled == False
-    ).with_for_update().first()
-    if not session:
-        raise HTTPException(status_code=404, detail="Занятие не найдено или уже отменено")
+    # Все списания и отметка о проведении - одна транзакция с одним коммитом
+    async with unit_of_work(db):
+        # Берем блокировку строки, чтобы исключить двойное проведение при параллельных запросах
+        session = (await db.execute(
+            select(TrainingSession).where(
+                TrainingSession.id == session_id,
+                TrainingSession.trainer_id == current_user.id,
+                TrainingSession.is_cancelled == False
+            ).with_for_update()
+        )).scalars().first()
+        if not session:
+            raise HTTPException(status_code=404, detail="Занятие не найдено или уже отменено")
+
+        # Проверяем, не было ли занятие уже проведено
+        if session.is_completed:
+            raise HTTPException(status_code=400, detail="Занятие уже отмечено как проведенное")
+
+        # Получаем всех участников
+        participants = (await db.execute(
+            select(TrainingSessionParticipant)
+            .options(selectinload(TrainingSessionParticipant.client))
+            .where(TrainingSessionParticipant.session_id == session_id)
+        )).scalars().all()
+
+        if not participants:
+            raise HTTPException(status_code=400, detail="На занятие никто не записан")
+
+        # Списываем занятия у всех участников и создаем записи в истории посещений.
+        # Число запросов не зависит от числа участников.
+        successful_count = 0
+        failed_clients = []
 
-    # Проверяем, не было ли занятие уже проведено
-    if session.is_completed:
-        raise HTTPException(status_code=400, detail="Занятие уже отмечено как проведенное")
-
-    # Получаем всех участников
-    participants = db.query(TrainingSessionParticipant).filter(
-        TrainingSessionParticipant.session_id == session_id
-    ).all()
+        if session.gym_zone_id:
+            client_ids = [p.client_id for p in participants]
 
-    if not participants:
-        raise HTTPException(status_code=400, detail="На занятие никто не записан")
+            # Клиенты, у которых посещение по этому занятию уже есть, пропускаются (идемпотентность)
+            already = set((await db.execute(session_visits_query(session.id, client_ids))).scalars().all())
+            to_charge = [client_id for client_id in client_ids if client_id not in already]
 
-    # Списываем занятия у каждого участника и создаем записи в истории посещений
-    successful_count = 0
-    failed_clients = []
+            # Атомарное списание одним UPDATE: параллельные запросы не спишут занятие дважды
+            charged = await AsyncZonePassRepository(db).decrement_remaining_visits_bulk(
+                to_charge, session.gym_zone_id
+            )
+            successful_count = len(charged)
 
-    for participant in participants:
-        if session.gym_zone_id:
-            # Если уже есть запись посещения по этому занятию для этого клиента — пропускаем (идемпотентность)
-            already = db.query(Visit).filter(
-                Visit.client_id == participant.client_id,
-                Visit.training_session_id == session.id
-            ).first()
-            if already:
-                continue
-
-            zone_pass = db.query(ZonePass).filter(
-                ZonePass.client_id == participant.client_id,
-                ZonePass.gym_zone_id == session.gym_zone_id
-            ).first()
-            if zone_pass and zone_pass.remaining_visits > 0:
-                zone_pass.remaining_visits -= 1
-                successful_count += 1
-
-                # Создаем запись в истории посещений
+            if charged:
                 check_in_datetime = datetime.combine(session.session_date, session.start_time).replace(tzinfo=timezone.utc)
                 check_out_datetime = datetime.combine(session.session_date, session.end_time).replace(tzinfo=timezone.utc)
-
-                visit = Visit(
-                    client_id=participant.client_id,
-                    trainer_id=session.trainer_id,
-                    training_session_id=session.id,
-                    visit_type="training",
-                    check_in_time=check_in_datetime,
-                    check_out_time=check_out_datetime
-                )
-                db.add(visit)
-            else:
-                # Если у клиента нет абонемента или занятий, добавляем в список проблемных
-                client_name = f"{participant.client.first_name} {participant.client.last_name}"
-                failed_clients.append(client_name)
-
-    # Отмечаем занятие как проведенное
-    session.is_completed = True
-    session.completed_at = datetime.now(timezone.utc)
-
-    db.commit()
+                await db.execute(insert(Visit), [
+                    {
+                        "client_id": client_id,
+                        "trainer_id": session.trainer_id,
+                        "training_session_id": session.id,
+                        "visit_type": "training",
+                        "check_in_time": check_in_datetime,
+                        "check_out_time": check_out_datetime,
+                    }
+                    for client_id in charged
+                ])
+
+            # Если у клиента нет абонемента или занятий, добавляем в список проблемных
+            for participant in participants:
+                if participant.client_id not in already and participant.client_id not in charged:
+                    failed_clients.append(f"{participant.client.first_name} {participant.client.last_name}")
+
+        # Отмечаем занятие как проведенное
+        session.is_completed = True
+        session.completed_at = datetime.now(timezone.utc)
 
     message = f"Занятие проведено. Списано занятий у {successful_count} клиентов."
     if failed_clients:
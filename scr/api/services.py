@@ -1,11 +1,13 @@
 """
 API endpoints для услуг
 """
-from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from scr.db.database import get_db
+from scr.core.catalog_cache import SERVICES, catalog_response
+from scr.db.database import get_async_db
 from scr.db.models import Service
 from pydantic import BaseModel
 
@@ -16,7 +18,7 @@ class ServiceResponse(BaseModel):
     id: int
     name: str
     category: str
-    description: str = None
+    description: Optional[str] = None
     duration_minutes: int
     max_participants: int
     base_price: float
@@ -27,9 +29,13 @@ class ServiceResponse(BaseModel):
 
 @router.get("", response_model=List[ServiceResponse])
 async def get_services(
-    db: Session = Depends(get_db)
-):
-    """Получение списка всех услуг"""
-    services = db.query(Service).all()
-    return services
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+) -> Response:
+    """Получение списка всех услуг (из кэша справочников, с ETag)"""
+    async def load_services() -> List[ServiceResponse]:
+        result = await db.execute(select(Service))
+        return [ServiceResponse.model_validate(service) for service in result.scalars().all()]
+
+    return await catalog_response(request, SERVICES, load_services)
 
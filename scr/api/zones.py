@@ -1,11 +1,13 @@
 """
 API endpoints для залов
 """
-from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from scr.db.database import get_db
+from scr.core.catalog_cache import ZONES, catalog_response
+from scr.db.database import get_async_db
 from scr.db.models import GymZone
 from pydantic import BaseModel
 
@@ -15,7 +17,7 @@ router = APIRouter(prefix="/api/zones", tags=["zones"])
 class ZoneResponse(BaseModel):
     id: int
     name: str
-    description: str = None
+    description: Optional[str] = None
     capacity: int
     is_active: bool
     
@@ -25,9 +27,13 @@ class ZoneResponse(BaseModel):
 
 @router.get("", response_model=List[ZoneResponse])
 async def get_zones(
-    db: Session = Depends(get_db)
-):
-    """Получение списка всех залов"""
-    zones = db.query(GymZone).filter(GymZone.is_active == True).all()
-    return zones
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+) -> Response:
+    """Получение списка всех залов (из кэша справочников, с ETag)"""
+    async def load_zones() -> List[ZoneResponse]:
+        result = await db.execute(select(GymZone).where(GymZone.is_active == True))
+        return [ZoneResponse.model_validate(zone) for zone in result.scalars().all()]
+
+    return await catalog_response(request, ZONES, load_zones)
 
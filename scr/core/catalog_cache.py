@@ -0,0 +1,158 @@
+"""
+Кэш справочников (залы, услуги) для GET /api/zones и GET /api/services
+
+Справочник хранится в процессе уже сериализованным в JSON вместе со строгим ETag
+(хеш тела ответа). Повторный запрос отдается из памяти, а запрос с совпадающим
+If-None-Match получает 304 без обращения к БД. У каждого справочника есть версия:
+запись GymZone или Service через ORM-сессию этого процесса после COMMIT увеличивает
+версию и сбрасывает кэш, а загрузка, начатая до сброса, в кэш не попадает.
+Изменения из других процессов (init_database.py, другие воркеры) становятся видны
+по истечении CATALOG_CACHE_TTL_SECONDS; ETag при этом меняется, только если
+изменилось содержимое.
+"""
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Sequence
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from scr.core.config import settings
+from scr.core.responses import model_response
+from scr.db.models import GymZone, Service
+
+ZONES = "zones"
+SERVICES = "services"
+
+# Модели, запись которых сбрасывает справочник
+_CATALOG_MODELS = {GymZone: ZONES, Service: SERVICES}
+_CHANGED_CATALOGS_KEY = "catalog_cache_changed"
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Сериализованный справочник одной версии"""
+    version: int
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class CatalogCache:
+    """Версионированный кэш справочников с TTL"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._versions: Dict[str, int] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def version(self, name: str) -> int:
+        return self._versions.get(name, 0)
+
+    def get(self, name: str) -> Optional[CatalogEntry]:
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        if entry.version != self.version(name) or entry.expires_at < time.monotonic():
+            del self._entries[name]
+            return None
+        return entry
+
+    async def get_or_load(
+        self,
+        name: str,
+        load: Callable[[], Awaitable[Sequence[BaseModel]]]
+    ) -> CatalogEntry:
+        """Справочник из кэша или из БД (параллельные промахи выполняют одну загрузку)"""
+        entry = self.get(name)
+        if entry is not None:
+            return entry
+
+        async with self._locks.setdefault(name, asyncio.Lock()):
+            entry = self.get(name)
+            if entry is not None:
+                return entry
+
+            version = self.version(name)
+            body = model_response(await load()).body
+            entry = CatalogEntry(
+                version=version,
+                body=body,
+                etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                expires_at=time.monotonic() + self.ttl_seconds,
+            )
+            # Справочник изменился во время загрузки: ответ отдаем, но не кэшируем
+            if self.ttl_seconds > 0 and version == self.version(name):
+                self._entries[name] = entry
+            return entry
+
+    def invalidate(self, name: str) -> None:
+        self._versions[name] = self.version(name) + 1
+        self._entries.pop(name, None)
+
+    def clear(self) -> None:
+        for name in set(self._entries) | set(self._versions):
+            self.invalidate(name)
+
+
+catalog_cache = CatalogCache(ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # Для If-None-Match используется слабое сравнение: W/"x" совпадает с "x"
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def catalog_response(
+    request: Request,
+    name: str,
+    load: Callable[[], Awaitable[Sequence[BaseModel]]]
+) -> Response:
+    """Ответ справочника с ETag и Cache-Control; 304, если у клиента актуальная версия"""
+    entry = await catalog_cache.get_or_load(name, load)
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={settings.CATALOG_MAX_AGE_SECONDS}",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+# --- Сброс при записи через ORM ---
+
+def _after_flush(session: Session, flush_context) -> None:
+    # В after_flush списки new/dirty/deleted еще содержат записанные объекты
+    changed = {
+        _CATALOG_MODELS[type(instance)]
+        for instance in (*session.new, *session.dirty, *session.deleted)
+        if type(instance) in _CATALOG_MODELS
+    }
+    if changed:
+        session.info.setdefault(_CHANGED_CATALOGS_KEY, set()).update(changed)
+
+
+def _after_commit(session: Session) -> None:
+    for name in session.info.pop(_CHANGED_CATALOGS_KEY, ()):
+        catalog_cache.invalidate(name)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_CHANGED_CATALOGS_KEY, None)
+
+
+# Обработчики на классе Session действуют и на AsyncSession (через sync_session)
+event.listen(Session, "after_flush", _after_flush)
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
@@ -1,27 +1,46 @@
 """
 Конфигурация приложения
 """
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
 from pydantic_settings import BaseSettings
-import os
-from dotenv import load_dotenv
+
 
 class Settings(BaseSettings):
-    """Настройки приложения"""
-    load_dotenv()
+    """Настройки приложения (переменные окружения и файл .env)"""
     # Название приложения
     APP_NAME: str = "Gym Management System"
     APP_VERSION: str = "1.0.0"
     
     # База данных
-    DATABASE_URL: str = os.getenv("DATABASE_URL")
-    DB_USERNAME: str = os.getenv("DB_USERNAME")
-    DB_PASSWORD: str = os.getenv("DB_PASSWORD")
-    DB_DATABASE: str = os.getenv("DB_DATABASE")
+    DATABASE_URL: str
+    DB_USERNAME: Optional[str] = None
+    DB_PASSWORD: Optional[str] = None
+    DB_DATABASE: Optional[str] = None
     
     # JWT настройки
-    SECRET_KEY: str = os.getenv("SECRET_KEY")
+    SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Пул процессов для bcrypt
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+
+    # Кэш текущего пользователя в get_current_user
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    # Кэш справочников (залы, услуги): время жизни в процессе и max-age для клиентов
+    CATALOG_CACHE_TTL_SECONDS: int = 300
+    CATALOG_MAX_AGE_SECONDS: int = 60
+    
+    # Отладка: заголовки X-DB-Query-Count / X-DB-Query-Time-Ms в ответах
+    DEBUG: bool = False
+    # Запросы к БД дольше порога печатаются в лог (0 - не логировать)
+    SLOW_QUERY_THRESHOLD_MS: int = 200
     
     # CORS
     CORS_ORIGINS: list = ["*"]
@@ -42,9 +61,16 @@ class Settings(BaseSettings):
     PRICE_POOL: int
     
     class Config:
-        env_file = ".env"
+        # .env в корне проекта, независимо от текущего каталога
+        env_file = Path(__file__).resolve().parents[2] / ".env"
         case_sensitive = True
 
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """Настройки читаются из окружения и .env один раз на процесс"""
+    return Settings()
+
+
+settings = get_settings()
 
@@ -4,21 +4,21 @@
 from typing import Generator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from scr.db.database import get_db
+from scr.db.database import get_async_db
 from scr.core.security import decode_access_token
-from scr.db.models import User, UserRole
-from scr.db.repositories.user_repository import UserRepository
+from scr.core.principal_cache import CurrentPrincipal, principal_cache
+from scr.db.models import UserRole
+from scr.db.repositories.user_repository import AsyncUserRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> CurrentPrincipal:
     """Получение текущего пользователя из JWT токена"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -34,23 +34,29 @@ def get_current_user(
     if user_id_str is None:
         raise credentials_exception
     
+    principal = principal_cache.get(user_id_str)
+    if principal is not None:
+        return principal
+
     from uuid import UUID
     try:
         user_id = UUID(user_id_str)
     except ValueError:
         raise credentials_exception
     
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_id(user_id)
+    user_repo = AsyncUserRepository(db)
+    user = await user_repo.get_by_id(user_id)
     if user is None:
         raise credentials_exception
     
-    return user
+    principal = CurrentPrincipal.from_user(user)
+    principal_cache.set(user_id_str, principal)
+    return principal
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_current_active_user(
+    current_user: CurrentPrincipal = Depends(get_current_user)
+) -> CurrentPrincipal:
     """Проверка активности пользователя"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Неактивный пользователь")
@@ -59,7 +65,7 @@ def get_current_active_user(
 
 def require_role(*allowed_roles: UserRole):
     """Декоратор для проверки роли пользователя"""
-    def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
+    async def role_checker(current_user: CurrentPrincipal = Depends(get_current_active_user)) -> CurrentPrincipal:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,116 @@
+"""
+Пул процессов для хеширования паролей (bcrypt)
+
+bcrypt намеренно медленный (~250 мс CPU на операцию), поэтому хеширование и проверка
+выполняются в отдельных процессах, а не в event loop uvicorn.
+"""
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from scr.core.config import settings
+from scr.core.metrics import PASSWORD_HASH_DURATION
+from scr.core.security import get_password_hash, verify_password
+
+
+class PasswordHasherPool:
+    """Ограниченный пул для bcrypt с контролем очереди и метриками"""
+
+    def __init__(self, max_workers: int, queue_limit: int):
+        self.max_workers = max(1, max_workers)
+        self.queue_limit = max(0, queue_limit)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+
+        # Метрики
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Количество задач, ожидающих свободного процесса"""
+        return max(0, self._in_flight - self.max_workers)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Процессы создаются при первом обращении, а не при импорте
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def _submit(self, operation: str, func, *args):
+        if self._in_flight >= self.max_workers + self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Сервис перегружен, повторите попытку позже",
+                headers={"Retry-After": "1"},
+            )
+
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            return result
+        finally:
+            self._in_flight -= 1
+            elapsed = time.perf_counter() - started
+            self.latency_total += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+            PASSWORD_HASH_DURATION.observe(elapsed, operation=operation)
+
+    async def hash(self, password: str) -> str:
+        """Хеширование пароля в пуле процессов"""
+        return await self._submit("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Проверка пароля в пуле процессов"""
+        return await self._submit("verify", verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """Метрики пула: задержка хеширования и глубина очереди"""
+        finished = self.completed + self.failed
+        return {
+            "workers": self.max_workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "latency_avg_ms": round(self.latency_total / finished * 1000, 2) if finished else 0.0,
+            "latency_max_ms": round(self.latency_max * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        """Остановка процессов пула"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasherPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Асинхронное хеширование пароля"""
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Асинхронная проверка пароля"""
+    return await password_hasher.verify(plain_password, hashed_password)
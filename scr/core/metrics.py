@@ -0,0 +1,302 @@
+"""
+Метрики приложения в текстовом формате Prometheus (без внешних зависимостей)
+
+Метрики хранятся в памяти процесса: при нескольких воркерах каждый отдает свои
+значения, а суммирование выполняет Prometheus. Маршруты подписываются шаблоном
+пути (/api/schedule/{session_id}), а не фактическим URL, чтобы число рядов
+не зависело от идентификаторов в запросах.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: List["_Metric"] = []
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """Базовая метрика: имя, описание, метки и регистрация для /metrics"""
+    type_name = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # Значения, вычисляемые при каждом сборе (например, состояние пула соединений)
+        self.function = function
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        if self.function is not None:
+            values = self.function()
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+    def collect(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    """Монотонно растущий счетчик"""
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Текущее значение, которое может расти и уменьшаться"""
+    type_name = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Распределение значений по корзинам (для p50/p99 через histogram_quantile)"""
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # метки -> (счетчики по корзинам без накопления, сумма, количество)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._series.get(key) or ([0] * (len(self.buckets) + 1), 0.0, 0)
+            counts[index] += 1
+            self._series[key] = (counts, total + value, count + 1)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+
+        lines = []
+        bucket_labelnames = self.labelnames + ("le",)
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for upper, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(bucket_labelnames, key + (_format_value(upper),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render_metrics() -> str:
+    """Все зарегистрированные метрики в текстовом формате Prometheus"""
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+# --- Пулы соединений с БД ---
+
+_watched_engines: Dict[str, object] = {}
+
+
+def watch_engine(label: str, engine) -> None:
+    """Публикация размера и занятости пула соединений синхронного движка"""
+    _watched_engines[label] = engine
+
+
+def _pool_values(method: str) -> Dict[Tuple[str, ...], float]:
+    values = {}
+    for label, engine in _watched_engines.items():
+        # У пулов без очереди (например, NullPool для SQLite) этих показателей нет
+        pool_method = getattr(engine.pool, method, None)
+        if pool_method is not None:
+            values[(label,)] = pool_method()
+    return values
+
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Размер пула соединений", ("engine",),
+    function=lambda: _pool_values("size")
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Соединения, выданные из пула", ("engine",),
+    function=lambda: _pool_values("checkedout")
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Соединения сверх pool_size (отрицательное значение - запас до pool_size)", ("engine",),
+    function=lambda: _pool_values("overflow")
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Время получения соединения из пула, включая установку нового", ("engine",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+
+# --- Пул хеширования паролей ---
+
+def _password_hasher_value(field: str) -> Dict[Tuple[str, ...], float]:
+    from scr.core.hashing import password_hasher
+    return {(): password_hasher.stats()[field]}
+
+
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight", "Операции bcrypt в работе и в очереди",
+    function=lambda: _password_hasher_value("in_flight")
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "Операции bcrypt, ожидающие свободного процесса",
+    function=lambda: _password_hasher_value("queue_depth")
+)
+PASSWORD_HASH_COMPLETED = Counter(
+    "password_hash_completed_total", "Успешно выполненные операции bcrypt",
+    function=lambda: _password_hasher_value("completed")
+)
+PASSWORD_HASH_FAILED = Counter(
+    "password_hash_failed_total", "Операции bcrypt, завершившиеся ошибкой (например, упал процесс пула)",
+    function=lambda: _password_hasher_value("failed")
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "Операции bcrypt, отклоненные из-за переполнения очереди",
+    function=lambda: _password_hasher_value("rejected")
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "Время операции bcrypt, включая ожидание свободного процесса", ("operation",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+
+# --- Бизнес-события ---
+
+GYM_ENTRIES = Counter("gym_entries_total", "Входы клиентов в зал")
+GYM_EXITS = Counter("gym_exits_total", "Выходы клиентов из зала")
+LOCKER_ASSIGNMENTS = Counter(
+    "locker_assignments_total", "Выдача шкафчиков при входе (assigned - выдан, unavailable - свободных нет)",
+    ("result",)
+)
+PAYMENTS = Counter(
+    "payments_total", "Платежи (created - создан в YooKassa, succeeded - подтвержден вебхуком)",
+    ("status",)
+)
+
+
+# --- HTTP ---
+
+HTTP_REQUESTS_TOTAL = Counter(
+    "http_requests_total", "HTTP-запросы по маршрутам и кодам ответа", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Время обработки HTTP-запроса", ("method", "route")
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP-запросы в обработке")
+
+
+class MetricsMiddleware:
+    """ASGI middleware: число и длительность запросов по шаблону маршрута, запросы в обработке"""
+
+    def __init__(self, app):
+        self.app = app
+        self._routes_by_endpoint: Optional[Dict[object, list]] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            route = self._route_label(scope)
+            HTTP_REQUEST_DURATION.observe(elapsed, method=scope["method"], route=route)
+            HTTP_REQUESTS_TOTAL.inc(method=scope["method"], route=route, status=status_code)
+
+    def _route_label(self, scope) -> str:
+        # Роутер Starlette записывает найденный endpoint в scope запроса
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+
+        if self._routes_by_endpoint is None:
+            routes_by_endpoint: Dict[object, list] = {}
+            for route in scope["app"].router.routes:
+                target = getattr(route, "endpoint", None) or getattr(route, "app", None)
+                routes_by_endpoint.setdefault(target, []).append(route)
+            self._routes_by_endpoint = routes_by_endpoint
+
+        routes = self._routes_by_endpoint.get(endpoint, [])
+        if len(routes) == 1:
+            return routes[0].path
+        for route in routes:
+            if route.matches(scope)[0] != Match.NONE:
+                return route.path
+        return "unmatched"
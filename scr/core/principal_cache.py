@@ -0,0 +1,83 @@
+"""
+Кэш аутентифицированных пользователей (principal) для get_current_user
+
+Хранит облегченный снимок пользователя по `sub` из JWT, чтобы повторные запросы
+с тем же токеном не обращались к таблице users. Кэш локален для процесса, поэтому
+TTL должен быть коротким: при нескольких воркерах инвалидация видна только в текущем.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from uuid import UUID
+
+from scr.core.config import settings
+from scr.db.models import User, UserRole
+
+
+@dataclass(frozen=True)
+class CurrentPrincipal:
+    """Снимок текущего пользователя, достаточный для проверки прав"""
+    id: UUID
+    role: UserRole
+    is_active: bool
+    in_gym: bool
+    current_locker_id: Optional[int]
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentPrincipal":
+        return cls(
+            id=user.id,
+            role=user.role,
+            is_active=bool(user.is_active),
+            in_gym=bool(user.in_gym),
+            current_locker_id=user.current_locker_id,
+        )
+
+
+class PrincipalCache:
+    """TTL + LRU кэш снимков пользователей"""
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._items: "OrderedDict[str, Tuple[float, CurrentPrincipal]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CurrentPrincipal]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, principal = item
+        if expires_at < time.monotonic():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return principal
+
+    def set(self, key: str, principal: CurrentPrincipal) -> None:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        self._items[key] = (time.monotonic() + self.ttl_seconds, principal)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, user_id) -> None:
+        self._items.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+)
+
+
+def invalidate_principal(user_id) -> None:
+    """Сброс снимка пользователя после изменения его данных"""
+    principal_cache.invalidate(user_id)
@@ -0,0 +1,48 @@
+"""
+JSON-ответы на orjson
+
+ORJSONResponse - класс ответа по умолчанию для всего приложения (scr/main.py).
+Если endpoint объявлен с response_model, FastAPI перед сериализацией заново
+валидирует возвращенное значение: модели выгружаются в dict, проверяются
+и снова выгружаются. Endpoint, который сам собирает Pydantic-модели
+(например, список записей расписания), возвращает model_response(...):
+готовый Response FastAPI не проверяет, а response_model в декораторе
+остается только для документации OpenAPI.
+"""
+from decimal import Decimal
+from typing import Any, Sequence, Union
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    # model_dump() оставляет Decimal как есть, orjson его не сериализует;
+    # Pydantic в JSON-режиме тоже отдает Decimal строкой
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+class ModelResponse(ORJSONResponse):
+    """Ответ из уже провалидированных Pydantic-моделей, без повторной проверки"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            content = content.model_dump(by_alias=True)
+        elif isinstance(content, (list, tuple)):
+            content = [
+                item.model_dump(by_alias=True) if isinstance(item, BaseModel) else item
+                for item in content
+            ]
+        # UUID, date, time, datetime и Enum orjson сериализует сам
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def model_response(
+    content: Union[BaseModel, Sequence[BaseModel]],
+    status_code: int = 200
+) -> ModelResponse:
+    """Ответ endpoint'а с response_model из готовых моделей (модель или список моделей)"""
+    return ModelResponse(content, status_code=status_code)
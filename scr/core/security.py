@@ -3,8 +3,6 @@
 """
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import JWTError, jwt
-import bcrypt
 from scr.core.config import settings
 
 
@@ -22,6 +20,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     if len(password_bytes) > 72:
         password_bytes = password_bytes[:72]
     
+    # bcrypt импортируется только там, где хешируются пароли (процессы пула хеширования)
+    import bcrypt
     try:
         # Проверяем пароль используя bcrypt напрямую
         return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
@@ -44,6 +44,7 @@ def get_password_hash(password: str) -> str:
         password_bytes = password_bytes[:72]
     
     # Хешируем используя bcrypt напрямую
+    import bcrypt
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
@@ -58,12 +59,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
+    # jose тянет cryptography (и через нее bcrypt), поэтому импортируется при первом токене,
+    # а не при старте приложения
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> Optional[dict]:
     """Декодирование JWT токена"""
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
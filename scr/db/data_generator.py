@@ -0,0 +1,400 @@
+"""
+Генератор синтетических данных для бенчмарков и профилирования
+
+Поверх init_default_data (администратор, залы, услуги) пакетно добавляет клиентов
+с абонементами и балансами по залам, тренеров с недельным расписанием, шкафчики,
+записи расписания с участниками и, при необходимости, историю посещений и
+проведенных занятий за прошлые дни. Данные детерминированы: при одинаковых
+параметрах, seed и base_date генерируются одни и те же строки (включая created_at),
+а занятия одного тренера не пересекаются по времени. Рассчитан на пустую БД.
+
+На PostgreSQL (psycopg2) строки загружаются через COPY, на остальных БД -
+пакетами insert (executemany). Команда для больших объемов: python generate_data.py
+"""
+import csv
+import io
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from enum import Enum as PyEnum
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from scr.core.security import get_password_hash
+from scr.db.init_db import init_default_data
+from scr.db.models import (
+    Contract, ContractStatus, GymZone, Locker, Service, Subscription, SubscriptionType,
+    TrainerSchedule, TrainingSession, TrainingSessionParticipant, User, UserRole, UTCDateTime, Visit, ZonePass
+)
+
+# Занятия идут с 8:00 до 20:00 (начало часа); у тренера не больше SESSIONS_PER_DAY предстоящих занятий в день
+SESSION_HOURS = 12
+SESSIONS_PER_DAY = 4
+
+
+@dataclass
+class GeneratorConfig:
+    """Объем генерируемых данных"""
+    clients: int = 200
+    trainers: int = 10
+    lockers: int = 40
+    sessions: int = 60  # записи расписания, начиная с base_date
+    participants_per_session: int = 5
+    visits_per_subscription: int = 100
+    zone_pass_visits: int = 50
+    # История за прошлые дни: посещения зала и проведенные занятия с участниками
+    history_days: int = 0
+    visits_per_client: int = 0
+    past_sessions: int = 0
+    password: str = "bench12345"
+    seed: int = 42
+    # Дата, от которой отсчитываются занятия, договоры и история (None - сегодня)
+    base_date: Optional[date] = None
+    batch_size: int = 1000
+
+
+@dataclass
+class GeneratedData:
+    """Идентификаторы созданных данных для сценариев нагрузки"""
+    password: str
+    client_ids: List[UUID] = field(default_factory=list)
+    client_emails: List[str] = field(default_factory=list)
+    trainer_ids: List[UUID] = field(default_factory=list)
+    zone_ids: List[int] = field(default_factory=list)
+    service_id: int = 0
+    # запись расписания -> тренер
+    session_trainers: Dict[UUID, UUID] = field(default_factory=dict)
+    # пары (запись, клиент), уже записанные на предстоящие занятия
+    participants: Set[Tuple[UUID, UUID]] = field(default_factory=set)
+    # таблица -> число добавленных строк
+    row_counts: Dict[str, int] = field(default_factory=dict)
+
+
+def _uuid(rng: random.Random) -> UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _batches(rows: Iterable[dict], batch_size: int) -> Iterator[List[dict]]:
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert_batches(conn: Connection, model, rows: Iterable[dict], batch_size: int) -> int:
+    """Вставка строк пакетами (executemany); возвращает число строк"""
+    total = 0
+    for batch in _batches(rows, batch_size):
+        conn.execute(insert(model), batch)
+        total += len(batch)
+    return total
+
+
+def _copy_value(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, PyEnum):
+        # Enum в моделях хранится по имени элемента
+        return value.name
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def copy_batches(conn: Connection, model, rows: Iterable[dict], batch_size: int) -> int:
+    """
+    Загрузка строк через COPY ... FROM STDIN (PostgreSQL, psycopg2) в транзакции conn.
+    COPY не вычисляет Python-значения по умолчанию из моделей, поэтому они
+    подставляются здесь.
+    """
+    table = model.__table__
+    defaults = {
+        column.name: column.default
+        for column in table.columns
+        if column.default is not None and not column.primary_key
+    }
+    cursor = conn.connection.dbapi_connection.cursor()
+    total = 0
+    try:
+        for batch in _batches(rows, batch_size):
+            columns = list(batch[0]) + [name for name in defaults if name not in batch[0]]
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in batch:
+                values = []
+                for name in columns:
+                    if name in row:
+                        value = row[name]
+                    else:
+                        default = defaults[name]
+                        value = default.arg(None) if default.is_callable else default.arg
+                    values.append(_copy_value(value))
+                writer.writerow(values)
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+            total += len(batch)
+    finally:
+        cursor.close()
+    return total
+
+
+def _with_timestamps(model, rows: Iterable[dict], timestamp: datetime) -> Iterator[dict]:
+    """Фиксированное время вместо значений по умолчанию datetime.now() (created_at, updated_at)"""
+    columns = [
+        column.name
+        for column in model.__table__.columns
+        if isinstance(column.type, UTCDateTime) and column.default is not None
+    ]
+    for row in rows:
+        yield {**{name: timestamp for name in columns}, **row}
+
+
+def write_rows(conn: Connection, model, rows: Iterable[dict], batch_size: int) -> int:
+    """Пакетная запись строк: COPY на PostgreSQL (psycopg2), иначе insert"""
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2":
+        return copy_batches(conn, model, rows, batch_size)
+    return insert_batches(conn, model, rows, batch_size)
+
+
+def generate(engine: Engine, config: GeneratorConfig) -> GeneratedData:
+    """Генерация данных; таблицы должны существовать (python migrate.py)"""
+    rng = random.Random(config.seed)
+    today = config.base_date or date.today()
+    # Время создания всех строк - до начала договоров и истории посещений
+    created_at = datetime.combine(today - timedelta(days=max(30, config.history_days)), time(0, 0))
+
+    # Базовые данные (администратор, залы, услуги, шкафчики L001-L020) - как при инициализации БД
+    with Session(engine) as session:
+        init_default_data(session)
+
+    # bcrypt медленный: у всех сгенерированных пользователей один и тот же хеш пароля
+    password_hash = get_password_hash(config.password)
+    data = GeneratedData(password=config.password)
+
+    with engine.begin() as conn:
+        def write(model, rows: Iterable[dict]) -> None:
+            count = write_rows(conn, model, _with_timestamps(model, rows, created_at), config.batch_size)
+            data.row_counts[model.__tablename__] = data.row_counts.get(model.__tablename__, 0) + count
+
+        data.zone_ids = list(conn.execute(select(GymZone.id).order_by(GymZone.id)).scalars())
+        data.service_id = conn.execute(select(Service.id).order_by(Service.id).limit(1)).scalar_one()
+
+        clients = []
+        for i in range(config.clients):
+            clients.append({
+                "id": _uuid(rng),
+                "email": f"client{i}@bench.local",
+                "phone": f"+7900{i:07d}",
+                "password_hash": password_hash,
+                "first_name": f"Клиент{i}",
+                "last_name": "Бенчмарк",
+                "gender": "male" if i % 2 else "female",
+                "role": UserRole.CLIENT,
+                "is_active": True,
+                "in_gym": False,
+            })
+        trainers = []
+        for i in range(config.trainers):
+            trainers.append({
+                "id": _uuid(rng),
+                "email": f"trainer{i}@bench.local",
+                "phone": f"+7901{i:07d}",
+                "password_hash": password_hash,
+                "first_name": f"Тренер{i}",
+                "last_name": "Бенчмарк",
+                "gender": "male" if i % 2 else "female",
+                "role": UserRole.TRAINER,
+                "is_active": True,
+                "in_gym": False,
+            })
+        write(User, clients + trainers)
+        data.client_ids = [row["id"] for row in clients]
+        data.client_emails = [row["email"] for row in clients]
+        data.trainer_ids = [row["id"] for row in trainers]
+
+        # Активный договор с абонементом на посещения - нужен для входа в зал
+        contracts = [
+            {
+                "id": _uuid(rng),
+                "client_id": client_id,
+                "contract_number": f"BENCH-{i:07d}",
+                "status": ContractStatus.ACTIVE,
+                "start_date": today - timedelta(days=30),
+                "signed_by_client": True,
+            }
+            for i, client_id in enumerate(data.client_ids)
+        ]
+        write(Contract, contracts)
+        write(Subscription, (
+            {
+                "id": _uuid(rng),
+                "contract_id": contract["id"],
+                "service_id": data.service_id,
+                "subscription_type": SubscriptionType.VISIT_BASED,
+                "total_visits": config.visits_per_subscription,
+                "remaining_visits": config.visits_per_subscription,
+                "start_date": contract["start_date"],
+                "is_active": True,
+            }
+            for contract in contracts
+        ))
+
+        # Балансы по залам - нужны для записи на занятия и их проведения
+        write(ZonePass, (
+            {
+                "id": _uuid(rng),
+                "client_id": client_id,
+                "gym_zone_id": zone_id,
+                "remaining_visits": config.zone_pass_visits,
+            }
+            for client_id in data.client_ids
+            for zone_id in data.zone_ids
+        ))
+
+        # Недельное расписание тренеров: по два часа в разных залах каждый день
+        write(TrainerSchedule, (
+            {
+                "trainer_id": trainer_id,
+                "day_of_week": day,
+                "start_time": time(hour, 0),
+                "end_time": time(hour + 1, 0),
+                "is_working": True,
+                "is_cancelled": False,
+                "gym_zone_id": data.zone_ids[(i + hour) % len(data.zone_ids)] if data.zone_ids else None,
+            }
+            for i, trainer_id in enumerate(data.trainer_ids)
+            for day in range(7)
+            for hour in (9 + i % 8, 12 + i % 8)
+        ))
+
+        # Номера L001-L020 заняты шкафчиками по умолчанию
+        write(Locker, (
+            {
+                "locker_number": f"B{i:05d}",
+                "zone": "main",
+                "gender": "men" if i % 2 else "women",
+                "status": "free",
+                "code": rng.randint(1000, 9999),
+                "is_available": True,
+            }
+            for i in range(config.lockers)
+        ))
+
+        # Каждый день - по SESSIONS_PER_DAY занятий у каждого тренера в разные часы
+        sessions = []
+        for i in range(config.sessions):
+            day, slot = divmod(i, len(data.trainer_ids) * SESSIONS_PER_DAY)
+            trainer_index, trainer_slot = slot % len(data.trainer_ids), slot // len(data.trainer_ids)
+            hour = 8 + (trainer_index + trainer_slot * SESSION_HOURS // SESSIONS_PER_DAY) % SESSION_HOURS
+            sessions.append({
+                "id": _uuid(rng),
+                "trainer_id": data.trainer_ids[trainer_index],
+                "gym_zone_id": data.zone_ids[i % len(data.zone_ids)] if data.zone_ids else None,
+                "session_date": today + timedelta(days=day),
+                "start_time": time(hour, 0),
+                "end_time": time(hour + 1, 0),
+                "is_cancelled": False,
+                "is_completed": False,
+            })
+        write(TrainingSession, sessions)
+        data.session_trainers = {row["id"]: row["trainer_id"] for row in sessions}
+
+        for row in sessions:
+            for client_id in rng.sample(data.client_ids, min(config.participants_per_session, len(data.client_ids))):
+                data.participants.add((row["id"], client_id))
+        write(TrainingSessionParticipant, (
+            {"session_id": session_id, "client_id": client_id}
+            for session_id, client_id in sorted(data.participants)
+        ))
+
+        if config.history_days > 0:
+            _write_history(write, rng, data, config, today)
+
+    return data
+
+
+def _write_history(write, rng: random.Random, data: GeneratedData, config: GeneratorConfig, today: date) -> None:
+    """Посещения зала и проведенные занятия за config.history_days дней до базовой даты"""
+    history_start = datetime.combine(today - timedelta(days=config.history_days), time(0, 0))
+
+    def gym_visits() -> Iterator[dict]:
+        for client_id in data.client_ids:
+            for _ in range(config.visits_per_client):
+                check_in = history_start + timedelta(
+                    days=rng.randrange(config.history_days),
+                    hours=rng.randint(7, 21),
+                    minutes=rng.randrange(60)
+                )
+                yield {
+                    "id": _uuid(rng),
+                    "client_id": client_id,
+                    "visit_type": "gym",
+                    "service_id": data.service_id,
+                    "check_in_time": check_in,
+                    "check_out_time": check_in + timedelta(minutes=rng.randint(45, 150)),
+                }
+
+    write(Visit, gym_visits())
+
+    # Часы занятий каждого тренера выбираются без повторов из всех часов истории
+    trainers = len(data.trainer_ids)
+    per_trainer = -(-config.past_sessions // trainers)
+    if per_trainer > config.history_days * SESSION_HOURS:
+        raise ValueError(
+            f"{config.past_sessions} проведенных занятий не помещаются в {config.history_days} дн. "
+            f"у {trainers} тренеров"
+        )
+    trainer_slots = [rng.sample(range(config.history_days * SESSION_HOURS), per_trainer) for _ in range(trainers)]
+
+    sessions = []
+    participants: List[Tuple[dict, UUID]] = []
+    for i in range(config.past_sessions):
+        day, hour = divmod(trainer_slots[i % trainers][i // trainers], SESSION_HOURS)
+        hour += 8
+        session_date = today - timedelta(days=1 + day)
+        session = {
+            "id": _uuid(rng),
+            "trainer_id": data.trainer_ids[i % trainers],
+            "gym_zone_id": data.zone_ids[i % len(data.zone_ids)] if data.zone_ids else None,
+            "session_date": session_date,
+            "start_time": time(hour, 0),
+            "end_time": time(hour + 1, 0),
+            "is_cancelled": False,
+            "is_completed": True,
+            "completed_at": datetime.combine(session_date, time(hour + 1, 0)),
+        }
+        sessions.append(session)
+        for client_id in rng.sample(data.client_ids, min(config.participants_per_session, len(data.client_ids))):
+            participants.append((session, client_id))
+
+    write(TrainingSession, sessions)
+    write(TrainingSessionParticipant, (
+        {"session_id": session["id"], "client_id": client_id}
+        for session, client_id in participants
+    ))
+    # Проведенное занятие - посещение каждого участника с тренером (как в complete_training_session)
+    write(Visit, (
+        {
+            "id": _uuid(rng),
+            "client_id": client_id,
+            "trainer_id": session["trainer_id"],
+            "training_session_id": session["id"],
+            "visit_type": "training",
+            "check_in_time": datetime.combine(session["session_date"], session["start_time"]),
+            "check_out_time": session["completed_at"],
+        }
+        for session, client_id in participants
+    ))
@@ -1,25 +1,91 @@
 """
 Подключение к базе данных
 """
-from typing import Generator
+import time
+from typing import AsyncGenerator, Generator
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from scr.core.config import settings
+from scr.core.metrics import DB_POOL_CHECKOUT_WAIT, watch_engine
+from scr.db.query_stats import install_query_hooks
+
+
+def _make_async_url(database_url: str) -> str:
+    """Подставляет асинхронный драйвер в строку подключения (asyncpg / aiosqlite)"""
+    url = make_url(database_url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+asyncpg")
+    elif url.drivername == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+
+class _TimedQueuePool(QueuePool):
+    """QueuePool с замером времени ожидания соединения для /metrics"""
+    metrics_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, engine=self.metrics_label)
+
+
+class _TimedAsyncQueuePool(_TimedQueuePool, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def _engine_options(database_url: str, poolclass=_TimedQueuePool) -> dict:
+    """
+    Параметры пула для движка.
+    SQLite (локальные и тестовые запуски) не поддерживает pool_size/max_overflow
+    и уровень изоляции READ COMMITTED, поэтому для него они не передаются.
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {"echo": False}
+    return {
+        "poolclass": poolclass,
+        "pool_pre_ping": True,
+        "pool_size": 10,
+        "max_overflow": 20,
+        # Убеждаемся, что изменения видны сразу в pgAdmin
+        "isolation_level": "READ COMMITTED",
+        "echo": False,
+    }
+
 
 # Создание движка с настройками для видимости изменений в pgAdmin
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    # Убеждаемся, что изменения видны сразу в pgAdmin
-    isolation_level="READ COMMITTED",
-    echo=False
-)
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
 
 # Создание фабрики сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронный движок для роутеров (не блокирует event loop uvicorn)
+async_engine = create_async_engine(
+    _make_async_url(settings.DATABASE_URL),
+    **_engine_options(settings.DATABASE_URL, poolclass=_TimedAsyncQueuePool)
+)
+
+watch_engine("sync", engine)
+watch_engine("async", async_engine.sync_engine)
+
+# Число и время SQL-запросов в рамках HTTP-запроса, лог медленных запросов
+install_query_hooks(engine)
+install_query_hooks(async_engine.sync_engine)
+
+# expire_on_commit=False: после коммита атрибуты остаются доступны без ленивой подгрузки,
+# которая в асинхронном режиме невозможна
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 
 def get_db() -> Generator[Session, None, None]:
     """Генератор сессий БД"""
@@ -29,3 +95,8 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Генератор асинхронных сессий БД"""
+    async with AsyncSessionLocal() as db:
+        yield db
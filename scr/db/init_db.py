@@ -109,9 +109,10 @@ def initialize_database(database_url: str):
         )
         print(f" Движок создан для URL: {database_url}")
 
-        # 2. Создание таблиц с явным коммитом
-        create_tables(engine)
-        print(" Таблицы успешно созданы!")
+        # 2. Создание таблиц и применение миграций схемы
+        from scr.db.migrations import migrate
+        applied = migrate(engine)
+        print(f" Таблицы успешно созданы! Применено миграций: {len(applied)}")
 
         # 3. Инициализация начальных данных
         Session = sessionmaker(bind=engine)
@@ -141,9 +142,21 @@ def create_tables(engine):
     with engine.begin() as conn:
         # Создаем все таблицы в явной транзакции для гарантии коммита
         Base.metadata.create_all(bind=conn)
+        create_missing_indexes(conn)
         # Транзакция автоматически коммитится при выходе из блока
 
 
+def create_missing_indexes(conn):
+    """
+    Создание индексов, объявленных в моделях, которых еще нет в БД.
+    create_all не добавляет индексы в уже существующие таблицы.
+    """
+    from scr.db.models import Base
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+
 # Функция для создания сессии
 def create_session(connection_string):
     """Создание сессии для работы с базой данных"""
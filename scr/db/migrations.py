@@ -0,0 +1,180 @@
+"""
+Версионные миграции схемы БД
+
+Каждая миграция применяется один раз и записывается в таблицу schema_version.
+Миграции запускаются отдельной командой (python migrate.py), а не при старте
+воркеров: на PostgreSQL процесс берет advisory lock, поэтому при одновременном
+запуске нескольких копий миграции выполняет только одна, остальные ждут
+и затем видят уже обновленную схему.
+
+Новая миграция добавляется в конец MIGRATIONS со следующим номером версии.
+DDL внутри миграций пишется идемпотентно (IF NOT EXISTS, checkfirst): базы,
+созданные до появления schema_version, проходят все миграции с первой.
+Миграции не используют текущие модели (Base.metadata): первые шаги создают
+схему из снимка scr/db/schema_v1.py, а изменения моделей после него требуют
+нового шага миграции.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, delete, func, insert, inspect, select, text, update,
+)
+from sqlalchemy.engine import Connection, Engine
+
+# Ключ pg_advisory_lock, общий для всех процессов приложения
+MIGRATIONS_LOCK_KEY = 584_392_001
+
+schema_version_table = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Шаг миграции схемы"""
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _create_tables(conn: Connection) -> None:
+    from scr.db import schema_v1
+    schema_v1.metadata.create_all(bind=conn)
+
+
+def _add_schedule_and_visit_columns(conn: Connection) -> None:
+    # Для новых БД колонки уже созданы миграцией 1, ALTER нужен только старым PostgreSQL базам
+    if conn.dialect.name != "postgresql":
+        return
+    # Зал для расписания тренера
+    conn.execute(text("ALTER TABLE trainer_schedules ADD COLUMN IF NOT EXISTS gym_zone_id INTEGER"))
+    # Колонки для логики "занятие проведено" в расписании
+    conn.execute(text("ALTER TABLE training_sessions ADD COLUMN IF NOT EXISTS is_completed BOOLEAN DEFAULT FALSE"))
+    conn.execute(text("ALTER TABLE training_sessions ADD COLUMN IF NOT EXISTS completed_at TIMESTAMP"))
+    # История посещений для тренера (для проведенных тренировок)
+    conn.execute(text("ALTER TABLE visits ADD COLUMN IF NOT EXISTS trainer_id UUID"))
+    # Чтобы не было дублей посещений по одному занятию
+    conn.execute(text("ALTER TABLE visits ADD COLUMN IF NOT EXISTS training_session_id UUID"))
+
+
+def _create_query_indexes(conn: Connection) -> None:
+    from scr.db import schema_v1
+    # Заменен индексом ix_lockers_free_lookup (gender, status, is_available, id)
+    conn.execute(text("DROP INDEX IF EXISTS ix_lockers_gender_status_id"))
+    # Индексы снимка, которых нет в таблицах, созданных до schema_version
+    for table in schema_v1.metadata.tables.values():
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+
+def _seed_default_zones(conn: Connection) -> None:
+    from scr.db import schema_v1
+    gym_zones = schema_v1.metadata.tables["gym_zones"]
+    if conn.execute(select(func.count()).select_from(gym_zones)).scalar_one():
+        return
+    conn.execute(insert(gym_zones), [
+        {"name": "Тренажерный зал", "description": "Основной зал с тренажерами", "capacity": 50, "is_active": True},
+        {"name": "Зал групповых занятий", "description": "Зона для групповых тренировок", "capacity": 30, "is_active": True},
+        {"name": "Бассейн", "description": "Зона бассейна", "capacity": 20, "is_active": True},
+    ])
+
+
+def _unique_zone_passes(conn: Connection) -> None:
+    from scr.db import schema_v1
+    zone_passes = schema_v1.metadata.tables["zone_passes"]
+    # Дубли абонементов (гонка при создании) сливаются в один с суммой занятий
+    duplicates = conn.execute(
+        select(zone_passes.c.client_id, zone_passes.c.gym_zone_id)
+        .group_by(zone_passes.c.client_id, zone_passes.c.gym_zone_id)
+        .having(func.count() > 1)
+    ).all()
+    for client_id, gym_zone_id in duplicates:
+        rows = conn.execute(
+            select(zone_passes.c.id, zone_passes.c.remaining_visits)
+            .where(zone_passes.c.client_id == client_id, zone_passes.c.gym_zone_id == gym_zone_id)
+            .order_by(zone_passes.c.id)
+        ).all()
+        keep_id = rows[0].id
+        conn.execute(
+            update(zone_passes).where(zone_passes.c.id == keep_id)
+            .values(remaining_visits=sum(row.remaining_visits for row in rows))
+        )
+        conn.execute(delete(zone_passes).where(zone_passes.c.id.in_([row.id for row in rows[1:]])))
+
+    # Уникальный индекс заменяет обычный по тем же колонкам
+    conn.execute(text("DROP INDEX IF EXISTS ix_zone_passes_client_zone"))
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_zone_passes_client_zone ON zone_passes (client_id, gym_zone_id)"
+    ))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Таблицы из моделей", _create_tables),
+    Migration(2, "Колонки зала расписания и проведенных занятий", _add_schedule_and_visit_columns),
+    Migration(3, "Индексы горячих запросов", _create_query_indexes),
+    Migration(4, "Залы по умолчанию", _seed_default_zones),
+    Migration(5, "Один абонемент клиента на зал", _unique_zone_passes),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn: Connection) -> int:
+    """Текущая версия схемы (0, если миграции еще не применялись)"""
+    if not inspect(conn).has_table(schema_version_table.name):
+        return 0
+    version = conn.execute(select(func.max(schema_version_table.c.version))).scalar()
+    return version or 0
+
+
+def check_schema_version(engine: Engine) -> int:
+    """
+    Дешевая проверка версии при старте приложения: один SELECT без DDL.
+    Возвращает текущую версию схемы.
+    """
+    with engine.connect() as conn:
+        return get_schema_version(conn)
+
+
+def migrate(engine: Engine) -> List[Migration]:
+    """
+    Применение недостающих миграций. Каждая миграция выполняется в своей транзакции
+    вместе с записью в schema_version. Возвращает список примененных миграций.
+    """
+    applied: List[Migration] = []
+    with engine.connect() as conn:
+        is_postgresql = conn.dialect.name == "postgresql"
+        if is_postgresql:
+            # Блокировка уровня сессии: держится между транзакциями отдельных миграций
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATIONS_LOCK_KEY})
+            conn.commit()
+        try:
+            with conn.begin():
+                schema_version_table.create(bind=conn, checkfirst=True)
+            # Версию читаем после получения блокировки: другой процесс мог уже все применить
+            with conn.begin():
+                current = get_schema_version(conn)
+
+            for migration in MIGRATIONS:
+                if migration.version <= current:
+                    continue
+                with conn.begin():
+                    migration.apply(conn)
+                    conn.execute(insert(schema_version_table).values(
+                        version=migration.version,
+                        description=migration.description,
+                        applied_at=datetime.now(timezone.utc),
+                    ))
+                applied.append(migration)
+        finally:
+            if is_postgresql:
+                conn.rollback()
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATIONS_LOCK_KEY})
+                conn.commit()
+    return applied
@@ -5,14 +5,30 @@ from datetime import datetime, date, time, timezone
 import uuid
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, Time, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, Time, DateTime, ForeignKey, Text, Enum, Index, UniqueConstraint, Uuid
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
 
+class UTCDateTime(TypeDecorator):
+    """
+    TIMESTAMP без часового пояса, значения хранятся в UTC.
+    Aware datetime переводится в UTC и записывается без tzinfo: asyncpg, в отличие
+    от psycopg2, не принимает aware-значения для TIMESTAMP WITHOUT TIME ZONE.
+    Читаются значения как naive UTC.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
 # --- Перечисления (Enums) ---
 
 class UserRole(PyEnum):
@@ -54,7 +70,7 @@ class BookingStatus(PyEnum):
 class User(Base):
     __tablename__ = 'users'
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
     phone = Column(String(20), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
@@ -67,8 +83,8 @@ class User(Base):
 
     role = Column(Enum(UserRole), nullable=False, default=UserRole.CLIENT)
 
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc),
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc),
                         onupdate=lambda: datetime.now(timezone.utc))
     is_active = Column(Boolean, default=True)
 
@@ -129,13 +145,13 @@ class GymZone(Base):
 class TrainerSchedule(Base):
     __tablename__ = 'trainer_schedules'
     id = Column(Integer, primary_key=True)
-    trainer_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    trainer_id = Column(Uuid, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     day_of_week = Column(Integer, nullable=False)  # 0-6 (понедельник-воскресенье)
     start_time = Column(Time, nullable=False)
     end_time = Column(Time, nullable=False)
     is_working = Column(Boolean, default=True)
     is_cancelled = Column(Boolean, default=False)  # Отменено ли занятие
-    cancelled_at = Column(DateTime, nullable=True)  # Когда отменено
+    cancelled_at = Column(UTCDateTime, nullable=True)  # Когда отменено
     cancellation_reason = Column(Text, nullable=True)  # Причина отмены
     gym_zone_id = Column(Integer, ForeignKey('gym_zones.id', ondelete='SET NULL'), nullable=True)  # ID зала
 
@@ -143,14 +159,19 @@ class TrainerSchedule(Base):
     bookings = relationship("Booking", back_populates="trainer_schedule")
     gym_zone = relationship("GymZone")
 
+    __table_args__ = (
+        # Расписание на дни недели: WHERE day_of_week IN (...) AND is_working
+        Index("ix_trainer_schedules_day_working", "day_of_week", "is_working"),
+    )
+
 
 # --- Разовые записи расписания (по конкретной дате) ---
 
 class TrainingSession(Base):
     __tablename__ = "training_sessions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    trainer_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    trainer_id = Column(Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     gym_zone_id = Column(Integer, ForeignKey("gym_zones.id", ondelete="SET NULL"), nullable=True)
 
     session_date = Column(Date, nullable=False)
@@ -160,52 +181,81 @@ class TrainingSession(Base):
     is_cancelled = Column(Boolean, default=False)
     is_completed = Column(Boolean, default=False)
     cancellation_reason = Column(Text, nullable=True)
-    completed_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    completed_at = Column(UTCDateTime, nullable=True)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
 
     trainer = relationship("User")
     gym_zone = relationship("GymZone")
     participants = relationship("TrainingSessionParticipant", back_populates="session", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Расписание на дату / период, в том числе только свои записи тренера
+        Index("ix_training_sessions_date_trainer", "session_date", "trainer_id"),
+    )
+
 
 class TrainingSessionParticipant(Base):
     __tablename__ = "training_session_participants"
 
-    session_id = Column(UUID(as_uuid=True), ForeignKey("training_sessions.id", ondelete="CASCADE"), primary_key=True)
-    client_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    session_id = Column(Uuid, ForeignKey("training_sessions.id", ondelete="CASCADE"), primary_key=True)
+    client_id = Column(Uuid, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
 
     session = relationship("TrainingSession", back_populates="participants")
     client = relationship("User")
 
 
+class TrainingSessionWaitlist(Base):
+    """Лист ожидания на заполненное занятие; очередь FIFO по возрастанию id"""
+    __tablename__ = "training_session_waitlist"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(Uuid, ForeignKey("training_sessions.id", ondelete="CASCADE"), nullable=False)
+    client_id = Column(Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+
+    session = relationship("TrainingSession")
+    client = relationship("User")
+
+    __table_args__ = (
+        UniqueConstraint("session_id", "client_id", name="uq_waitlist_session_client"),
+        # Голова очереди и позиция клиента: WHERE session_id ORDER BY id
+        Index("ix_waitlist_session_id_id", "session_id", "id"),
+    )
+
+
 # --- Абонементы по залам (упрощенная модель без оплаты) ---
 
 class ZonePass(Base):
     __tablename__ = "zone_passes"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    client_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    client_id = Column(Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     gym_zone_id = Column(Integer, ForeignKey("gym_zones.id", ondelete="CASCADE"), nullable=False)
     remaining_visits = Column(Integer, nullable=False, default=0)
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    updated_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     client = relationship("User")
     gym_zone = relationship("GymZone")
 
+    __table_args__ = (
+        # Один абонемент клиента на зал (запись, списание занятий одним UPDATE)
+        Index("uq_zone_passes_client_zone", "client_id", "gym_zone_id", unique=True),
+    )
+
 
 class Contract(Base):
     __tablename__ = 'contracts'
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    client_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    client_id = Column(Uuid, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     contract_number = Column(String(50), unique=True, nullable=False)
     status = Column(Enum(ContractStatus), nullable=False, default=ContractStatus.DRAFT)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date)
-    signed_at = Column(DateTime)
+    signed_at = Column(UTCDateTime)
     signed_by_client = Column(Boolean, default=False)
     notes = Column(Text)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
 
     client = relationship("User", back_populates="contracts")
     subscriptions = relationship("Subscription", back_populates="contract", cascade="all, delete-orphan")
@@ -214,8 +264,8 @@ class Contract(Base):
 
 class Subscription(Base):
     __tablename__ = 'subscriptions'
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    contract_id = Column(UUID(as_uuid=True), ForeignKey('contracts.id', ondelete='CASCADE'), nullable=False)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    contract_id = Column(Uuid, ForeignKey('contracts.id', ondelete='CASCADE'), nullable=False, index=True)
     service_id = Column(Integer, ForeignKey('services.id', ondelete='CASCADE'), nullable=False)
     subscription_type = Column(Enum(SubscriptionType), nullable=False)
     total_visits = Column(Integer)  # Для VISIT_BASED
@@ -223,7 +273,7 @@ class Subscription(Base):
     start_date = Column(Date, nullable=False)
     end_date = Column(Date)  # Для TIME_BASED
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
 
     contract = relationship("Contract", back_populates="subscriptions")
     service = relationship("Service", back_populates="subscriptions")
@@ -232,18 +282,18 @@ class Subscription(Base):
 
 class Booking(Base):
     __tablename__ = 'bookings'
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    client_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
-    subscription_id = Column(UUID(as_uuid=True), ForeignKey('subscriptions.id', ondelete='CASCADE'))
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    client_id = Column(Uuid, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    subscription_id = Column(Uuid, ForeignKey('subscriptions.id', ondelete='CASCADE'))
     service_id = Column(Integer, ForeignKey('services.id', ondelete='CASCADE'), nullable=False)
-    trainer_schedule_id = Column(Integer, ForeignKey('trainer_schedules.id', ondelete='SET NULL'))
+    trainer_schedule_id = Column(Integer, ForeignKey('trainer_schedules.id', ondelete='SET NULL'), index=True)
 
     booking_date = Column(Date, nullable=False)
     start_time = Column(Time, nullable=False)
     end_time = Column(Time, nullable=False)
     status = Column(Enum(BookingStatus), default=BookingStatus.CONFIRMED)
     notes = Column(Text)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
 
     client = relationship("User", back_populates="bookings")
     subscription = relationship("Subscription", back_populates="bookings")
@@ -251,18 +301,23 @@ class Booking(Base):
     trainer_schedule = relationship("TrainerSchedule", back_populates="bookings")
     visits = relationship("Visit", back_populates="booking", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Проверка конфликтов и занятость слотов: WHERE booking_date, status, start_time
+        Index("ix_bookings_date_status_start", "booking_date", "status", "start_time"),
+    )
+
 
 class Visit(Base):
     __tablename__ = 'visits'
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    client_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
-    trainer_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
-    training_session_id = Column(UUID(as_uuid=True), ForeignKey("training_sessions.id", ondelete="SET NULL"), nullable=True)
-    booking_id = Column(UUID(as_uuid=True), ForeignKey('bookings.id', ondelete='CASCADE'))
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    client_id = Column(Uuid, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    trainer_id = Column(Uuid, ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    training_session_id = Column(Uuid, ForeignKey("training_sessions.id", ondelete="SET NULL"), nullable=True)
+    booking_id = Column(Uuid, ForeignKey('bookings.id', ondelete='CASCADE'))
     visit_type = Column(String(20), nullable=False)  # "gym", "training", "group_class"
     service_id = Column(Integer, ForeignKey('services.id', ondelete='CASCADE'))
-    check_in_time = Column(DateTime, nullable=False)
-    check_out_time = Column(DateTime)
+    check_in_time = Column(UTCDateTime, nullable=False)
+    check_out_time = Column(UTCDateTime)
 
     client = relationship("User", back_populates="visits", foreign_keys=[client_id])
     trainer = relationship("User", back_populates="trainer_visits", foreign_keys=[trainer_id])
@@ -270,6 +325,14 @@ class Visit(Base):
     booking = relationship("Booking", back_populates="visits")
     service = relationship("Service", back_populates="visits")
 
+    __table_args__ = (
+        # История посещений с постраничной выдачей по ключу (check_in_time, id)
+        Index("ix_visits_client_checkin", "client_id", "check_in_time", "id"),
+        Index("ix_visits_trainer_checkin", "trainer_id", "check_in_time", "id"),
+        # Посещения по проведенному занятию
+        Index("ix_visits_client_session", "client_id", "training_session_id"),
+    )
+
 
 class Locker(Base):
     __tablename__ = 'lockers'
@@ -280,21 +343,26 @@ class Locker(Base):
     status = Column(String(20), default="free")  # "free" or "occupied"
     code = Column(Integer)  # Код для открытия шкафчика
     is_available = Column(Boolean, default=True)
-    occupied_by_user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
-    occupied_at = Column(DateTime, nullable=True)
+    occupied_by_user_id = Column(Uuid, ForeignKey('users.id', ondelete='SET NULL'), nullable=True, index=True)
+    occupied_at = Column(UTCDateTime, nullable=True)
+
+    __table_args__ = (
+        # Поиск свободного шкафчика: WHERE gender, status, is_available ORDER BY id LIMIT 1
+        Index("ix_lockers_free_lookup", "gender", "status", "is_available", "id"),
+    )
 
 
 class Payment(Base):
     __tablename__ = 'payments'
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    client_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
-    contract_id = Column(UUID(as_uuid=True), ForeignKey('contracts.id', ondelete='SET NULL'))
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    client_id = Column(Uuid, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    contract_id = Column(Uuid, ForeignKey('contracts.id', ondelete='SET NULL'))
     yookassa_payment_id = Column(String, unique=True, index=True)
 
     amount = Column(Float, nullable=False)
     status = Column(Enum(PaymentStatus), nullable=False, default=PaymentStatus.PENDING)
-    paid_at = Column(DateTime)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    paid_at = Column(UTCDateTime)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
 
     client = relationship("User", back_populates="payments")
     contract = relationship("Contract", back_populates="payments")
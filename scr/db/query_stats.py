@@ -0,0 +1,118 @@
+"""
+Учет SQL-запросов в рамках HTTP-запроса
+
+События before/after_cursor_execute движков считают число запросов и суммарное
+время в БД для текущего HTTP-запроса (через contextvar). В режиме DEBUG значения
+отдаются в заголовках ответа, а запросы дольше SLOW_QUERY_THRESHOLD_MS печатаются
+всегда, с нормализованным SQL (без значений параметров).
+"""
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from scr.core.config import settings
+
+_START_TIMES_KEY = "query_stats_start_times"
+_MAX_LOGGED_SQL = 1000
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Литералы и плейсхолдеры драйверов: 'text', 42, %(name)s, ?, $1 и $1::UUID (asyncpg
+# добавляет приведение типа; составные имена типов перечислены явно)
+_VALUE_RE = re.compile(
+    r"'(?:[^']|'')*'|%\(\w+\)s|\?|\b\d+(?:\.\d+)?\b"
+    r"|\$\d+(?:::(?:(?:TIMESTAMP|TIME) WITH(?:OUT)? TIME ZONE|DOUBLE PRECISION|\w+)(?:\(\d+\))?(?:\[\])?)?"
+)
+# Развернутые списки IN (?, ?, ?) сворачиваются, чтобы запросы группировались
+_VALUE_LIST_RE = re.compile(r"\(\?(?:\s*,\s*\?)+\)")
+
+
+@dataclass
+class QueryStats:
+    """Счетчики SQL-запросов одного HTTP-запроса"""
+    count: int = 0
+    duration: float = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def normalize_sql(statement: str) -> str:
+    """SQL без значений параметров и лишних пробелов"""
+    sql = _WHITESPACE_RE.sub(" ", statement).strip()
+    sql = _VALUE_RE.sub("?", sql)
+    sql = _VALUE_LIST_RE.sub("(...)", sql)
+    return sql[:_MAX_LOGGED_SQL]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info[_START_TIMES_KEY].pop()
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+
+    threshold_ms = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold_ms > 0 and elapsed * 1000 >= threshold_ms:
+        print(f"[slow query] {elapsed * 1000:.1f} мс: {normalize_sql(statement)}")
+
+
+def _handle_error(exception_context):
+    # При ошибке запроса after_cursor_execute не вызывается: снимаем его время начала,
+    # иначе следующий запрос на этом соединении получит чужое время
+    conn = exception_context.connection
+    start_times = conn.info.get(_START_TIMES_KEY) if conn is not None else None
+    if start_times:
+        start_times.pop()
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """Подключение учета запросов к синхронному движку (для async - engine.sync_engine)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware: новый счетчик на каждый HTTP-запрос.
+    В режиме DEBUG добавляет заголовки X-DB-Query-Count, X-DB-Query-Time-Ms и Server-Timing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append((b"x-db-query-time-ms", f"{stats.duration_ms:.1f}".encode()))
+                headers.append((b"server-timing", f"db;dur={stats.duration_ms:.1f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
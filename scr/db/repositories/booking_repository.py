@@ -1,12 +1,56 @@
 """
 Репозиторий для работы с бронированиями
 """
-from typing import Optional, List
+from typing import Iterable, Optional, List, Tuple
 from uuid import UUID
 from datetime import date, time
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from scr.db.models import Booking, BookingStatus
+from scr.db.unit_of_work import persist
+
+
+def conflicting_bookings_query(
+    booking_date: date,
+    start_time: time,
+    end_time: time,
+    trainer_schedule_id: Optional[int] = None,
+    exclude_booking_id: Optional[UUID] = None
+) -> Select:
+    """Запрос подтвержденных бронирований, пересекающихся с интервалом"""
+    query = select(Booking).where(
+        Booking.booking_date == booking_date,
+        Booking.status == BookingStatus.CONFIRMED,
+        # Проверка пересечения времени
+        Booking.start_time < end_time,
+        Booking.end_time > start_time
+    )
+    if trainer_schedule_id:
+        query = query.where(Booking.trainer_schedule_id == trainer_schedule_id)
+    if exclude_booking_id:
+        query = query.where(Booking.id != exclude_booking_id)
+    return query
+
+
+def confirmed_intervals_query(date_from: date, date_to: date, trainer_schedule_ids: List[int]) -> Select:
+    """Запрос интервалов подтвержденных бронирований по расписаниям за период"""
+    return (
+        select(
+            Booking.booking_date,
+            Booking.trainer_schedule_id,
+            Booking.start_time,
+            Booking.end_time
+        )
+        .where(
+            Booking.booking_date >= date_from,
+            Booking.booking_date <= date_to,
+            Booking.status == BookingStatus.CONFIRMED,
+            Booking.trainer_schedule_id.in_(trainer_schedule_ids)
+        )
+        .order_by(Booking.booking_date, Booking.trainer_schedule_id, Booking.start_time)
+    )
 
 
 class BookingRepository:
@@ -99,3 +143,104 @@ class BookingRepository:
         self.db.delete(booking)
         self.db.commit()
 
+
+class AsyncBookingRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, booking: Booking) -> Booking:
+        """Создание бронирования"""
+        self.db.add(booking)
+        await persist(self.db, booking)
+        return booking
+
+    async def get_by_id(self, booking_id: UUID) -> Optional[Booking]:
+        """Получение бронирования по ID"""
+        result = await self.db.execute(select(Booking).where(Booking.id == booking_id))
+        return result.scalars().first()
+
+    async def get_by_client_id(self, client_id: UUID) -> List[Booking]:
+        """Получение всех бронирований клиента"""
+        result = await self.db.execute(select(Booking).where(Booking.client_id == client_id))
+        return list(result.scalars().all())
+
+    async def get_by_trainer_schedule_id(self, trainer_schedule_id: int) -> List[Booking]:
+        """Получение всех бронирований для расписания тренера"""
+        result = await self.db.execute(
+            select(Booking).where(Booking.trainer_schedule_id == trainer_schedule_id)
+        )
+        return list(result.scalars().all())
+
+    async def get_by_date_range(
+        self,
+        start_date: date,
+        end_date: date,
+        service_id: Optional[int] = None
+    ) -> List[Booking]:
+        """Получение бронирований за период"""
+        query = select(Booking).where(
+            Booking.booking_date >= start_date,
+            Booking.booking_date <= end_date,
+            Booking.status == BookingStatus.CONFIRMED
+        )
+        if service_id:
+            query = query.where(Booking.service_id == service_id)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def get_conflicting_bookings(
+        self,
+        booking_date: date,
+        start_time: time,
+        end_time: time,
+        trainer_schedule_id: Optional[int] = None,
+        exclude_booking_id: Optional[UUID] = None
+    ) -> List[Booking]:
+        """Проверка конфликтов бронирований"""
+        result = await self.db.execute(conflicting_bookings_query(
+            booking_date, start_time, end_time, trainer_schedule_id, exclude_booking_id
+        ))
+        return list(result.scalars().all())
+
+    async def get_confirmed_intervals(
+        self,
+        date_from: date,
+        date_to: date,
+        trainer_schedule_ids: Iterable[int]
+    ) -> List[Tuple[date, int, time, time]]:
+        """
+        Интервалы подтвержденных бронирований за период одним запросом:
+        (дата, ID расписания, начало, конец), отсортированы по началу
+        """
+        schedule_ids = list(trainer_schedule_ids)
+        if not schedule_ids:
+            return []
+        result = await self.db.execute(confirmed_intervals_query(date_from, date_to, schedule_ids))
+        return [tuple(row) for row in result.all()]
+
+    async def get_all(
+        self,
+        client_id: Optional[UUID] = None,
+        service_id: Optional[int] = None,
+        status: Optional[BookingStatus] = None
+    ) -> List[Booking]:
+        """Получение всех бронирований с фильтрацией"""
+        query = select(Booking)
+        if client_id:
+            query = query.where(Booking.client_id == client_id)
+        if service_id:
+            query = query.where(Booking.service_id == service_id)
+        if status:
+            query = query.where(Booking.status == status)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def update(self, booking: Booking) -> Booking:
+        """Обновление бронирования"""
+        await persist(self.db, booking)
+        return booking
+
+    async def delete(self, booking: Booking) -> None:
+        """Удаление бронирования"""
+        await self.db.delete(booking)
+        await persist(self.db)
@@ -4,9 +4,12 @@
 from typing import Optional, List
 from uuid import UUID
 from datetime import date
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
 from scr.db.models import Contract, ContractStatus
+from scr.db.unit_of_work import persist
 
 
 class ContractRepository:
@@ -63,3 +66,68 @@ class ContractRepository:
         self.db.delete(contract)
         self.db.commit()
 
+
+class AsyncContractRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, contract: Contract) -> Contract:
+        """Создание контракта"""
+        self.db.add(contract)
+        await persist(self.db, contract)
+        return contract
+
+    async def get_by_id(self, contract_id: UUID) -> Optional[Contract]:
+        """Получение контракта по ID (вместе с абонементами)"""
+        result = await self.db.execute(
+            select(Contract)
+            .options(selectinload(Contract.subscriptions))
+            .where(Contract.id == contract_id)
+        )
+        return result.scalars().first()
+
+    async def get_by_client_id(self, client_id: UUID) -> List[Contract]:
+        """Получение всех контрактов клиента"""
+        result = await self.db.execute(select(Contract).where(Contract.client_id == client_id))
+        return list(result.scalars().all())
+
+    async def get_by_contract_number(self, contract_number: str) -> Optional[Contract]:
+        """Получение контракта по номеру"""
+        result = await self.db.execute(
+            select(Contract).where(Contract.contract_number == contract_number)
+        )
+        return result.scalars().first()
+
+    async def get_all(
+        self,
+        client_id: Optional[UUID] = None,
+        status: Optional[ContractStatus] = None
+    ) -> List[Contract]:
+        """Получение всех контрактов с фильтрацией"""
+        query = select(Contract)
+        if client_id:
+            query = query.where(Contract.client_id == client_id)
+        if status:
+            query = query.where(Contract.status == status)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def get_active_contracts(self, client_id: UUID) -> List[Contract]:
+        """Получение активных контрактов клиента"""
+        result = await self.db.execute(
+            select(Contract).where(
+                Contract.client_id == client_id,
+                Contract.status == ContractStatus.ACTIVE
+            )
+        )
+        return list(result.scalars().all())
+
+    async def update(self, contract: Contract) -> Contract:
+        """Обновление контракта"""
+        await persist(self.db, contract)
+        return contract
+
+    async def delete(self, contract: Contract) -> None:
+        """Удаление контракта"""
+        await self.db.delete(contract)
+        await persist(self.db)
@@ -1,10 +1,37 @@
 """
 Репозиторий для работы со шкафчиками
 """
+from datetime import datetime
 from typing import Optional, List
+from uuid import UUID
+from sqlalchemy import Select, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from scr.db.models import Locker
+from scr.db.unit_of_work import persist
+
+
+def occupied_by_user_query(user_id: UUID, locker_id: Optional[int] = None) -> Select:
+    """Запрос шкафчика, занятого пользователем (по первичному ключу, если он известен)"""
+    query = select(Locker).where(Locker.occupied_by_user_id == user_id, Locker.status == "occupied")
+    if locker_id is not None:
+        return query.where(Locker.id == locker_id)
+    return query.limit(1)
+
+
+def free_locker_query(gender: str) -> Select:
+    """Запрос ID первого свободного шкафчика"""
+    return (
+        select(Locker.id)
+        .where(
+            Locker.gender == gender,
+            Locker.status == "free",
+            Locker.is_available == True
+        )
+        .order_by(Locker.id)
+        .limit(1)
+    )
 
 
 class LockerRepository:
@@ -50,3 +77,120 @@ class LockerRepository:
         self.db.delete(locker)
         self.db.commit()
 
+
+class AsyncLockerRepository:
+    # Число попыток захвата шкафчика в режиме без SKIP LOCKED
+    CLAIM_ATTEMPTS = 5
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, locker: Locker) -> Locker:
+        """Создание шкафчика"""
+        self.db.add(locker)
+        await persist(self.db, locker)
+        return locker
+
+    async def get_by_id(self, locker_id: int) -> Optional[Locker]:
+        """Получение шкафчика по ID"""
+        result = await self.db.execute(select(Locker).where(Locker.id == locker_id))
+        return result.scalars().first()
+
+    async def get_all(self, gender: Optional[str] = None, status: Optional[str] = None) -> List[Locker]:
+        """Получение всех шкафчиков с фильтрацией"""
+        query = select(Locker)
+        if gender:
+            query = query.where(Locker.gender == gender)
+        if status:
+            query = query.where(Locker.status == status)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def get_available(self, gender: str) -> List[Locker]:
+        """Получение доступных шкафчиков для указанного пола"""
+        result = await self.db.execute(
+            select(Locker).where(
+                Locker.gender == gender,
+                Locker.status == "free",
+                Locker.is_available == True
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_occupied_by_user(
+        self,
+        user_id: UUID,
+        locker_id_hint: Optional[int] = None
+    ) -> Optional[Locker]:
+        """
+        Шкафчик, занятый пользователем.
+        locker_id_hint (User.current_locker_id) проверяется по первичному ключу,
+        иначе поиск по индексу ix_lockers_occupied_by_user_id.
+        """
+        if locker_id_hint is not None:
+            result = await self.db.execute(occupied_by_user_query(user_id, locker_id_hint))
+            locker = result.scalars().first()
+            if locker:
+                return locker
+        result = await self.db.execute(occupied_by_user_query(user_id))
+        return result.scalars().first()
+
+    async def claim_free(
+        self,
+        gender: str,
+        user_id: UUID,
+        code: int,
+        occupied_at: datetime
+    ) -> Optional[Locker]:
+        """
+        Атомарный захват одного свободного шкафчика.
+
+        PostgreSQL: UPDATE ... WHERE id = (SELECT ... LIMIT 1 FOR UPDATE SKIP LOCKED) RETURNING,
+        параллельные запросы пропускают заблокированные строки и получают разные шкафчики.
+        Остальные диалекты (SQLite в тестах): выбор кандидата и условный UPDATE
+        по status = 'free' с повтором, если шкафчик успели занять.
+        """
+        values = {
+            "status": "occupied",
+            "code": code,
+            "occupied_by_user_id": user_id,
+            "occupied_at": occupied_at,
+        }
+        candidate = free_locker_query(gender)
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            result = await self.db.execute(
+                update(Locker)
+                .where(Locker.id == candidate.with_for_update(skip_locked=True).scalar_subquery())
+                .values(**values)
+                .returning(Locker)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            locker = result.scalars().first()
+            await persist(self.db)
+            return locker
+
+        for _ in range(self.CLAIM_ATTEMPTS):
+            locker_id = (await self.db.execute(candidate)).scalar()
+            if locker_id is None:
+                return None
+            result = await self.db.execute(
+                update(Locker)
+                .where(Locker.id == locker_id, Locker.status == "free")
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                await persist(self.db)
+                return await self.db.get(Locker, locker_id, populate_existing=True)
+        return None
+
+    async def update(self, locker: Locker) -> Locker:
+        """Обновление шкафчика"""
+        await persist(self.db, locker)
+        return locker
+
+    async def delete(self, locker: Locker) -> None:
+        """Удаление шкафчика"""
+        await self.db.delete(locker)
+        await persist(self.db)
@@ -4,9 +4,20 @@
 from typing import Optional, List
 from uuid import UUID
 from datetime import date
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from scr.db.models import Subscription, SubscriptionType
+from scr.db.models import Contract, Subscription, SubscriptionType
+from scr.db.unit_of_work import persist
+
+
+def active_subscriptions_query(client_id: UUID) -> Select:
+    """Запрос активных абонементов клиента"""
+    return select(Subscription).join(Contract).where(
+        Contract.client_id == client_id,
+        Subscription.is_active == True
+    )
 
 
 class SubscriptionRepository:
@@ -30,7 +41,6 @@ class SubscriptionRepository:
 
     def get_active_subscriptions(self, client_id: UUID) -> List[Subscription]:
         """Получение активных абонементов клиента"""
-        from scr.db.models import Contract
         return self.db.query(Subscription).join(Contract).filter(
             Contract.client_id == client_id,
             Subscription.is_active == True
@@ -63,3 +73,84 @@ class SubscriptionRepository:
         self.db.delete(subscription)
         self.db.commit()
 
+
+class AsyncSubscriptionRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, subscription: Subscription) -> Subscription:
+        """Создание абонемента"""
+        self.db.add(subscription)
+        await persist(self.db, subscription)
+        return subscription
+
+    async def get_by_id(self, subscription_id: UUID) -> Optional[Subscription]:
+        """Получение абонемента по ID (вместе с контрактом)"""
+        result = await self.db.execute(
+            select(Subscription)
+            .options(selectinload(Subscription.contract))
+            .where(Subscription.id == subscription_id)
+        )
+        return result.scalars().first()
+
+    async def get_by_contract_id(self, contract_id: UUID) -> List[Subscription]:
+        """Получение всех абонементов контракта"""
+        result = await self.db.execute(
+            select(Subscription).where(Subscription.contract_id == contract_id)
+        )
+        return list(result.scalars().all())
+
+    async def get_active_subscriptions(self, client_id: UUID) -> List[Subscription]:
+        """Получение активных абонементов клиента"""
+        result = await self.db.execute(active_subscriptions_query(client_id))
+        return list(result.scalars().all())
+
+    async def get_all(
+        self,
+        contract_id: Optional[UUID] = None,
+        service_id: Optional[int] = None,
+        is_active: Optional[bool] = None
+    ) -> List[Subscription]:
+        """Получение всех абонементов с фильтрацией"""
+        query = select(Subscription)
+        if contract_id:
+            query = query.where(Subscription.contract_id == contract_id)
+        if service_id:
+            query = query.where(Subscription.service_id == service_id)
+        if is_active is not None:
+            query = query.where(Subscription.is_active == is_active)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def decrement_remaining_visits(self, subscription_id: UUID) -> Optional[Subscription]:
+        """
+        Атомарное списание одного посещения одним запросом:
+        UPDATE ... SET remaining_visits = remaining_visits - 1 WHERE remaining_visits > 0 RETURNING.
+        None - абонемент не найден, неактивен, не по посещениям или посещения закончились.
+        """
+        result = await self.db.execute(
+            update(Subscription)
+            .where(
+                Subscription.id == subscription_id,
+                Subscription.is_active == True,
+                Subscription.subscription_type == SubscriptionType.VISIT_BASED,
+                Subscription.remaining_visits > 0
+            )
+            .values(remaining_visits=Subscription.remaining_visits - 1)
+            .returning(Subscription)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        subscription = result.scalars().first()
+        if subscription is not None:
+            await persist(self.db)
+        return subscription
+
+    async def update(self, subscription: Subscription) -> Subscription:
+        """Обновление абонемента"""
+        await persist(self.db, subscription)
+        return subscription
+
+    async def delete(self, subscription: Subscription) -> None:
+        """Удаление абонемента"""
+        await self.db.delete(subscription)
+        await persist(self.db)
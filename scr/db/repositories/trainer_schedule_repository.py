@@ -1,12 +1,27 @@
 """
 Репозиторий для работы с расписанием тренеров
 """
-from typing import Optional, List
+from typing import Iterable, Optional, List
 from uuid import UUID
 from datetime import date
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from scr.db.models import TrainerSchedule
+from scr.db.unit_of_work import persist
+
+
+def working_schedules_query(days_of_week: Iterable[int], trainer_id: Optional[UUID] = None) -> Select:
+    """Запрос рабочего расписания на дни недели, по времени начала"""
+    query = select(TrainerSchedule).where(
+        TrainerSchedule.day_of_week.in_(set(days_of_week)),
+        TrainerSchedule.is_working == True,
+        TrainerSchedule.is_cancelled == False
+    )
+    if trainer_id:
+        query = query.where(TrainerSchedule.trainer_id == trainer_id)
+    return query.order_by(TrainerSchedule.start_time, TrainerSchedule.id)
 
 
 class TrainerScheduleRepository:
@@ -69,3 +84,74 @@ class TrainerScheduleRepository:
         self.db.delete(schedule)
         self.db.commit()
 
+
+class AsyncTrainerScheduleRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, schedule: TrainerSchedule) -> TrainerSchedule:
+        """Создание записи расписания"""
+        self.db.add(schedule)
+        await persist(self.db, schedule)
+        return schedule
+
+    async def get_by_id(self, schedule_id: int) -> Optional[TrainerSchedule]:
+        """Получение расписания по ID"""
+        result = await self.db.execute(select(TrainerSchedule).where(TrainerSchedule.id == schedule_id))
+        return result.scalars().first()
+
+    async def get_by_trainer_id(self, trainer_id: UUID) -> List[TrainerSchedule]:
+        """Получение всего расписания тренера"""
+        result = await self.db.execute(
+            select(TrainerSchedule).where(TrainerSchedule.trainer_id == trainer_id)
+        )
+        return list(result.scalars().all())
+
+    async def get_available_schedules(
+        self,
+        trainer_id: UUID,
+        day_of_week: Optional[int] = None
+    ) -> List[TrainerSchedule]:
+        """Получение доступного расписания тренера"""
+        query = select(TrainerSchedule).where(
+            TrainerSchedule.trainer_id == trainer_id,
+            TrainerSchedule.is_working == True,
+            TrainerSchedule.is_cancelled == False
+        )
+        if day_of_week is not None:
+            query = query.where(TrainerSchedule.day_of_week == day_of_week)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def get_working_by_days(
+        self,
+        days_of_week: Iterable[int],
+        trainer_id: Optional[UUID] = None
+    ) -> List[TrainerSchedule]:
+        """Рабочее расписание на указанные дни недели (фильтрация в SQL)"""
+        result = await self.db.execute(working_schedules_query(days_of_week, trainer_id))
+        return list(result.scalars().all())
+
+    async def get_all(
+        self,
+        trainer_id: Optional[UUID] = None,
+        is_working: Optional[bool] = None
+    ) -> List[TrainerSchedule]:
+        """Получение всего расписания с фильтрацией"""
+        query = select(TrainerSchedule)
+        if trainer_id:
+            query = query.where(TrainerSchedule.trainer_id == trainer_id)
+        if is_working is not None:
+            query = query.where(TrainerSchedule.is_working == is_working)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def update(self, schedule: TrainerSchedule) -> TrainerSchedule:
+        """Обновление расписания"""
+        await persist(self.db, schedule)
+        return schedule
+
+    async def delete(self, schedule: TrainerSchedule) -> None:
+        """Удаление расписания"""
+        await self.db.delete(schedule)
+        await persist(self.db)
@@ -3,10 +3,17 @@
 """
 from typing import Optional, List
 from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import Select, or_, select
 
 from scr.db.models import User, UserRole
+from scr.db.unit_of_work import persist
+
+
+def user_by_email_query(email: str) -> Select:
+    """Запрос пользователя по email"""
+    return select(User).where(User.email == email)
 
 
 class UserRepository:
@@ -19,14 +26,10 @@ class UserRepository:
             self.db.add(user)
             self.db.commit()  # Коммитим транзакцию
             self.db.refresh(user)
-            print(f"Пользователь создан в БД: {user.email}, ID: {user.id}")
             return user
-        except Exception as e:
-            import traceback
-            print(f"Ошибка в UserRepository.create: {str(e)}")
-            print(traceback.format_exc())
+        except Exception:
             self.db.rollback()
-            raise e
+            raise
 
     def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Получение пользователя по ID"""
@@ -72,3 +75,63 @@ class UserRepository:
         self.db.delete(user)
         self.db.commit()
 
+
+class AsyncUserRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, user: User) -> User:
+        """Создание пользователя"""
+        self.db.add(user)
+        await persist(self.db, user)
+        return user
+
+    async def get_by_id(self, user_id: UUID) -> Optional[User]:
+        """Получение пользователя по ID"""
+        result = await self.db.execute(select(User).where(User.id == user_id))
+        return result.scalars().first()
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Получение пользователя по email"""
+        result = await self.db.execute(user_by_email_query(email))
+        return result.scalars().first()
+
+    async def get_by_phone(self, phone: str) -> Optional[User]:
+        """Получение пользователя по телефону"""
+        result = await self.db.execute(select(User).where(User.phone == phone))
+        return result.scalars().first()
+
+    async def get_all(self, role: Optional[UserRole] = None, is_active: Optional[bool] = None) -> List[User]:
+        """Получение всех пользователей с фильтрацией"""
+        query = select(User)
+        if role:
+            query = query.where(User.role == role)
+        if is_active is not None:
+            query = query.where(User.is_active == is_active)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def search(self, search_term: str) -> List[User]:
+        """Поиск пользователей"""
+        search_pattern = f"%{search_term}%"
+        result = await self.db.execute(
+            select(User).where(
+                or_(
+                    User.first_name.ilike(search_pattern),
+                    User.last_name.ilike(search_pattern),
+                    User.email.ilike(search_pattern),
+                    User.phone.ilike(search_pattern)
+                )
+            )
+        )
+        return list(result.scalars().all())
+
+    async def update(self, user: User) -> User:
+        """Обновление пользователя"""
+        await persist(self.db, user)
+        return user
+
+    async def delete(self, user: User) -> None:
+        """Удаление пользователя"""
+        await self.db.delete(user)
+        await persist(self.db)
@@ -0,0 +1,85 @@
+"""
+Репозиторий для работы с абонементами по залам
+"""
+from typing import Iterable, Optional, Set
+from uuid import UUID
+from sqlalchemy import Update, select, update
+from sqlalchemy.exc import MultipleResultsFound
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from scr.db.models import ZonePass
+from scr.db.unit_of_work import persist
+
+
+def decrement_remaining_visits_query(client_id: UUID, gym_zone_id: int) -> Update:
+    """UPDATE списания одного занятия с RETURNING остатка"""
+    return (
+        update(ZonePass)
+        .where(
+            ZonePass.client_id == client_id,
+            ZonePass.gym_zone_id == gym_zone_id,
+            ZonePass.remaining_visits > 0
+        )
+        .values(remaining_visits=ZonePass.remaining_visits - 1)
+        .returning(ZonePass.remaining_visits)
+    )
+
+
+class AsyncZonePassRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_client_and_zone(self, client_id: UUID, gym_zone_id: int) -> Optional[ZonePass]:
+        """Получение абонемента клиента в зал"""
+        result = await self.db.execute(
+            select(ZonePass).where(
+                ZonePass.client_id == client_id,
+                ZonePass.gym_zone_id == gym_zone_id
+            )
+        )
+        return result.scalars().first()
+
+    async def decrement_remaining_visits(self, client_id: UUID, gym_zone_id: int) -> Optional[int]:
+        """
+        Атомарное списание одного занятия одним запросом:
+        UPDATE ... SET remaining_visits = remaining_visits - 1 WHERE remaining_visits > 0 RETURNING.
+        Абонемент клиента на зал один (уникальный индекс), поэтому затрагивается не больше одной строки.
+        Возвращает остаток занятий или None, если абонемента нет или занятия закончились.
+        """
+        result = await self.db.execute(
+            decrement_remaining_visits_query(client_id, gym_zone_id)
+            .execution_options(synchronize_session=False)
+        )
+        remaining = result.scalar_one_or_none()
+        if remaining is not None:
+            await persist(self.db)
+        return remaining
+
+    async def decrement_remaining_visits_bulk(self, client_ids: Iterable[UUID], gym_zone_id: int) -> Set[UUID]:
+        """
+        Списание одного занятия у группы клиентов одним запросом.
+        Возвращает ID клиентов, у которых занятие списано; остальным не хватило занятий.
+        У клиента один абонемент на зал, поэтому каждый клиент в RETURNING не больше одного раза.
+        """
+        client_ids = list(client_ids)
+        if not client_ids:
+            return set()
+        result = await self.db.execute(
+            update(ZonePass)
+            .where(
+                ZonePass.client_id.in_(client_ids),
+                ZonePass.gym_zone_id == gym_zone_id,
+                ZonePass.remaining_visits > 0
+            )
+            .values(remaining_visits=ZonePass.remaining_visits - 1)
+            .returning(ZonePass.client_id)
+            .execution_options(synchronize_session=False)
+        )
+        charged_rows = result.scalars().all()
+        charged = set(charged_rows)
+        if len(charged) != len(charged_rows):
+            # Дубли абонементов (схема без миграции 5): исключение откатит списание
+            raise MultipleResultsFound("Несколько абонементов клиента на один зал")
+        if charged:
+            await persist(self.db)
+        return charged
@@ -0,0 +1,206 @@
+"""
+Снимок схемы БД для первых миграций (версии 1 и 3)
+
+Таблицы и индексы в том виде, в каком их создавали модели на момент появления
+schema_version. Модуль не меняется вместе с models.py: все последующие изменения
+схемы оформляются новыми шагами в scr/db/migrations.py, иначе новая БД и БД,
+обновленная миграциями, разойдутся.
+"""
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, Enum, Float, ForeignKey, Index, Integer, MetaData,
+    String, Table, Text, Time, UniqueConstraint, Uuid,
+)
+
+metadata = MetaData()
+
+# Перечисления хранятся по именам членов, как у Enum(PyEnum) в моделях
+_user_role = Enum("CLIENT", "TRAINER", "ADMIN", name="userrole")
+_contract_status = Enum("DRAFT", "ACTIVE", "SUSPENDED", "TERMINATED", "EXPIRED", name="contractstatus")
+_payment_status = Enum("PENDING", "PAID", "FAILED", "REFUNDED", "PARTIAL", name="paymentstatus")
+_subscription_type = Enum("TIME_BASED", "VISIT_BASED", name="subscriptiontype")
+_booking_status = Enum("CONFIRMED", "CANCELLED", "COMPLETED", "NO_SHOW", name="bookingstatus")
+
+Table(
+    "users", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("email", String(255), unique=True, nullable=False, index=True),
+    Column("phone", String(20), unique=True, nullable=False, index=True),
+    Column("password_hash", String(255), nullable=False),
+    Column("first_name", String(100), nullable=False),
+    Column("last_name", String(100), nullable=False),
+    Column("middle_name", String(100)),
+    Column("birth_date", Date),
+    Column("gender", String(10)),
+    Column("photo_url", String(500)),
+    Column("role", _user_role, nullable=False),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("is_active", Boolean),
+    Column("in_gym", Boolean),
+    Column("current_locker_id", Integer, ForeignKey("lockers.id", ondelete="SET NULL"), nullable=True),
+)
+
+Table(
+    "services", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("category", String(100), nullable=False, index=True),
+    Column("description", Text),
+    Column("duration_minutes", Integer, nullable=False),
+    Column("max_participants", Integer),
+    Column("base_price", Float, nullable=False),
+    Column("gym_zone_id", Integer, ForeignKey("gym_zones.id", ondelete="SET NULL")),
+)
+
+Table(
+    "gym_zones", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(100), unique=True, nullable=False),
+    Column("description", Text),
+    Column("capacity", Integer),
+    Column("is_active", Boolean),
+)
+
+Table(
+    "trainer_schedules", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("trainer_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("day_of_week", Integer, nullable=False),
+    Column("start_time", Time, nullable=False),
+    Column("end_time", Time, nullable=False),
+    Column("is_working", Boolean),
+    Column("is_cancelled", Boolean),
+    Column("cancelled_at", DateTime, nullable=True),
+    Column("cancellation_reason", Text, nullable=True),
+    Column("gym_zone_id", Integer, ForeignKey("gym_zones.id", ondelete="SET NULL"), nullable=True),
+    Index("ix_trainer_schedules_day_working", "day_of_week", "is_working"),
+)
+
+Table(
+    "training_sessions", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("trainer_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("gym_zone_id", Integer, ForeignKey("gym_zones.id", ondelete="SET NULL"), nullable=True),
+    Column("session_date", Date, nullable=False),
+    Column("start_time", Time, nullable=False),
+    Column("end_time", Time, nullable=False),
+    Column("is_cancelled", Boolean),
+    Column("is_completed", Boolean),
+    Column("cancellation_reason", Text, nullable=True),
+    Column("completed_at", DateTime, nullable=True),
+    Column("created_at", DateTime),
+    Index("ix_training_sessions_date_trainer", "session_date", "trainer_id"),
+)
+
+Table(
+    "training_session_participants", metadata,
+    Column("session_id", Uuid, ForeignKey("training_sessions.id", ondelete="CASCADE"), primary_key=True),
+    Column("client_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "training_session_waitlist", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("session_id", Uuid, ForeignKey("training_sessions.id", ondelete="CASCADE"), nullable=False),
+    Column("client_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("created_at", DateTime),
+    UniqueConstraint("session_id", "client_id", name="uq_waitlist_session_client"),
+    Index("ix_waitlist_session_id_id", "session_id", "id"),
+)
+
+Table(
+    "zone_passes", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("client_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("gym_zone_id", Integer, ForeignKey("gym_zones.id", ondelete="CASCADE"), nullable=False),
+    Column("remaining_visits", Integer, nullable=False),
+    Column("updated_at", DateTime),
+    Index("ix_zone_passes_client_zone", "client_id", "gym_zone_id"),
+)
+
+Table(
+    "contracts", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("client_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("contract_number", String(50), unique=True, nullable=False),
+    Column("status", _contract_status, nullable=False),
+    Column("start_date", Date, nullable=False),
+    Column("end_date", Date),
+    Column("signed_at", DateTime),
+    Column("signed_by_client", Boolean),
+    Column("notes", Text),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "subscriptions", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("contract_id", Uuid, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("service_id", Integer, ForeignKey("services.id", ondelete="CASCADE"), nullable=False),
+    Column("subscription_type", _subscription_type, nullable=False),
+    Column("total_visits", Integer),
+    Column("remaining_visits", Integer),
+    Column("start_date", Date, nullable=False),
+    Column("end_date", Date),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "bookings", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("client_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("subscription_id", Uuid, ForeignKey("subscriptions.id", ondelete="CASCADE")),
+    Column("service_id", Integer, ForeignKey("services.id", ondelete="CASCADE"), nullable=False),
+    Column("trainer_schedule_id", Integer, ForeignKey("trainer_schedules.id", ondelete="SET NULL"), index=True),
+    Column("booking_date", Date, nullable=False),
+    Column("start_time", Time, nullable=False),
+    Column("end_time", Time, nullable=False),
+    Column("status", _booking_status),
+    Column("notes", Text),
+    Column("created_at", DateTime),
+    Index("ix_bookings_date_status_start", "booking_date", "status", "start_time"),
+)
+
+Table(
+    "visits", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("client_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("trainer_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=True),
+    Column("training_session_id", Uuid, ForeignKey("training_sessions.id", ondelete="SET NULL"), nullable=True),
+    Column("booking_id", Uuid, ForeignKey("bookings.id", ondelete="CASCADE")),
+    Column("visit_type", String(20), nullable=False),
+    Column("service_id", Integer, ForeignKey("services.id", ondelete="CASCADE")),
+    Column("check_in_time", DateTime, nullable=False),
+    Column("check_out_time", DateTime),
+    Index("ix_visits_client_checkin", "client_id", "check_in_time", "id"),
+    Index("ix_visits_trainer_checkin", "trainer_id", "check_in_time", "id"),
+    Index("ix_visits_client_session", "client_id", "training_session_id"),
+)
+
+Table(
+    "lockers", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("locker_number", String(20), unique=True, nullable=False),
+    Column("zone", String(50)),
+    Column("gender", String(10)),
+    Column("status", String(20)),
+    Column("code", Integer),
+    Column("is_available", Boolean),
+    Column("occupied_by_user_id", Uuid, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True),
+    Column("occupied_at", DateTime, nullable=True),
+    Index("ix_lockers_free_lookup", "gender", "status", "is_available", "id"),
+)
+
+Table(
+    "payments", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("client_id", Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("contract_id", Uuid, ForeignKey("contracts.id", ondelete="SET NULL")),
+    Column("yookassa_payment_id", String, unique=True, index=True),
+    Column("amount", Float, nullable=False),
+    Column("status", _payment_status, nullable=False),
+    Column("paid_at", DateTime),
+    Column("created_at", DateTime),
+)
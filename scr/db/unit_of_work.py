@@ -0,0 +1,67 @@
+"""
+Единица работы (unit of work) для асинхронной сессии
+
+Внутри блока `async with unit_of_work(db):` репозитории выполняют только flush,
+а изменения фиксируются одним COMMIT при выходе из блока (при исключении — ROLLBACK).
+Вне блока репозитории, как и раньше, коммитят каждое изменение сразу.
+"""
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_UNIT_OF_WORK_KEY = "unit_of_work"
+_AFTER_COMMIT_KEY = "unit_of_work_after_commit"
+
+
+def in_unit_of_work(db: AsyncSession) -> bool:
+    """Открыта ли для сессии единица работы"""
+    return bool(db.info.get(_UNIT_OF_WORK_KEY))
+
+
+@asynccontextmanager
+async def unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Одна транзакция на блок; вложенные блоки присоединяются к внешнему"""
+    if in_unit_of_work(db):
+        yield db
+        return
+
+    db.info[_UNIT_OF_WORK_KEY] = True
+    db.info[_AFTER_COMMIT_KEY] = []
+    try:
+        yield db
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
+    else:
+        for callback in db.info[_AFTER_COMMIT_KEY]:
+            callback()
+    finally:
+        db.info.pop(_UNIT_OF_WORK_KEY, None)
+        db.info.pop(_AFTER_COMMIT_KEY, None)
+
+
+def on_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Действие после фиксации изменений (например, сброс кэша).
+    В единице работы выполняется после COMMIT, иначе — сразу.
+    """
+    if in_unit_of_work(db):
+        db.info[_AFTER_COMMIT_KEY].append(callback)
+    else:
+        callback()
+
+
+async def persist(db: AsyncSession, instance: Optional[object] = None) -> None:
+    """
+    Сохранение изменений из репозитория.
+    В единице работы — flush (SQL отправлен, транзакция открыта),
+    иначе — commit и refresh переданного объекта.
+    """
+    if in_unit_of_work(db):
+        await db.flush()
+        return
+    await db.commit()
+    if instance is not None:
+        await db.refresh(instance)
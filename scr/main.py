@@ -1,11 +1,10 @@
 """
 Главный файл приложения
 """
-import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, PlainTextResponse
 
 from scr.core.config import settings
 from scr.api import main_router
@@ -23,15 +22,20 @@ from scr.api.zones import router as zones_router
 from scr.api.schedule import router as schedule_router
 from scr.api.passes import router as passes_router
 from scr.db.database import engine
+from scr.db.query_stats import QueryStatsMiddleware
+from scr.db.migrations import LATEST_VERSION, check_schema_version
+from scr.core.hashing import password_hasher
+from scr.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render_metrics
 from scr.payment.api import router as payment_router
-from sqlalchemy import text
 
 # Создание приложения
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    # JSON-ответы через orjson (см. scr/core/responses.py)
+    default_response_class=ORJSONResponse
 )
 
 # Настройка CORS
@@ -43,6 +47,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Число и время SQL-запросов на HTTP-запрос
+app.add_middleware(QueryStatsMiddleware)
+
+# Метрики запросов для /metrics (внешний слой, чтобы учитывать и ответы CORS)
+app.add_middleware(MetricsMiddleware)
+
 # Подключение статических файлов и шаблонов
 try:
     app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -67,58 +77,21 @@ app.include_router(main_router)
 app.include_router(payment_router)
 
 @app.on_event("startup")
-def _startup_migrations() -> None:
+def _check_schema_version() -> None:
     """
-    Минимальная авто-миграция схемы без Alembic.
-    Нужна, чтобы уже созданная БД не ломалась после добавления новых колонок.
+    Проверка версии схемы БД при старте (один SELECT, без DDL).
+    Сами миграции выполняются отдельной командой: python migrate.py
     """
     try:
-        if engine.dialect.name == "postgresql":
-            with engine.begin() as conn:
-                # Зал для расписания тренера
-                conn.execute(text("ALTER TABLE trainer_schedules ADD COLUMN IF NOT EXISTS gym_zone_id INTEGER"))
-
-                # Колонки для логики "занятие проведено" в расписании
-                conn.execute(text("ALTER TABLE training_sessions ADD COLUMN IF NOT EXISTS is_completed BOOLEAN DEFAULT FALSE"))
-                conn.execute(text("ALTER TABLE training_sessions ADD COLUMN IF NOT EXISTS completed_at TIMESTAMP"))
-
-                # История посещений для тренера (для проведенных тренировок)
-                conn.execute(text("ALTER TABLE visits ADD COLUMN IF NOT EXISTS trainer_id UUID"))
-
-                # Чтобы не было дублей посещений по одному занятию
-                conn.execute(text("ALTER TABLE visits ADD COLUMN IF NOT EXISTS training_session_id UUID"))
-    except Exception as e:
-        # Не падаем при старте, но печатаем предупреждение
-        print(f"[startup migrations] warning: {e}")
-
-    # Создаем новые таблицы/индексы если их еще нет
-    try:
-        from scr.db import models
-        from scr.db.models import Base
-        Base.metadata.create_all(bind=engine)
+        version = check_schema_version(engine)
     except Exception as e:
-        print(f"[startup create_all] warning: {e}")
-
-    # Сидинг базовых залов, если таблица пустая
-    try:
-        from scr.db.database import SessionLocal
-        from scr.db.models import GymZone
-
-        db = SessionLocal()
-        try:
-            zones_count = db.query(GymZone).count()
-            if zones_count == 0:
-                db.add_all([
-                    GymZone(name="Тренажерный зал", description="Основной зал с тренажерами", capacity=50, is_active=True),
-                    GymZone(name="Зал групповых занятий", description="Зона для групповых тренировок", capacity=30, is_active=True),
-                    GymZone(name="Бассейн", description="Зона бассейна", capacity=20, is_active=True),
-                ])
-                db.commit()
-                print("[startup seed] default gym zones created")
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"[startup seed] warning: {e}")
+        print(f"[startup schema] warning: {e}")
+        return
+    if version < LATEST_VERSION:
+        print(
+            f"[startup schema] warning: версия схемы {version}, требуется {LATEST_VERSION}. "
+            f"Запустите: python migrate.py"
+        )
 
 
 @app.get("/")
@@ -155,10 +128,24 @@ async def dashboard_page():
 @app.get("/health")
 async def health_check():
     """Проверка здоровья приложения"""
-    return {"status": "ok"}
+    return {"status": "ok", "password_hashing": password_hasher.stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Метрики в текстовом формате Prometheus"""
+    return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.on_event("shutdown")
+def _shutdown_password_hasher() -> None:
+    """Останавливаем процессы пула хеширования паролей"""
+    password_hasher.shutdown()
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "scr.main:app",
         host=settings.HOST,
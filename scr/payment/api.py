@@ -1,24 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 
+from scr.core.metrics import PAYMENTS
 from scr.payment.yookassa_service import YooKassaService
 from scr.core.dependencies import get_current_active_user
-from scr.db.database import get_db
+from scr.core.principal_cache import CurrentPrincipal
+from scr.db.database import get_async_db
 from scr.db.models import User, Payment, PaymentStatus, ZonePass
 
 router = APIRouter(prefix="/api/payments", tags=["payments"])
 
 # Создание платежа и получение ссылки на оплату
 async def create_payment(amount: float, gym_zone_id: int,
-                         current_user: User = Depends(get_current_active_user), db: Session = Depends(get_db)):
+                         current_user: CurrentPrincipal = Depends(get_current_active_user), db: AsyncSession = Depends(get_async_db)):
     try:
         payment = Payment(client_id=current_user.id, amount=amount, status=PaymentStatus.PENDING)
         db.add(payment)
-        db.commit()
-        db.refresh(payment)
+        await db.commit()
+        await db.refresh(payment)
 
-        result = YooKassaService.create_payment(
+        # SDK YooKassa синхронный — выполняем HTTP-запрос в пуле потоков
+        result = await run_in_threadpool(
+            YooKassaService.create_payment,
             amount=amount,
             description="Пополнение абонемента",
             client_id=str(current_user.id),
@@ -26,7 +32,8 @@ async def create_payment(amount: float, gym_zone_id: int,
         )
 
         payment.yookassa_payment_id = result["payment_id"]
-        db.commit()
+        await db.commit()
+        PAYMENTS.inc(status="created")
         return result
 
     except Exception as e:
@@ -34,7 +41,7 @@ async def create_payment(amount: float, gym_zone_id: int,
 
 # Вебхук для получения информации о пройденной оплате
 @router.post("/webhook")
-async def yookassa_webhook(request: Request, db: Session = Depends(get_db)):
+async def yookassa_webhook(request: Request, db: AsyncSession = Depends(get_async_db)):
     try:
         payload = await request.json()
 
@@ -47,7 +54,9 @@ async def yookassa_webhook(request: Request, db: Session = Depends(get_db)):
         if not payment_id:
             return {"status": "ignored"}
 
-        payment = db.query(Payment).filter(Payment.yookassa_payment_id == payment_id).first()
+        payment = (await db.execute(
+            select(Payment).where(Payment.yookassa_payment_id == payment_id)
+        )).scalars().first()
         if not payment:
             return {"status": "ignored"}
 
@@ -59,16 +68,19 @@ async def yookassa_webhook(request: Request, db: Session = Depends(get_db)):
                 client_id = metadata.get("client_id")
                 gym_zone_id = metadata.get("gym_zone_id")
 
-                zone_pass = db.query(ZonePass).filter(ZonePass.client_id == client_id,
-                                                      ZonePass.gym_zone_id == gym_zone_id).first()
+                zone_pass = (await db.execute(
+                    select(ZonePass).where(ZonePass.client_id == client_id,
+                                           ZonePass.gym_zone_id == gym_zone_id)
+                )).scalars().first()
 
                 if not zone_pass:
                     zone_pass = ZonePass(client_id=client_id, gym_zone_id=gym_zone_id, remaining_visits=0)
                 db.add(zone_pass)
-                db.flush()
+                await db.flush()
 
             zone_pass.remaining_visits += 5
-            db.commit()
+            await db.commit()
+            PAYMENTS.inc(status="succeeded")
 
         return {"status": "ok"}
 
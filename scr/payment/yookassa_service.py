@@ -1,9 +1,16 @@
-from yookassa import Configuration, Payment
 import uuid
+from functools import lru_cache
 from scr.core.config import settings
 
-Configuration.account_id = settings.CONFIGURATION_SHOP_KEY
-Configuration.secret_key = settings.CONFIGURATION_SECRET_KEY
+
+@lru_cache(maxsize=None)
+def _payment_api():
+    # SDK YooKassa тяжелый при импорте: загружаем и настраиваем его при первом платеже, а не при старте
+    from yookassa import Configuration, Payment
+    Configuration.account_id = settings.CONFIGURATION_SHOP_KEY
+    Configuration.secret_key = settings.CONFIGURATION_SECRET_KEY
+    return Payment
+
 
 class YooKassaService:
     # Создаёт платёж в Yookassa и возвращает данные для редиректа
@@ -28,7 +35,7 @@ class YooKassaService:
 
         idempotence_key = str(uuid.uuid4())
         try:
-            payment = Payment.create(payment_data, idempotence_key)
+            payment = _payment_api().create(payment_data, idempotence_key)
         except Exception as e:
             raise RuntimeError(f"YooKassa error: {e}")
 
@@ -40,7 +47,7 @@ class YooKassaService:
 
     @staticmethod
     def get_payment_status(payment_id: str) -> dict:
-        payment = Payment.find_one(payment_id)
+        payment = _payment_api().find_one(payment_id)
 
         return {
             "payment_id": payment.id,
@@ -59,3 +59,7 @@ class TrainingSessionResponse(BaseModel):
         from_attributes = True
 
 
+class TrainingSessionDay(BaseModel):
+    """Записи одного дня в календаре за период"""
+    session_date: date
+    sessions: List[TrainingSessionResponse]
@@ -3,39 +3,40 @@
 """
 from datetime import timedelta
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from scr.core.security import verify_password, get_password_hash, create_access_token
+from scr.core.security import create_access_token
+from scr.core.hashing import hash_password_async, verify_password_async
 from scr.core.config import settings
 from scr.db.models import User
-from scr.db.repositories.user_repository import UserRepository
+from scr.db.repositories.user_repository import AsyncUserRepository
 from scr.schemas.user import UserCreate, Token
 
 
 class AuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.user_repo = UserRepository(db)
+        self.user_repo = AsyncUserRepository(db)
 
-    def register(self, user_data: UserCreate) -> User:
+    async def register(self, user_data: UserCreate) -> User:
         """Регистрация нового пользователя"""
         try:
             # Проверка существования пользователя
-            if self.user_repo.get_by_email(user_data.email):
+            if await self.user_repo.get_by_email(user_data.email):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Пользователь с таким email уже существует"
                 )
             
-            if self.user_repo.get_by_phone(user_data.phone):
+            if await self.user_repo.get_by_phone(user_data.phone):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Пользователь с таким телефоном уже существует"
                 )
 
             # Создание пользователя
-            hashed_password = get_password_hash(user_data.password)
+            hashed_password = await hash_password_async(user_data.password)
             
             # Роль уже валидирована в схеме UserCreate
             user = User(
@@ -50,22 +51,17 @@ class AuthService:
                 role=user_data.role
             )
 
-            created_user = self.user_repo.create(user)
-            print(f"Пользователь создан: {created_user.email}, ID: {created_user.id}")
-            return created_user
+            return await self.user_repo.create(user)
         except HTTPException:
             raise
         except Exception as e:
-            import traceback
-            print(f"Ошибка в AuthService.register: {str(e)}")
-            print(traceback.format_exc())
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Ошибка при регистрации: {str(e)}"
             )
 
-    def login(self, email: str, password: str) -> Token:
+    async def login(self, email: str, password: str) -> Token:
         """Вход пользователя.
 
         Поддерживаем ввод:
@@ -79,15 +75,15 @@ class AuthService:
         user = None
         # 1) Пробуем как email
         if identifier:
-            user = self.user_repo.get_by_email(identifier_l)
+            user = await self.user_repo.get_by_email(identifier_l)
 
         # 2) Если не нашли и это похоже на логин без домена — пробуем добавить домен проекта
         if not user and identifier and "@" not in identifier and not identifier.startswith("+") and not identifier.replace("-", "").replace(" ", "").isdigit():
-            user = self.user_repo.get_by_email(f"{identifier_l}@gym.com")
+            user = await self.user_repo.get_by_email(f"{identifier_l}@gym.com")
 
         # 3) Пробуем как телефон (если ввели номер)
         if not user and identifier:
-            user = self.user_repo.get_by_phone(identifier)
+            user = await self.user_repo.get_by_phone(identifier)
 
         if not user:
             raise HTTPException(
@@ -95,7 +91,7 @@ class AuthService:
                 detail="Неверный email или пароль"
             )
 
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Неверный email или пароль"
@@ -1,32 +1,36 @@
 """
 Сервис для работы с бронированиями
 """
-from typing import List, Optional
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
-from datetime import date, time
-from sqlalchemy.orm import Session
+from datetime import date, time, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from scr.db.models import (
     Booking, BookingStatus, User, UserRole,
     TrainerSchedule, Service, Subscription
 )
-from scr.db.repositories.booking_repository import BookingRepository
-from scr.db.repositories.trainer_schedule_repository import TrainerScheduleRepository
-from scr.db.repositories.subscription_repository import SubscriptionRepository
+from scr.db.repositories.booking_repository import AsyncBookingRepository
+from scr.db.repositories.trainer_schedule_repository import AsyncTrainerScheduleRepository
+from scr.db.repositories.subscription_repository import AsyncSubscriptionRepository
 from scr.schemas.booking import BookingCreate, BookingUpdate
 from scr.services.contract_service import ContractService
 
 
 class BookingService:
-    def __init__(self, db: Session):
+    MAX_SLOTS_RANGE_DAYS = 31
+
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.booking_repo = BookingRepository(db)
-        self.schedule_repo = TrainerScheduleRepository(db)
-        self.subscription_repo = SubscriptionRepository(db)
+        self.booking_repo = AsyncBookingRepository(db)
+        self.schedule_repo = AsyncTrainerScheduleRepository(db)
+        self.subscription_repo = AsyncSubscriptionRepository(db)
         self.contract_service = ContractService(db)
 
-    def create_booking(
+    async def create_booking(
         self,
         booking_data: BookingCreate,
         current_user: User,
@@ -55,7 +59,7 @@ class BookingService:
             target_client_id = current_user.id
 
         # Проверка существования услуги
-        service = self.db.query(Service).filter(Service.id == booking_data.service_id).first()
+        service = await self.db.get(Service, booking_data.service_id)
         if not service:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -65,7 +69,7 @@ class BookingService:
         # Проверка абонемента, если указан
         subscription = None
         if booking_data.subscription_id:
-            subscription = self.subscription_repo.get_by_id(booking_data.subscription_id)
+            subscription = await self.subscription_repo.get_by_id(booking_data.subscription_id)
             if not subscription:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -80,7 +84,7 @@ class BookingService:
         # Проверка расписания тренера, если указано
         trainer_schedule = None
         if booking_data.trainer_schedule_id:
-            trainer_schedule = self.schedule_repo.get_by_id(booking_data.trainer_schedule_id)
+            trainer_schedule = await self.schedule_repo.get_by_id(booking_data.trainer_schedule_id)
             if not trainer_schedule:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -93,7 +97,7 @@ class BookingService:
                 )
 
         # Проверка конфликтов
-        conflicts = self.booking_repo.get_conflicting_bookings(
+        conflicts = await self.booking_repo.get_conflicting_bookings(
             booking_data.booking_date,
             booking_data.start_time,
             booking_data.end_time,
@@ -118,11 +122,11 @@ class BookingService:
             notes=booking_data.notes
         )
 
-        return self.booking_repo.create(booking)
+        return await self.booking_repo.create(booking)
 
-    def get_booking(self, booking_id: UUID, current_user: User) -> Booking:
+    async def get_booking(self, booking_id: UUID, current_user: User) -> Booking:
         """Получение бронирования"""
-        booking = self.booking_repo.get_by_id(booking_id)
+        booking = await self.booking_repo.get_by_id(booking_id)
         if not booking:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -138,7 +142,7 @@ class BookingService:
 
         return booking
 
-    def get_client_bookings(
+    async def get_client_bookings(
         self,
         client_id: UUID,
         current_user: User,
@@ -153,12 +157,12 @@ class BookingService:
             )
 
         if status_filter:
-            return self.booking_repo.get_all(client_id=client_id, status=status_filter)
-        return self.booking_repo.get_by_client_id(client_id)
+            return await self.booking_repo.get_all(client_id=client_id, status=status_filter)
+        return await self.booking_repo.get_by_client_id(client_id)
 
-    def cancel_booking(self, booking_id: UUID, current_user: User) -> Booking:
+    async def cancel_booking(self, booking_id: UUID, current_user: User) -> Booking:
         """Отмена бронирования"""
-        booking = self.get_booking(booking_id, current_user)
+        booking = await self.get_booking(booking_id, current_user)
 
         # Клиент может отменять только свои бронирования
         if current_user.role == UserRole.CLIENT and booking.client_id != current_user.id:
@@ -174,49 +178,104 @@ class BookingService:
             )
 
         booking.status = BookingStatus.CANCELLED
-        return self.booking_repo.update(booking)
+        return await self.booking_repo.update(booking)
 
-    def get_available_slots(
+    async def get_available_slots(
         self,
         service_id: int,
         booking_date: date,
         trainer_id: Optional[UUID] = None
     ) -> List[dict]:
         """Получение доступных слотов для бронирования"""
-        service = self.db.query(Service).filter(Service.id == service_id).first()
+        slots_by_date = await self.get_available_slots_range(
+            service_id, booking_date, booking_date, trainer_id
+        )
+        return slots_by_date[booking_date]
+
+    async def get_available_slots_range(
+        self,
+        service_id: int,
+        date_from: date,
+        date_to: date,
+        trainer_id: Optional[UUID] = None
+    ) -> Dict[date, List[dict]]:
+        """
+        Доступные слоты по каждой дате периода (включительно).
+        Расписания и бронирования загружаются двумя запросами,
+        пересечения проверяются в памяти.
+        """
+        if date_to < date_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Дата окончания периода должна быть не раньше даты начала"
+            )
+        days_count = (date_to - date_from).days + 1
+        if days_count > self.MAX_SLOTS_RANGE_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Период не может превышать {self.MAX_SLOTS_RANGE_DAYS} дней"
+            )
+
+        service = await self.db.get(Service, service_id)
         if not service:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Услуга не найдена"
             )
 
-        # Получаем расписание тренеров
-        if trainer_id:
-            schedules = self.schedule_repo.get_available_schedules(
-                trainer_id,
-                day_of_week=booking_date.weekday()
-            )
-        else:
-            # Все доступные расписания
-            schedules = self.schedule_repo.get_all(is_working=True)
-            schedules = [s for s in schedules if s.day_of_week == booking_date.weekday()]
+        dates = [date_from + timedelta(days=i) for i in range(days_count)]
 
-        available_slots = []
+        # Расписание тренеров только на нужные дни недели
+        schedules = await self.schedule_repo.get_working_by_days(
+            {d.weekday() for d in dates},
+            trainer_id=trainer_id
+        )
+        schedules_by_weekday: Dict[int, List[TrainerSchedule]] = defaultdict(list)
         for schedule in schedules:
-            # Проверяем занятость
-            conflicts = self.booking_repo.get_conflicting_bookings(
-                booking_date,
-                schedule.start_time,
-                schedule.end_time,
-                schedule.id
-            )
-            if not conflicts:
+            schedules_by_weekday[schedule.day_of_week].append(schedule)
+
+        # Подтвержденные бронирования за период, сгруппированные по (дата, расписание)
+        intervals = await self.booking_repo.get_confirmed_intervals(
+            date_from, date_to, [s.id for s in schedules]
+        )
+        busy: Dict[Tuple[date, int], _BusyIntervals] = {}
+        for booking_date, schedule_id, start_time, end_time in intervals:
+            busy.setdefault((booking_date, schedule_id), _BusyIntervals()).add(start_time, end_time)
+
+        result: Dict[date, List[dict]] = {}
+        for day in dates:
+            available_slots = []
+            for schedule in schedules_by_weekday.get(day.weekday(), []):
+                booked = busy.get((day, schedule.id))
+                if booked and booked.overlaps(schedule.start_time, schedule.end_time):
+                    continue
                 available_slots.append({
                     "trainer_schedule_id": schedule.id,
                     "trainer_id": schedule.trainer_id,
                     "start_time": schedule.start_time,
                     "end_time": schedule.end_time
                 })
+            result[day] = available_slots
+        return result
+
+
+class _BusyIntervals:
+    """
+    Занятые интервалы одного расписания за день.
+    Интервалы добавляются в порядке начала; для каждого префикса хранится
+    максимальный конец, поэтому проверка пересечения — бинарный поиск.
+    """
+
+    def __init__(self):
+        self.starts: List[time] = []
+        self.max_ends: List[time] = []
 
-        return available_slots
+    def add(self, start_time: time, end_time: time) -> None:
+        self.starts.append(start_time)
+        self.max_ends.append(max(end_time, self.max_ends[-1]) if self.max_ends else end_time)
 
+    def overlaps(self, start_time: time, end_time: time) -> bool:
+        # Кандидаты — интервалы, начавшиеся раньше end_time;
+        # пересечение есть, если хотя бы один из них закончился позже start_time
+        count = bisect_left(self.starts, end_time)
+        return count > 0 and self.max_ends[count - 1] > start_time
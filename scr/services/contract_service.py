@@ -4,23 +4,23 @@
 from typing import List
 from uuid import UUID
 from datetime import date, datetime, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from scr.db.models import Contract, ContractStatus, Subscription, SubscriptionType, User, UserRole
-from scr.db.repositories.contract_repository import ContractRepository
-from scr.db.repositories.subscription_repository import SubscriptionRepository
+from scr.db.repositories.contract_repository import AsyncContractRepository
+from scr.db.repositories.subscription_repository import AsyncSubscriptionRepository
 from scr.schemas.contract import ContractCreate, ContractUpdate
 from scr.schemas.subscription import SubscriptionCreate
 
 
 class ContractService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.contract_repo = ContractRepository(db)
-        self.subscription_repo = SubscriptionRepository(db)
+        self.contract_repo = AsyncContractRepository(db)
+        self.subscription_repo = AsyncSubscriptionRepository(db)
 
-    def create_contract(self, contract_data: ContractCreate, current_user: User) -> Contract:
+    async def create_contract(self, contract_data: ContractCreate, current_user: User) -> Contract:
         """Создание контракта (только администратор)"""
         if current_user.role != UserRole.ADMIN:
             raise HTTPException(
@@ -29,7 +29,7 @@ class ContractService:
             )
 
         # Проверка уникальности номера контракта
-        if self.contract_repo.get_by_contract_number(contract_data.contract_number):
+        if await self.contract_repo.get_by_contract_number(contract_data.contract_number):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Контракт с таким номером уже существует"
@@ -44,11 +44,11 @@ class ContractService:
             notes=contract_data.notes
         )
 
-        return self.contract_repo.create(contract)
+        return await self.contract_repo.create(contract)
 
-    def get_contract(self, contract_id: UUID, current_user: User) -> Contract:
+    async def get_contract(self, contract_id: UUID, current_user: User) -> Contract:
         """Получение контракта"""
-        contract = self.contract_repo.get_by_id(contract_id)
+        contract = await self.contract_repo.get_by_id(contract_id)
         if not contract:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -64,7 +64,7 @@ class ContractService:
 
         return contract
 
-    def get_client_contracts(self, client_id: UUID, current_user: User) -> List[Contract]:
+    async def get_client_contracts(self, client_id: UUID, current_user: User) -> List[Contract]:
         """Получение контрактов клиента"""
         # Клиент может видеть только свои контракты
         if current_user.role == UserRole.CLIENT and client_id != current_user.id:
@@ -73,16 +73,16 @@ class ContractService:
                 detail="Недостаточно прав"
             )
 
-        return self.contract_repo.get_by_client_id(client_id)
+        return await self.contract_repo.get_by_client_id(client_id)
 
-    def update_contract(
+    async def update_contract(
         self,
         contract_id: UUID,
         contract_data: ContractUpdate,
         current_user: User
     ) -> Contract:
         """Обновление контракта"""
-        contract = self.get_contract(contract_id, current_user)
+        contract = await self.get_contract(contract_id, current_user)
 
         # Только администратор может обновлять контракты
         if current_user.role != UserRole.ADMIN:
@@ -95,9 +95,9 @@ class ContractService:
         for field, value in update_data.items():
             setattr(contract, field, value)
 
-        return self.contract_repo.update(contract)
+        return await self.contract_repo.update(contract)
 
-    def activate_contract(self, contract_id: UUID, current_user: User) -> Contract:
+    async def activate_contract(self, contract_id: UUID, current_user: User) -> Contract:
         """Активация контракта"""
         if current_user.role != UserRole.ADMIN:
             raise HTTPException(
@@ -105,12 +105,12 @@ class ContractService:
                 detail="Только администратор может активировать контракты"
             )
 
-        contract = self.get_contract(contract_id, current_user)
+        contract = await self.get_contract(contract_id, current_user)
         contract.status = ContractStatus.ACTIVE
         contract.signed_at = datetime.now(timezone.utc)
-        return self.contract_repo.update(contract)
+        return await self.contract_repo.update(contract)
 
-    def create_subscription(
+    async def create_subscription(
         self,
         contract_id: UUID,
         subscription_data: SubscriptionCreate,
@@ -123,7 +123,7 @@ class ContractService:
                 detail="Только администратор может создавать абонементы"
             )
 
-        contract = self.get_contract(contract_id, current_user)
+        contract = await self.get_contract(contract_id, current_user)
         
         if contract.status != ContractStatus.ACTIVE:
             raise HTTPException(
@@ -142,9 +142,9 @@ class ContractService:
             is_active=True
         )
 
-        return self.subscription_repo.create(subscription)
+        return await self.subscription_repo.create(subscription)
 
-    def get_client_active_subscriptions(self, client_id: UUID, current_user: User) -> List[Subscription]:
+    async def get_client_active_subscriptions(self, client_id: UUID, current_user: User) -> List[Subscription]:
         """Получение активных абонементов клиента"""
         # Клиент может видеть только свои абонементы
         if current_user.role == UserRole.CLIENT and client_id != current_user.id:
@@ -153,11 +153,17 @@ class ContractService:
                 detail="Недостаточно прав"
             )
 
-        return self.subscription_repo.get_active_subscriptions(client_id)
+        return await self.subscription_repo.get_active_subscriptions(client_id)
 
-    def use_visit(self, subscription_id: UUID) -> Subscription:
+    async def use_visit(self, subscription_id: UUID) -> Subscription:
         """Использование одного посещения из абонемента"""
-        subscription = self.subscription_repo.get_by_id(subscription_id)
+        # Абонемент по посещениям списывается атомарно, без чтения перед записью
+        subscription = await self.subscription_repo.decrement_remaining_visits(subscription_id)
+        if subscription:
+            return subscription
+
+        # Списание не прошло: читаем абонемент, чтобы вернуть точную причину
+        subscription = await self.subscription_repo.get_by_id(subscription_id)
         if not subscription:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -171,19 +177,17 @@ class ContractService:
             )
 
         if subscription.subscription_type == SubscriptionType.VISIT_BASED:
-            if subscription.remaining_visits is None or subscription.remaining_visits <= 0:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Нет доступных посещений в абонементе"
-                )
-            subscription.remaining_visits -= 1
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Нет доступных посещений в абонементе"
+            )
 
-        elif subscription.subscription_type == SubscriptionType.TIME_BASED:
+        if subscription.subscription_type == SubscriptionType.TIME_BASED:
             if subscription.end_date and subscription.end_date < date.today():
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Абонемент истек"
                 )
 
-        return self.subscription_repo.update(subscription)
+        return subscription
 
@@ -4,25 +4,37 @@
 from typing import Optional
 from uuid import UUID
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from scr.core.metrics import GYM_ENTRIES, GYM_EXITS
+from scr.core.principal_cache import CurrentPrincipal, invalidate_principal
 from scr.db.models import User, UserRole, Visit, Subscription, SubscriptionType
-from scr.db.repositories.user_repository import UserRepository
-from scr.db.repositories.subscription_repository import SubscriptionRepository
+from scr.db.repositories.user_repository import AsyncUserRepository
+from scr.db.repositories.subscription_repository import AsyncSubscriptionRepository
+from scr.db.unit_of_work import on_commit, persist
 from scr.services.locker_service import LockerService
 from scr.services.contract_service import ContractService
 
 
+def open_visit_query(client_id: UUID) -> Select:
+    """Запрос последнего незакрытого посещения клиента"""
+    return select(Visit).where(
+        Visit.client_id == client_id,
+        Visit.check_out_time.is_(None)
+    ).order_by(Visit.check_in_time.desc()).limit(1)
+
+
 class GymService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.user_repo = UserRepository(db)
-        self.subscription_repo = SubscriptionRepository(db)
+        self.user_repo = AsyncUserRepository(db)
+        self.subscription_repo = AsyncSubscriptionRepository(db)
         self.locker_service = LockerService(db)
         self.contract_service = ContractService(db)
 
-    def enter_gym(self, current_user: User) -> dict:
+    async def enter_gym(self, current_user: CurrentPrincipal) -> dict:
         """Вход клиента в зал"""
         if current_user.role != UserRole.CLIENT:
             raise HTTPException(
@@ -30,15 +42,18 @@ class GymService:
                 detail="Только клиенты могут входить в зал"
             )
 
+        # Снимок пользователя из кэша может быть неактуален — работаем со строкой из БД
+        user = await self.user_repo.get_by_id(current_user.id)
+
         # Проверка, не находится ли клиент уже в зале
-        if current_user.in_gym:
+        if user.in_gym:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Клиент уже находится в зале"
             )
 
         # Получаем активные абонементы
-        active_subscriptions = self.subscription_repo.get_active_subscriptions(current_user.id)
+        active_subscriptions = await self.subscription_repo.get_active_subscriptions(user.id)
         
         if not active_subscriptions:
             raise HTTPException(
@@ -71,10 +86,10 @@ class GymService:
         # Пытаемся назначить шкафчик
         locker = None
         locker_info = None
-        if current_user.gender:
-            locker = self.locker_service.assign_locker_to_user(
-                current_user.id,
-                current_user.gender
+        if user.gender:
+            locker = await self.locker_service.assign_locker_to_user(
+                user.id,
+                user.gender
             )
             if locker:
                 locker_info = {
@@ -88,34 +103,37 @@ class GymService:
             pass
 
         # Обновляем статус клиента
-        current_user.in_gym = True
+        user.in_gym = True
         if locker:
-            current_user.current_locker_id = locker.id
-        self.user_repo.update(current_user)
+            user.current_locker_id = locker.id
+        await self.user_repo.update(user)
+        on_commit(self.db, lambda: invalidate_principal(user.id))
 
         # Создаем запись о посещении
         visit = Visit(
-            client_id=current_user.id,
+            client_id=user.id,
             visit_type="gym",
             check_in_time=datetime.now(timezone.utc)
         )
         if subscription_to_use:
             visit.service_id = subscription_to_use.service_id
         self.db.add(visit)
-        self.db.commit()
+        await persist(self.db)
 
         # Списываем посещение
         if subscription_to_use:
-            self.contract_service.use_visit(subscription_to_use.id)
+            await self.contract_service.use_visit(subscription_to_use.id)
+
+        on_commit(self.db, GYM_ENTRIES.inc)
 
         return {
             "success": True,
-            "message": f"Добро пожаловать, {current_user.first_name} {current_user.last_name}!",
+            "message": f"Добро пожаловать, {user.first_name} {user.last_name}!",
             "locker_info": locker_info,
             "visit_id": str(visit.id)
         }
 
-    def exit_gym(self, current_user: User) -> dict:
+    async def exit_gym(self, current_user: CurrentPrincipal) -> dict:
         """Выход клиента из зала"""
         if current_user.role != UserRole.CLIENT:
             raise HTTPException(
@@ -123,37 +141,41 @@ class GymService:
                 detail="Только клиенты могут выходить из зала"
             )
 
-        if not current_user.in_gym:
+        # Снимок пользователя из кэша может быть неактуален — работаем со строкой из БД
+        user = await self.user_repo.get_by_id(current_user.id)
+
+        if not user.in_gym:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Клиент не находится в зале"
             )
 
         # Освобождаем шкафчик, если был занят
-        if current_user.current_locker_id:
-            self.locker_service.release_locker(current_user.current_locker_id)
-            current_user.current_locker_id = None
+        if user.current_locker_id:
+            await self.locker_service.release_locker(user.current_locker_id)
+            user.current_locker_id = None
 
         # Обновляем статус клиента
-        current_user.in_gym = False
-        self.user_repo.update(current_user)
+        user.in_gym = False
+        await self.user_repo.update(user)
+        on_commit(self.db, lambda: invalidate_principal(user.id))
 
         # Обновляем запись о посещении
-        visit = self.db.query(Visit).filter(
-            Visit.client_id == current_user.id,
-            Visit.check_out_time.is_(None)
-        ).order_by(Visit.check_in_time.desc()).first()
+        result = await self.db.execute(open_visit_query(user.id))
+        visit = result.scalars().first()
 
         if visit:
             visit.check_out_time = datetime.now(timezone.utc)
-            self.db.commit()
+            await persist(self.db)
+
+        on_commit(self.db, GYM_EXITS.inc)
 
         return {
             "success": True,
-            "message": f"До свидания, {current_user.first_name} {current_user.last_name}!"
+            "message": f"До свидания, {user.first_name} {user.last_name}!"
         }
 
-    def get_gym_status(self, current_user: User) -> dict:
+    async def get_gym_status(self, current_user: CurrentPrincipal) -> dict:
         """Получение статуса клиента в зале"""
         if current_user.role != UserRole.CLIENT:
             raise HTTPException(
@@ -161,9 +183,13 @@ class GymService:
                 detail="Только клиенты могут проверять статус"
             )
 
+        # in_gym и current_locker_id - из БД: кэш снимков локален для процесса,
+        # после входа/выхода через другой воркер снимок здесь устаревший
+        user = await self.user_repo.get_by_id(current_user.id)
+
         locker_info = None
-        if current_user.current_locker_id:
-            locker = self.locker_service.get_user_locker(current_user.id)
+        if user.current_locker_id:
+            locker = await self.locker_service.get_user_locker(user.id, user.current_locker_id)
             if locker:
                 locker_info = {
                     "id": locker.id,
@@ -172,7 +198,7 @@ class GymService:
                 }
 
         # Получаем активные абонементы
-        active_subscriptions = self.subscription_repo.get_active_subscriptions(current_user.id)
+        active_subscriptions = await self.subscription_repo.get_active_subscriptions(current_user.id)
         visits_remaining = 0
         for sub in active_subscriptions:
             if sub.subscription_type == SubscriptionType.VISIT_BASED:
@@ -180,7 +206,7 @@ class GymService:
                     visits_remaining += sub.remaining_visits
 
         return {
-            "in_gym": current_user.in_gym,
+            "in_gym": bool(user.in_gym),
             "locker_info": locker_info,
             "visits_remaining": visits_remaining,
             "active_subscriptions_count": len(active_subscriptions)
@@ -5,20 +5,24 @@ import random
 from typing import Optional
 from datetime import datetime, timezone
 from uuid import UUID
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from scr.core.metrics import LOCKER_ASSIGNMENTS
+from scr.core.principal_cache import invalidate_principal
 from scr.db.models import Locker, User
-from scr.db.repositories.locker_repository import LockerRepository
-from scr.db.repositories.user_repository import UserRepository
+from scr.db.repositories.locker_repository import AsyncLockerRepository
+from scr.db.repositories.user_repository import AsyncUserRepository
+from scr.db.unit_of_work import on_commit
 
 
 class LockerService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.locker_repo = LockerRepository(db)
-        self.user_repo = UserRepository(db)
+        self.locker_repo = AsyncLockerRepository(db)
+        self.user_repo = AsyncUserRepository(db)
 
-    def assign_locker_to_user(self, user_id: UUID, gender: str) -> Optional[Locker]:
+    async def assign_locker_to_user(self, user_id: UUID, gender: str) -> Optional[Locker]:
         """
         Назначение шкафчика пользователю
         gender: "male" -> "men", "female" -> "women"
@@ -26,28 +30,20 @@ class LockerService:
         # Преобразуем пол для раздевалки
         locker_gender = "men" if gender == "male" else "women"
 
-        # Ищем свободный шкафчик
-        available_lockers = self.locker_repo.get_available(locker_gender)
-        if not available_lockers:
-            return None
+        # Захватываем один свободный шкафчик одним атомарным запросом
+        locker = await self.locker_repo.claim_free(
+            locker_gender,
+            user_id,
+            code=random.randint(1000, 9999),
+            occupied_at=datetime.now(timezone.utc)
+        )
+        result = "assigned" if locker else "unavailable"
+        on_commit(self.db, lambda: LOCKER_ASSIGNMENTS.inc(result=result))
+        return locker
 
-        # Берем первый доступный
-        locker = available_lockers[0]
-
-        # Генерируем новый код
-        new_code = random.randint(1000, 9999)
-
-        # Обновляем шкафчик
-        locker.status = "occupied"
-        locker.code = new_code
-        locker.occupied_by_user_id = user_id
-        locker.occupied_at = datetime.now(timezone.utc)
-
-        return self.locker_repo.update(locker)
-
-    def release_locker(self, locker_id: int) -> Locker:
+    async def release_locker(self, locker_id: int) -> Locker:
         """Освобождение шкафчика"""
-        locker = self.locker_repo.get_by_id(locker_id)
+        locker = await self.locker_repo.get_by_id(locker_id)
         if not locker:
             raise ValueError(f"Шкафчик с ID {locker_id} не найден")
 
@@ -60,13 +56,36 @@ class LockerService:
         locker.occupied_by_user_id = None
         locker.occupied_at = None
 
-        return self.locker_repo.update(locker)
+        return await self.locker_repo.update(locker)
+
+    async def release_user_locker(self, user_id: UUID, locker_id: int) -> Locker:
+        """
+        Освобождение клиентом своего шкафчика: шкафчик освобождается,
+        у пользователя сбрасывается current_locker_id, снимок в кэше сбрасывается после коммита
+        """
+        # Снимок пользователя из кэша может быть неактуален — работаем со строкой из БД
+        user = await self.user_repo.get_by_id(user_id)
+        locker = await self.get_user_locker(user.id, user.current_locker_id)
+        if not locker or locker.id != locker_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Этот шкафчик не принадлежит вам"
+            )
 
-    def get_user_locker(self, user_id: UUID) -> Optional[Locker]:
-        """Получение шкафчика пользователя"""
-        lockers = self.locker_repo.get_all()
-        for locker in lockers:
-            if locker.occupied_by_user_id == user_id and locker.status == "occupied":
-                return locker
-        return None
+        locker = await self.release_locker(locker_id)
+        if user.current_locker_id == locker_id:
+            user.current_locker_id = None
+            await self.user_repo.update(user)
+        on_commit(self.db, lambda: invalidate_principal(user.id))
+        return locker
 
+    async def get_user_locker(
+        self,
+        user_id: UUID,
+        current_locker_id: Optional[int] = None
+    ) -> Optional[Locker]:
+        """
+        Получение шкафчика пользователя
+        current_locker_id - известный ID шкафчика пользователя (быстрый путь по первичному ключу)
+        """
+        return await self.locker_repo.get_occupied_by_user(user_id, current_locker_id)
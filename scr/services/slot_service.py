@@ -0,0 +1,127 @@
+"""
+Сервис расчета свободных слотов расписания тренеров
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from scr.db.models import Booking, BookingStatus, TrainerSchedule
+
+
+def slot_schedules_query(days_of_week: Iterable[int], gym_zone_id: Optional[int] = None) -> Select:
+    """Запрос рабочих расписаний на дни недели вместе с тренером и залом"""
+    query = (
+        select(TrainerSchedule)
+        .options(
+            joinedload(TrainerSchedule.trainer_user),
+            joinedload(TrainerSchedule.gym_zone),
+        )
+        .where(
+            TrainerSchedule.day_of_week.in_(set(days_of_week)),
+            TrainerSchedule.is_working == True,
+            TrainerSchedule.is_cancelled == False
+        )
+        .order_by(TrainerSchedule.start_time, TrainerSchedule.id)
+    )
+    if gym_zone_id:
+        query = query.where(TrainerSchedule.gym_zone_id == gym_zone_id)
+    return query
+
+
+def booked_slots_query(date_from: date, date_to: date, trainer_schedule_ids: List[int]) -> Select:
+    """Запрос занятых слотов за период: (дата, ID расписания)"""
+    return select(Booking.booking_date, Booking.trainer_schedule_id).where(
+        Booking.booking_date >= date_from,
+        Booking.booking_date <= date_to,
+        Booking.status != BookingStatus.CANCELLED,
+        Booking.trainer_schedule_id.in_(trainer_schedule_ids)
+    )
+
+
+class SlotAvailabilityService:
+    """
+    Свободные слоты за дату или период.
+    Независимо от числа расписаний и дат выполняется два запроса:
+    расписания (вместе с тренерами и залами) и занятые слоты за период.
+    """
+
+    MAX_RANGE_DAYS = 62
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_available_slots(
+        self,
+        booking_date: date,
+        gym_zone_id: Optional[int] = None
+    ) -> List[dict]:
+        """Свободные слоты на одну дату"""
+        slots_by_date = await self.get_available_slots_range(booking_date, booking_date, gym_zone_id)
+        return slots_by_date[booking_date]
+
+    async def get_available_slots_range(
+        self,
+        date_from: date,
+        date_to: date,
+        gym_zone_id: Optional[int] = None
+    ) -> Dict[date, List[dict]]:
+        """Свободные слоты по каждой дате периода (включительно)"""
+        if date_to < date_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Дата окончания периода должна быть не раньше даты начала"
+            )
+        days_count = (date_to - date_from).days + 1
+        if days_count > self.MAX_RANGE_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Период не может превышать {self.MAX_RANGE_DAYS} дней"
+            )
+
+        dates = [date_from + timedelta(days=i) for i in range(days_count)]
+
+        # 1) Рабочие расписания на нужные дни недели вместе с тренером и залом
+        query = slot_schedules_query({d.weekday() for d in dates}, gym_zone_id)
+        schedules = (await self.db.execute(query)).scalars().all()
+
+        schedules_by_weekday: Dict[int, List[TrainerSchedule]] = defaultdict(list)
+        for schedule in schedules:
+            schedules_by_weekday[schedule.day_of_week].append(schedule)
+
+        # 2) Занятые слоты за период: дата -> множество ID расписаний
+        booked_by_date: Dict[date, Set[int]] = defaultdict(set)
+        if schedules:
+            rows = await self.db.execute(
+                booked_slots_query(date_from, date_to, [s.id for s in schedules])
+            )
+            for booking_date, schedule_id in rows:
+                booked_by_date[booking_date].add(schedule_id)
+
+        result: Dict[date, List[dict]] = {}
+        for day in dates:
+            booked = booked_by_date.get(day, set())
+            result[day] = [
+                self._slot_to_dict(schedule)
+                for schedule in schedules_by_weekday.get(day.weekday(), [])
+                if schedule.id not in booked
+            ]
+        return result
+
+    @staticmethod
+    def _slot_to_dict(schedule: TrainerSchedule) -> dict:
+        trainer = schedule.trainer_user
+        zone = schedule.gym_zone
+        return {
+            "schedule_id": schedule.id,
+            "trainer_id": str(schedule.trainer_id),
+            "trainer_name": f"{trainer.first_name} {trainer.last_name}" if trainer else "Тренер",
+            "start_time": schedule.start_time.strftime("%H:%M"),
+            "end_time": schedule.end_time.strftime("%H:%M"),
+            "zone_id": schedule.gym_zone_id,
+            "zone_name": zone.name if zone else "Не указан"
+        }
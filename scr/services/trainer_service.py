@@ -4,20 +4,20 @@
 from typing import List
 from uuid import UUID
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from scr.db.models import TrainerSchedule, User, UserRole
-from scr.db.repositories.trainer_schedule_repository import TrainerScheduleRepository
+from scr.db.repositories.trainer_schedule_repository import AsyncTrainerScheduleRepository
 from scr.schemas.trainer_schedule import TrainerScheduleCreate, TrainerScheduleUpdate
 
 
 class TrainerService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.schedule_repo = TrainerScheduleRepository(db)
+        self.schedule_repo = AsyncTrainerScheduleRepository(db)
 
-    def create_schedule(
+    async def create_schedule(
         self,
         schedule_data: TrainerScheduleCreate,
         current_user: User
@@ -60,11 +60,11 @@ class TrainerService:
             gym_zone_id=schedule_data.gym_zone_id if hasattr(schedule_data, 'gym_zone_id') else None
         )
 
-        return self.schedule_repo.create(schedule)
+        return await self.schedule_repo.create(schedule)
 
-    def get_schedule(self, schedule_id: int, current_user: User) -> TrainerSchedule:
+    async def get_schedule(self, schedule_id: int, current_user: User) -> TrainerSchedule:
         """Получение расписания"""
-        schedule = self.schedule_repo.get_by_id(schedule_id)
+        schedule = await self.schedule_repo.get_by_id(schedule_id)
         if not schedule:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -80,7 +80,7 @@ class TrainerService:
 
         return schedule
 
-    def get_trainer_schedules(
+    async def get_trainer_schedules(
         self,
         trainer_id: UUID,
         current_user: User
@@ -93,16 +93,16 @@ class TrainerService:
                 detail="Недостаточно прав"
             )
 
-        return self.schedule_repo.get_by_trainer_id(trainer_id)
+        return await self.schedule_repo.get_by_trainer_id(trainer_id)
 
-    def update_schedule(
+    async def update_schedule(
         self,
         schedule_id: int,
         schedule_data: TrainerScheduleUpdate,
         current_user: User
     ) -> TrainerSchedule:
         """Обновление расписания"""
-        schedule = self.get_schedule(schedule_id, current_user)
+        schedule = await self.get_schedule(schedule_id, current_user)
 
         # Тренер может обновлять только свое расписание
         if current_user.role == UserRole.TRAINER and schedule.trainer_id != current_user.id:
@@ -119,16 +119,16 @@ class TrainerService:
         if schedule_data.is_cancelled and not schedule.is_cancelled:
             schedule.cancelled_at = datetime.now(timezone.utc)
 
-        return self.schedule_repo.update(schedule)
+        return await self.schedule_repo.update(schedule)
 
-    def cancel_schedule(
+    async def cancel_schedule(
         self,
         schedule_id: int,
         reason: str,
         current_user: User
     ) -> TrainerSchedule:
         """Отмена расписания (тренировки)"""
-        schedule = self.get_schedule(schedule_id, current_user)
+        schedule = await self.get_schedule(schedule_id, current_user)
 
         # Тренер может отменять только свое расписание
         if current_user.role == UserRole.TRAINER and schedule.trainer_id != current_user.id:
@@ -141,11 +141,11 @@ class TrainerService:
         schedule.cancelled_at = datetime.now(timezone.utc)
         schedule.cancellation_reason = reason
 
-        return self.schedule_repo.update(schedule)
+        return await self.schedule_repo.update(schedule)
 
-    def delete_schedule(self, schedule_id: int, current_user: User) -> None:
+    async def delete_schedule(self, schedule_id: int, current_user: User) -> None:
         """Удаление расписания"""
-        schedule = self.get_schedule(schedule_id, current_user)
+        schedule = await self.get_schedule(schedule_id, current_user)
 
         # Тренер может удалять только свое расписание
         if current_user.role == UserRole.TRAINER and schedule.trainer_id != current_user.id:
@@ -154,13 +154,13 @@ class TrainerService:
                 detail="Недостаточно прав"
             )
 
-        self.schedule_repo.delete(schedule)
+        await self.schedule_repo.delete(schedule)
 
-    def get_available_schedules(
+    async def get_available_schedules(
         self,
         trainer_id: UUID,
         day_of_week: int = None
     ) -> List[TrainerSchedule]:
         """Получение доступного расписания тренера (публичный метод)"""
-        return self.schedule_repo.get_available_schedules(trainer_id, day_of_week)
+        return await self.schedule_repo.get_available_schedules(trainer_id, day_of_week)
 
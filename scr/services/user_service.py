@@ -3,37 +3,38 @@
 """
 from typing import List, Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from scr.db.models import User, UserRole
-from scr.db.repositories.user_repository import UserRepository
+from scr.db.repositories.user_repository import AsyncUserRepository
 from scr.schemas.user import UserCreate, UserUpdate
-from scr.core.security import get_password_hash
+from scr.core.hashing import hash_password_async
+from scr.core.principal_cache import invalidate_principal
 
 
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.user_repo = UserRepository(db)
+        self.user_repo = AsyncUserRepository(db)
 
-    def create_user(self, user_data: UserCreate, created_by: Optional[User] = None) -> User:
+    async def create_user(self, user_data: UserCreate, created_by: Optional[User] = None) -> User:
         """Создание пользователя (только для администраторов)"""
         # Проверка существования
-        if self.user_repo.get_by_email(user_data.email):
+        if await self.user_repo.get_by_email(user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Пользователь с таким email уже существует"
             )
         
-        if self.user_repo.get_by_phone(user_data.phone):
+        if await self.user_repo.get_by_phone(user_data.phone):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Пользователь с таким телефоном уже существует"
             )
 
         # Создание пользователя
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
         user = User(
             email=user_data.email,
             phone=user_data.phone,
@@ -46,11 +47,11 @@ class UserService:
             role=user_data.role
         )
 
-        return self.user_repo.create(user)
+        return await self.user_repo.create(user)
 
-    def get_user(self, user_id: UUID) -> User:
+    async def get_user(self, user_id: UUID) -> User:
         """Получение пользователя по ID"""
-        user = self.user_repo.get_by_id(user_id)
+        user = await self.user_repo.get_by_id(user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -58,7 +59,7 @@ class UserService:
             )
         return user
 
-    def get_users(
+    async def get_users(
         self,
         role: Optional[UserRole] = None,
         is_active: Optional[bool] = None,
@@ -66,16 +67,16 @@ class UserService:
         limit: int = 100
     ) -> List[User]:
         """Получение списка пользователей с фильтрацией"""
-        users = self.user_repo.get_all(role=role, is_active=is_active)
+        users = await self.user_repo.get_all(role=role, is_active=is_active)
         return users[skip:skip + limit]
 
-    def search_users(self, search_term: str) -> List[User]:
+    async def search_users(self, search_term: str) -> List[User]:
         """Поиск пользователей"""
-        return self.user_repo.search(search_term)
+        return await self.user_repo.search(search_term)
 
-    def update_user(self, user_id: UUID, user_data: UserUpdate, current_user: User) -> User:
+    async def update_user(self, user_id: UUID, user_data: UserUpdate, current_user: User) -> User:
         """Обновление пользователя"""
-        user = self.get_user(user_id)
+        user = await self.get_user(user_id)
 
         # Проверка прав: пользователь может обновлять только свой профиль,
         # администратор может обновлять любого
@@ -87,7 +88,7 @@ class UserService:
 
         # Проверка уникальности email
         if user_data.email and user_data.email != user.email:
-            if self.user_repo.get_by_email(user_data.email):
+            if await self.user_repo.get_by_email(user_data.email):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Пользователь с таким email уже существует"
@@ -96,7 +97,7 @@ class UserService:
 
         # Проверка уникальности телефона
         if user_data.phone and user_data.phone != user.phone:
-            if self.user_repo.get_by_phone(user_data.phone):
+            if await self.user_repo.get_by_phone(user_data.phone):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Пользователь с таким телефоном уже существует"
@@ -108,9 +109,11 @@ class UserService:
         for field, value in update_data.items():
             setattr(user, field, value)
 
-        return self.user_repo.update(user)
+        updated = await self.user_repo.update(user)
+        invalidate_principal(user.id)
+        return updated
 
-    def delete_user(self, user_id: UUID, current_user: User) -> None:
+    async def delete_user(self, user_id: UUID, current_user: User) -> None:
         """Удаление пользователя (только администратор)"""
         if current_user.role != UserRole.ADMIN:
             raise HTTPException(
@@ -118,7 +121,7 @@ class UserService:
                 detail="Только администратор может удалять пользователей"
             )
 
-        user = self.get_user(user_id)
+        user = await self.get_user(user_id)
         
         # Нельзя удалить самого себя
         if user.id == current_user.id:
@@ -127,9 +130,10 @@ class UserService:
                 detail="Нельзя удалить самого себя"
             )
 
-        self.user_repo.delete(user)
+        await self.user_repo.delete(user)
+        invalidate_principal(user_id)
 
-    def deactivate_user(self, user_id: UUID, current_user: User) -> User:
+    async def deactivate_user(self, user_id: UUID, current_user: User) -> User:
         """Деактивация пользователя"""
         if current_user.role != UserRole.ADMIN:
             raise HTTPException(
@@ -137,11 +141,13 @@ class UserService:
                 detail="Только администратор может деактивировать пользователей"
             )
 
-        user = self.get_user(user_id)
+        user = await self.get_user(user_id)
         user.is_active = False
-        return self.user_repo.update(user)
+        updated = await self.user_repo.update(user)
+        invalidate_principal(user.id)
+        return updated
 
-    def activate_user(self, user_id: UUID, current_user: User) -> User:
+    async def activate_user(self, user_id: UUID, current_user: User) -> User:
         """Активация пользователя"""
         if current_user.role != UserRole.ADMIN:
             raise HTTPException(
@@ -149,7 +155,9 @@ class UserService:
                 detail="Только администратор может активировать пользователей"
             )
 
-        user = self.get_user(user_id)
+        user = await self.get_user(user_id)
         user.is_active = True
-        return self.user_repo.update(user)
+        updated = await self.user_repo.update(user)
+        invalidate_principal(user.id)
+        return updated
 
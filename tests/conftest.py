@@ -0,0 +1,126 @@
+"""
+Общие фикстуры тестов
+
+Приложение работает на временной БД SQLite (схема создается миграциями),
+запросы выполняются через httpx.ASGITransport без запуска сервера.
+Настройки задаются до импорта scr.*, поэтому тесты не трогают БД из .env.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_DATABASE_DIR = tempfile.TemporaryDirectory(prefix="gym-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_DATABASE_DIR.name) / 'test.db'}"
+# Заголовки X-DB-Query-Count в ответах; лог медленных запросов не нужен
+os.environ["DEBUG"] = "true"
+os.environ["SLOW_QUERY_THRESHOLD_MS"] = "0"
+for _name, _value in {
+    "SECRET_KEY": "test",
+    "CONFIGURATION_SHOP_KEY": "test",
+    "CONFIGURATION_SECRET_KEY": "test",
+    "PAYMENT_RETURN_URL": "http://localhost/",
+    "PRICE_GYM": "500",
+    "PRICE_GROUP": "800",
+    "PRICE_POOL": "700",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Синхронный движок приложения с примененными миграциями"""
+    from scr.db.database import engine
+    from scr.db.migrations import migrate
+
+    migrate(engine)
+    yield engine
+    engine.dispose()
+    _DATABASE_DIR.cleanup()
+
+
+@pytest.fixture
+def db(engine):
+    """Сессия для подготовки данных; после теста данные очищаются (кроме залов по умолчанию)"""
+    from scr.core.principal_cache import principal_cache
+    from scr.db.models import Base, GymZone
+    from scr.db.database import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+    with engine.begin() as conn:
+        for table in Base.metadata.tables.values():
+            if table is not GymZone.__table__:
+                conn.execute(table.delete())
+    principal_cache.clear()
+
+
+@pytest.fixture
+def make_user(db):
+    """Создание пользователя с ролью"""
+    from scr.db.models import User
+
+    def make(role, **fields) -> "User":
+        suffix = uuid.uuid4().hex[:12]
+        user = User(
+            email=f"{suffix}@test.local",
+            phone=suffix,
+            password_hash="-",
+            first_name=fields.pop("first_name", "Тест"),
+            last_name=fields.pop("last_name", suffix),
+            role=role,
+            is_active=True,
+            **fields,
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    return make
+
+
+@pytest.fixture
+def auth_headers():
+    """Заголовок Authorization с токеном пользователя"""
+    from scr.core.security import create_access_token
+
+    def headers(user) -> dict:
+        token = create_access_token({"sub": str(user.id), "role": user.role.value})
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers
+
+
+@pytest.fixture
+def api(engine):
+    """
+    Запрос к приложению: api("GET", "/api/...", headers=..., params=...) -> httpx.Response.
+    Каждый запрос выполняется в своем event loop, поэтому соединения асинхронного
+    движка закрываются после запроса.
+    """
+    import httpx
+
+    from scr.db.database import async_engine
+    from scr.main import app
+
+    async def send(method: str, url: str, **kwargs) -> httpx.Response:
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.request(method, url, **kwargs)
+        finally:
+            await async_engine.dispose()
+
+    def request(method: str, url: str, **kwargs) -> httpx.Response:
+        return asyncio.run(send(method, url, **kwargs))
+
+    return request
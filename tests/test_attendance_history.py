@@ -0,0 +1,66 @@
+"""
+Постраничная история посещений GET /api/attendance/me/history
+"""
+from datetime import date, datetime, time, timedelta
+
+from scr.db.models import TrainingSession, TrainingSessionParticipant, UserRole, Visit
+
+
+def fetch_all_pages(api, headers, limit: int):
+    """Все страницы истории по next_cursor; возвращает записи и размеры страниц"""
+    items, sizes, cursor = [], [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = api("GET", "/api/attendance/me/history", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        data = response.json()
+        items.extend(data["history"])
+        sizes.append(len(data["history"]))
+        cursor = data["next_cursor"]
+        if not cursor:
+            return items, sizes
+
+
+def test_client_history_pages_follow_cursor(db, make_user, auth_headers, api):
+    client = make_user(UserRole.CLIENT)
+    start = datetime(2025, 1, 1, 10, 0)
+    for i in range(5):
+        db.add(Visit(client_id=client.id, visit_type="gym", check_in_time=start + timedelta(days=i)))
+    db.commit()
+
+    items, sizes = fetch_all_pages(api, auth_headers(client), limit=2)
+
+    assert sizes == [2, 2, 1]
+    check_ins = [item["check_in_time"] for item in items]
+    assert check_ins == sorted(check_ins, reverse=True)
+    assert len({item["id"] for item in items}) == 5
+
+
+def test_trainer_sessions_history_is_paginated(db, make_user, auth_headers, api):
+    # Старые данные: проведенные занятия без Visit.trainer_id
+    trainer = make_user(UserRole.TRAINER)
+    client = make_user(UserRole.CLIENT)
+    for i in range(5):
+        session = TrainingSession(
+            trainer_id=trainer.id,
+            gym_zone_id=1,
+            session_date=date(2025, 1, 1) + timedelta(days=i // 2),
+            start_time=time(10 + i % 2),
+            end_time=time(11 + i % 2),
+            is_cancelled=False,
+            is_completed=True,
+        )
+        db.add(session)
+        db.flush()
+        db.add(TrainingSessionParticipant(session_id=session.id, client_id=client.id))
+    db.commit()
+
+    items, sizes = fetch_all_pages(api, auth_headers(trainer), limit=2)
+
+    assert sizes == [2, 2, 1]
+    check_ins = [item["check_in_time"] for item in items]
+    assert check_ins == sorted(check_ins, reverse=True)
+    assert len({item["id"] for item in items}) == 5
+    assert all(item["participants_count"] == 1 for item in items)
@@ -0,0 +1,55 @@
+"""
+Генератор данных: одинаковые параметры, seed и base_date дают одинаковые строки,
+занятия одного тренера не пересекаются по времени
+"""
+from collections import Counter
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from scr.db.data_generator import GeneratorConfig, generate
+from scr.db.migrations import migrate
+from scr.db.models import Contract, TrainingSession, User, Visit
+
+CONFIG = dict(
+    clients=20, trainers=3, lockers=4, sessions=40, participants_per_session=2,
+    history_days=10, visits_per_client=2, past_sessions=100, base_date=date(2024, 6, 1),
+)
+
+
+def generated_rows(tmp_path, name: str, **overrides) -> dict:
+    engine = create_engine(f"sqlite:///{tmp_path / name}")
+    try:
+        migrate(engine)
+        generate(engine, GeneratorConfig(**{**CONFIG, **overrides}))
+        with engine.connect() as conn:
+            return {
+                "users": conn.execute(
+                    select(User.id, User.email, User.created_at, User.updated_at)
+                    .where(User.email.like("%@bench.local")).order_by(User.email)
+                ).all(),
+                "contracts": conn.execute(select(Contract).order_by(Contract.contract_number)).all(),
+                "sessions": conn.execute(select(TrainingSession).order_by(TrainingSession.id)).all(),
+                "visits": conn.execute(select(Visit).order_by(Visit.id)).all(),
+            }
+    finally:
+        engine.dispose()
+
+
+def test_same_seed_and_base_date_give_same_rows(tmp_path):
+    first = generated_rows(tmp_path, "first.db")
+    assert first == generated_rows(tmp_path, "second.db")
+    assert first != generated_rows(tmp_path, "other.db", base_date=date(2024, 6, 2))
+
+
+def test_trainer_sessions_do_not_overlap(tmp_path):
+    sessions = generated_rows(tmp_path, "sessions.db")["sessions"]
+    slots = Counter((row.trainer_id, row.session_date, row.start_time) for row in sessions)
+    assert len(sessions) == CONFIG["sessions"] + CONFIG["past_sessions"]
+    assert max(slots.values()) == 1
+
+
+def test_past_sessions_must_fit_history(tmp_path):
+    with pytest.raises(ValueError):
+        generated_rows(tmp_path, "small.db", history_days=1, past_sessions=100)
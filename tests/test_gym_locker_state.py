@@ -0,0 +1,55 @@
+"""
+Состояние клиента в зале и его шкафчик читаются из БД, а не из кэша снимков пользователя
+"""
+from datetime import datetime, timezone
+
+from scr.db.models import Locker, User, UserRole
+
+
+def occupy_locker(db, client, number: str) -> Locker:
+    """Клиент в зале и занимает шкафчик"""
+    locker = Locker(
+        locker_number=number, gender="men", status="occupied", code=1234, is_available=True,
+        occupied_by_user_id=client.id, occupied_at=datetime.now(timezone.utc),
+    )
+    db.add(locker)
+    db.flush()
+    client.in_gym = True
+    client.current_locker_id = locker.id
+    db.commit()
+    return locker
+
+
+def test_gym_status_is_not_served_from_stale_principal(db, make_user, auth_headers, api):
+    client = make_user(UserRole.CLIENT)
+    locker = occupy_locker(db, client, "S-1")
+    headers = auth_headers(client)
+
+    # Снимок пользователя попадает в кэш этого процесса
+    status = api("GET", "/api/gym/status", headers=headers).json()
+    assert status["in_gym"] is True and status["locker_info"]["id"] == locker.id
+
+    # Выход через другой воркер: БД изменилась, кэш этого процесса не сброшен
+    locker.status, locker.occupied_by_user_id = "free", None
+    client.in_gym, client.current_locker_id = False, None
+    db.commit()
+
+    status = api("GET", "/api/gym/status", headers=headers).json()
+    assert status["in_gym"] is False and status["locker_info"] is None
+
+
+def test_release_locker_clears_current_locker_id(db, make_user, auth_headers, api):
+    client = make_user(UserRole.CLIENT)
+    locker = occupy_locker(db, client, "R-1")
+    headers = auth_headers(client)
+    assert api("GET", "/api/gym/status", headers=headers).json()["locker_info"]["id"] == locker.id
+
+    response = api("POST", f"/api/lockers/{locker.id}/release", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "free"
+
+    db.expire_all()
+    assert db.get(User, client.id).current_locker_id is None
+    assert api("GET", "/api/gym/status", headers=headers).json()["locker_info"] is None
+    assert api("GET", "/api/lockers/my", headers=headers).json() is None
+    assert api("POST", f"/api/lockers/{locker.id}/release", headers=headers).status_code == 403
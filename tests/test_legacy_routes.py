@@ -0,0 +1,35 @@
+"""
+Старые маршруты /api/gym_operations и /api/locker: обработчики загружаются при первом
+запросе, тело проверяется и ответ формируется так же, как у исходного маршрута
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_legacy_modules_are_not_imported_at_startup():
+    modules = ("scr.api.gym_operations", "scr.api.locker", "scr.db.struct")
+    completed = subprocess.run(
+        [sys.executable, "-c", f"import sys, scr.main; print([m for m in {modules!r} if m in sys.modules])"],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "[]"
+
+
+def test_legacy_routes_are_served(api):
+    client = {"full_name": "Тест", "gender": "male", "in_gym": True}
+
+    response = api("POST", "/api/locker/find", json=client)
+    assert response.status_code == 200, response.text
+    assert response.json()["client_gender"] == "male"
+
+    response = api("POST", "/api/gym_operations/exit", json=client)
+    assert response.status_code == 200 and response.json()["success"] is True
+
+    response = api("POST", "/api/gym_operations/enter", json={"full_name": "Тест"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "gender"]
+    assert api("GET", "/api/gym_operations/enter").status_code == 405
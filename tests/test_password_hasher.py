@@ -0,0 +1,40 @@
+"""
+Метрики пула хеширования: длительность операций в гистограмме /metrics,
+ошибки учитываются отдельно от успешных операций
+"""
+import asyncio
+
+import pytest
+
+from scr.core.hashing import PasswordHasherPool
+from scr.core.metrics import render_metrics
+from scr.core.security import get_password_hash
+
+
+def duration_count(operation: str) -> int:
+    prefix = f'password_hash_duration_seconds_count{{operation="{operation}"}} '
+    for line in render_metrics().splitlines():
+        if line.startswith(prefix):
+            return int(line[len(prefix):])
+    return 0
+
+
+def test_failed_operations_are_counted_separately():
+    pool = PasswordHasherPool(max_workers=1, queue_limit=0)
+    hashed_before, verified_before = duration_count("hash"), duration_count("verify")
+
+    async def run():
+        hashed = await pool.hash("secret")
+        assert await pool.verify("secret", hashed)
+        with pytest.raises(ValueError):
+            await pool._submit("hash", get_password_hash, None)
+
+    try:
+        asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert (stats["completed"], stats["failed"], stats["rejected"]) == (2, 1, 0)
+    assert duration_count("hash") == hashed_before + 2
+    assert duration_count("verify") == verified_before + 1
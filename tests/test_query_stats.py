@@ -0,0 +1,31 @@
+"""
+Учет SQL-запросов: нормализация SQL и время начала при ошибке запроса
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from scr.db.query_stats import _START_TIMES_KEY, normalize_sql
+
+
+@pytest.mark.parametrize("statement, expected", [
+    ("SELECT * FROM t WHERE id IN (?, ?, ?) AND name = 'a''b'", "SELECT * FROM t WHERE id IN (...) AND name = ?"),
+    ("SELECT * FROM t WHERE id = %(id_1)s LIMIT 10", "SELECT * FROM t WHERE id = ? LIMIT ?"),
+    (
+        "SELECT * FROM visits WHERE client_id IN ($3::UUID, $4::UUID)\n  AND check_in_time < $1::TIMESTAMP WITHOUT TIME ZONE",
+        "SELECT * FROM visits WHERE client_id IN (...) AND check_in_time < ?",
+    ),
+    ("UPDATE t SET code = $1::VARCHAR(20) WHERE id = ANY($2::INTEGER[])", "UPDATE t SET code = ? WHERE id = ANY(?)"),
+])
+def test_normalize_sql(statement, expected):
+    assert normalize_sql(statement) == expected
+
+
+def test_failed_statement_does_not_leave_start_time(engine):
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        assert not conn.info.get(_START_TIMES_KEY)
+
+        conn.execute(text("SELECT 1"))
+        assert not conn.info.get(_START_TIMES_KEY)
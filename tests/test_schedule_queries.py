@@ -0,0 +1,60 @@
+"""
+Число SQL-запросов GET /api/schedule не зависит от числа записей и участников (без N+1)
+"""
+from datetime import date, time, timedelta
+
+import pytest
+
+from scr.db.models import TrainingSession, TrainingSessionParticipant, UserRole
+
+ONE_SESSION_DAY = date.today() + timedelta(days=1)
+MANY_SESSIONS_DAY = date.today() + timedelta(days=2)
+
+
+def add_sessions(db, trainer, session_date: date, count: int, participants) -> None:
+    """Записи тренера на дату, на каждую записаны все participants"""
+    for i in range(count):
+        session = TrainingSession(
+            trainer_id=trainer.id,
+            gym_zone_id=1,
+            session_date=session_date,
+            start_time=time(8 + i),
+            end_time=time(9 + i),
+            is_cancelled=False,
+        )
+        db.add(session)
+        db.flush()
+        for client in participants:
+            db.add(TrainingSessionParticipant(session_id=session.id, client_id=client.id))
+    db.commit()
+
+
+@pytest.mark.parametrize("role", [UserRole.TRAINER, UserRole.CLIENT])
+def test_list_training_sessions_query_count_is_constant(role, db, make_user, auth_headers, api):
+    trainer = make_user(UserRole.TRAINER)
+    other_trainer = make_user(UserRole.TRAINER)
+    clients = [make_user(UserRole.CLIENT) for _ in range(6)]
+
+    add_sessions(db, trainer, ONE_SESSION_DAY, count=1, participants=clients[:1])
+    add_sessions(db, trainer, MANY_SESSIONS_DAY, count=5, participants=clients)
+    add_sessions(db, other_trainer, MANY_SESSIONS_DAY, count=3, participants=clients[2:])
+
+    headers = auth_headers(trainer if role == UserRole.TRAINER else clients[0])
+
+    def list_sessions(session_date: date):
+        response = api("GET", "/api/schedule", params={"session_date": session_date.isoformat()}, headers=headers)
+        assert response.status_code == 200, response.text
+        return response.json(), int(response.headers["x-db-query-count"])
+
+    # Первый запрос прогревает кэш пользователя, чтобы не влиять на счетчик
+    list_sessions(ONE_SESSION_DAY)
+    one, one_queries = list_sessions(ONE_SESSION_DAY)
+    many, many_queries = list_sessions(MANY_SESSIONS_DAY)
+
+    if role == UserRole.TRAINER:
+        assert len(one) == 1 and len(many) == 5
+        assert all(len(session["participants"]) == 6 for session in many)
+    else:
+        assert len(one) == 1 and len(many) == 8
+        assert all(session["participants"] is None for session in many)
+    assert one_queries == many_queries
@@ -0,0 +1,52 @@
+"""
+DDL моделей для PostgreSQL: обобщенный Uuid дает те же столбцы, что postgresql.UUID,
+а таблицы совпадают со снимком схемы, по которому их создают миграции.
+Время пишется в TIMESTAMP WITHOUT TIME ZONE как naive UTC (asyncpg не принимает aware).
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import DateTime, Uuid
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.schema import CreateTable
+
+from scr.db import schema_v1
+from scr.db.models import Base, UTCDateTime
+
+PG_DIALECT = postgresql.dialect()
+TABLES = sorted(Base.metadata.tables)
+
+
+def create_table_sql(table) -> str:
+    return str(CreateTable(table).compile(dialect=PG_DIALECT)).strip()
+
+
+@pytest.mark.parametrize("name", TABLES)
+def test_uuid_columns_are_native_in_postgresql(name):
+    native_uuid = postgresql.UUID(as_uuid=True).compile(dialect=PG_DIALECT)
+    for column in Base.metadata.tables[name].columns:
+        if isinstance(column.type, Uuid):
+            assert column.type.as_uuid and column.type.native_uuid
+            assert column.type.compile(dialect=PG_DIALECT) == native_uuid
+
+
+@pytest.mark.parametrize("name", TABLES)
+def test_postgresql_ddl_matches_migration_snapshot(name):
+    assert create_table_sql(Base.metadata.tables[name]) == create_table_sql(schema_v1.metadata.tables[name])
+
+
+@pytest.mark.parametrize("name", TABLES)
+def test_datetime_columns_store_naive_utc(name):
+    for column in Base.metadata.tables[name].columns:
+        if isinstance(column.type, DateTime):
+            pytest.fail(f"{name}.{column.name}: DateTime вместо UTCDateTime")
+
+
+def test_aware_datetime_is_bound_as_naive_utc_for_asyncpg():
+    process = UTCDateTime().bind_processor(PGDialect_asyncpg())
+    moscow = datetime(2024, 3, 1, 12, 30, tzinfo=timezone(timedelta(hours=3)))
+
+    assert process(moscow) == datetime(2024, 3, 1, 9, 30)
+    assert process(datetime(2024, 3, 1, 9, 30)) == datetime(2024, 3, 1, 9, 30)
+    assert process(None) is None